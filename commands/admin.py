@@ -6,6 +6,8 @@ from typing import Optional
 
 # Assuming this path is correct for your helper script
 from helper_scripts.asset_access import send_embed_all_emojis
+from helper_scripts.metrics import format_metrics_messages, reset_metrics, write_metrics_file
+from helper_scripts.profiler import start_capture, stop_capture
 
 class AdminCommands(commands.Cog):
     """Commands accessible only to bot administrators or for managing scheduled posts."""
@@ -115,16 +117,18 @@ class AdminCommands(commands.Cog):
 
     # MARK: !bot
     @commands.command(name="bot")
-    async def manage_bot_command(self, ctx: commands.Context, subcommand: Optional[str] = None): # FIX 1: Added self
+    async def manage_bot_command(self, ctx: commands.Context, subcommand: Optional[str] = None, option: Optional[str] = None): # FIX 1: Added self
         """
-        Verwalte Bot-spezifische Aktionen: emojitest, stop
+        Verwalte Bot-spezifische Aktionen: emojitest, metrics, profile, stop
         """
         if subcommand is None:
             # Hilfe ausgeben, wenn kein Unterbefehl angegeben
             await ctx.send(
                 f"## Nutzung von `{ctx.prefix}bot`"
-                "\n- `emojitest` → sendet alle Emojis zum Testen"
-                "\n- `stop`      → fährt den Bot herunter (Admins only)"
+                "\n- `emojitest`         → sendet alle Emojis zum Testen"
+                "\n- `metrics [reset]`   → Laufzeiten und Cache-Trefferquoten (Admins only)"
+                "\n- `profile [n | 60s | stop]` → profilt die nächsten n Befehle oder ein Zeitfenster (Admins only)"
+                "\n- `stop`              → fährt den Bot herunter (Admins only)"
                 "\n-# ℹ️ Syntax: `<param>` = erforderlicher Parameter, `[param]` = optionaler Parameter"
             )
             return
@@ -135,6 +139,35 @@ class AdminCommands(commands.Cog):
             # Note: send_embed_all_emojis is likely an async function
             await send_embed_all_emojis(ctx)
 
+        elif subcommand == "metrics":
+            if ctx.author.id not in self.admins:
+                await ctx.send(
+                    "🚫 Du hast keine Berechtigung, diesen Befehl zu nutzen."
+                )
+                return
+
+            for message in format_metrics_messages():
+                await ctx.send(message)
+            write_metrics_file()  # only if HG_METRICS_FILE is set
+
+            if option and option.lower() == "reset":
+                reset_metrics()
+                await ctx.send("🔄 Metriken zurückgesetzt.")
+
+        elif subcommand == "profile":
+            if ctx.author.id not in self.admins:
+                await ctx.send(
+                    "🚫 Du hast keine Berechtigung, diesen Befehl zu nutzen."
+                )
+                return
+
+            if option and option.lower() == "stop":
+                if not await stop_capture():
+                    await ctx.send("ℹ️ Es läuft kein Profiling.")
+                return
+
+            await ctx.send(start_capture(self.bot, ctx.channel, option, start_ctx=ctx))
+
         elif subcommand == "stop":
             if ctx.author.id not in self.admins: # FIX 2: Used self.admins instead of unbound ADMINS
                 await ctx.send(
@@ -152,7 +185,7 @@ class AdminCommands(commands.Cog):
             # Fallback-Hilfe für unbekannte Unterbefehle
             await ctx.send(
                 f"Unbekannter Unterbefehl `{subcommand}`.\n"
-                f"Verfügbare Unterbefehle: `emojitest`, `stop`"
+                f"Verfügbare Unterbefehle: `emojitest`, `metrics`, `profile`, `stop`"
             )
 
 async def setup(bot):
@@ -0,0 +1,164 @@
+# commands/alerts.py
+
+# Standard library imports
+import json
+from typing import List
+
+# Third-party imports
+from discord.ext import commands, tasks
+from discord import TextChannel
+
+# Own modules
+from helper_scripts.helper_functions import get_leaderboard_json, JSON_FILE_PATH
+from helper_scripts.data_functions import (
+    get_guilds_tracking,
+    get_alert_channels,
+    set_alert_channels,
+    load_bot_data,
+)
+from helper_scripts.snapshots import diff_snapshots, snapshot_hash
+
+
+# MARK: format_alert_line()
+def format_alert_line(change: dict) -> str:
+    """One line per changed bot, based on a diff_snapshots() change record."""
+    rank_delta = change["rank_delta"]
+    arrow = "➡️"
+    if rank_delta:
+        arrow = "📈" if rank_delta > 0 else "📉"
+
+    line = (
+        f"- {arrow} {change['emoji']} **{change['bot']}** "
+        f"({change['author']}): Rang `{change['old_rank']}` → `{change['new_rank']}`"
+    )
+    if change["old_score"] != change["new_score"]:
+        line += f", Score `{change['old_score']}` → `{change['new_score']}`"
+    return line
+
+
+class AlertsCommand(commands.Cog):
+    """Benachrichtigt Channels, wenn sich Rang oder Score getrackter Bots ändern."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.last_snapshot: list[dict] = self._load_saved_snapshot()
+        self.last_hash = snapshot_hash(self.last_snapshot) if self.last_snapshot else None
+        self.alert_watcher_task.start()
+
+    def cog_unload(self):
+        self.alert_watcher_task.cancel()
+
+    @staticmethod
+    def _load_saved_snapshot() -> list[dict]:
+        """Use the last saved leaderboard.json as baseline, so a restart does not miss changes."""
+        if not JSON_FILE_PATH.exists():
+            return []
+        try:
+            with open(JSON_FILE_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []
+
+    # MARK: - Background Task
+    @tasks.loop(minutes=15)
+    async def alert_watcher_task(self):
+        """Holt einen neuen Snapshot und verschickt Alerts für geänderte getrackte Bots."""
+        leaderboard_json, _ = await self.bot.loop.run_in_executor(None, get_leaderboard_json)
+        if not leaderboard_json or "error" in leaderboard_json[0]:
+            return
+
+        # Skip all work if the snapshot did not change since the last tick
+        new_hash = snapshot_hash(leaderboard_json)
+        if new_hash == self.last_hash:
+            return
+
+        previous = self.last_snapshot
+        self.last_snapshot, self.last_hash = leaderboard_json, new_hash
+        if not previous:
+            return
+
+        changes = {
+            (c["bot"], c["author"]): c for c in diff_snapshots(previous, leaderboard_json)["changes"]
+        }
+        if not changes:
+            return
+
+        # Only guilds tracking at least one changed bot are touched
+        by_guild = get_guilds_tracking(changes.keys())
+        if not by_guild:
+            return
+
+        guild_data = load_bot_data().get("guild_data", {})
+        for guild_id_str, bot_keys in by_guild.items():
+            channel_ids = guild_data.get(guild_id_str, {}).get("alert_channels", [])
+            if not channel_ids:
+                continue
+
+            lines = ["**🔔 Änderungen bei getrackten Bots**"]
+            lines += [format_alert_line(changes[key]) for key in bot_keys]
+            message = "\n".join(lines)[:2000]
+
+            for channel_id in channel_ids:
+                channel = self.bot.get_channel(int(channel_id))
+                if channel is None:
+                    print(f"[ALERTS] Channel {channel_id} nicht gefunden.")
+                    continue
+                await channel.send(message)
+
+    @alert_watcher_task.before_loop
+    async def before_alert_watcher_task(self):
+        await self.bot.wait_until_ready()
+
+    # MARK: !alerts
+    @commands.command(name="alerts", aliases=["al"])
+    async def alerts_command(self, ctx: commands.Context, action: str = ""):
+        """Rang-Alerts für getrackte Bots in diesem Channel: start/stop/list"""
+        valid_actions = ["start", "stop", "list"]
+
+        if not action or action.lower() not in valid_actions:
+            await ctx.send(
+                f"## Nutzung von `{ctx.prefix}alerts`"
+                f"\n-# (aliases: {ctx.prefix}al)"
+                "\n"
+                "\n- `start` → Alerts bei Rang-/Score-Änderungen getrackter Bots in diesem Channel"
+                "\n- `stop ` → Alerts für diesen Channel deaktivieren"
+                "\n- `list ` → Zeigt alle Alert-Channels dieses Servers"
+                "\n-# ℹ️ Syntax: `<param>` = erforderlicher parameter, `[param]` = optionaler parameter"
+            )
+            return
+
+        if ctx.guild is None or not isinstance(ctx.channel, TextChannel):
+            await ctx.send(
+                "❌ Dieser Befehl kann nur in Server-Textkanälen verwendet werden."
+            )
+            return
+
+        action = action.lower()
+        channel_ids: List[int] = get_alert_channels(ctx.guild.id)
+
+        if action == "start":
+            if ctx.channel.id in channel_ids:
+                await ctx.send("ℹ️ Dieser Channel bekommt bereits Alerts.")
+                return
+            set_alert_channels(ctx.guild.id, channel_ids + [ctx.channel.id])
+            await ctx.send(
+                "✅ Dieser Channel wird jetzt benachrichtigt, wenn sich Rang oder Score getrackter Bots ändern."
+            )
+
+        elif action == "stop":
+            if ctx.channel.id not in channel_ids:
+                await ctx.send("ℹ️ Dieser Channel war nicht für Alerts registriert.")
+                return
+            set_alert_channels(ctx.guild.id, [c for c in channel_ids if c != ctx.channel.id])
+            await ctx.send("✅ Dieser Channel erhält ab jetzt keine Alerts mehr.")
+
+        elif action == "list":
+            if not channel_ids:
+                await ctx.send("📭 Es sind aktuell keine Alert-Channels registriert.")
+                return
+            lines = [f"- <#{channel_id}>" for channel_id in channel_ids]
+            await ctx.send("📋 **Alert-Channels:**\n" + "\n".join(lines))
+
+
+async def setup(bot):
+    await bot.add_cog(AlertsCommand(bot))
@@ -0,0 +1,86 @@
+# commands/history.py
+
+# Standard library imports
+from typing import Optional
+
+# Third-party imports
+from discord.ext import commands
+
+# Own modules
+from helper_scripts.history import get_bot_history
+
+
+def _code_block(title: str, lines: list[str]) -> str:
+    return f"{title}\n```\n" + "\n".join(lines) + "\n```"
+
+
+class HistoryCommand(commands.Cog):
+    """Verlauf von Rang und Score einzelner Bots aus dem Snapshot-Archiv."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    # MARK: !history
+    @commands.command(name="history", aliases=["hi"])
+    async def history_command(
+        self,
+        ctx: commands.Context,
+        days: Optional[int] = None,
+        *,
+        botname: Optional[str] = None,
+    ):
+        """Zeigt Rang/Score-Verlauf eines Bots: !history [Tage] <Botname>"""
+        MAX_DAYS = 90
+        DEFAULT_DAYS = 14
+
+        if not botname:
+            await ctx.send(
+                f"## Nutzung von `{ctx.prefix}history`"
+                f"\n-# (aliases: {ctx.prefix}hi)"
+                "\n"
+                f"\n`{ctx.prefix}history [Tage] <Botname>`"
+                f"\n- `[Tage]   ` → Zeitraum in Tagen (Standard {DEFAULT_DAYS}, max. {MAX_DAYS})"
+                "\n- `<Botname>` → Name des Bots"
+                "\n-# ℹ️ Syntax: `<param>` = erforderlicher parameter, `[param]` = optionaler parameter"
+            )
+            return
+
+        days = max(1, min(days or DEFAULT_DAYS, MAX_DAYS))
+        series = get_bot_history(botname.strip(), days=days)
+
+        if not series:
+            await ctx.send(f"❌ Keine Historie für `{botname}` in den letzten {days} Tagen gefunden.")
+            return
+
+        # One bot's series can be longer than a Discord message (~40 chars per day),
+        # so it is split into several self-contained code blocks below the limit
+        blocks = []
+        for (name, author), points in series.items():
+            title = f"**{name}** ({author}) – letzte {days} Tage"
+            lines = []
+            prev_rank = None
+            for lb_date, rank, score in points:
+                rank_str = f"{rank:>4}" if rank is not None else " DNQ"
+                trend = ""
+                if rank is not None and prev_rank is not None and rank != prev_rank:
+                    trend = f" ({'▲' if rank < prev_rank else '▼'}{abs(prev_rank - rank)})"
+                line = f"{lb_date}  Rang {rank_str}  Score {score if score is not None else '-':>6}{trend}"
+                if lines and len(title) + sum(len(l) + 1 for l in lines) + len(line) > 1900:
+                    blocks.append(_code_block(title, lines))
+                    lines = []
+                lines.append(line)
+                prev_rank = rank if rank is not None else prev_rank
+            blocks.append(_code_block(title, lines))
+
+        message = ""
+        for block in blocks:
+            if message and len(message) + len(block) + 1 > 2000:
+                await ctx.send(message)
+                message = ""
+            message += block + "\n"
+        if message:
+            await ctx.send(message)
+
+
+async def setup(bot):
+    await bot.add_cog(HistoryCommand(bot))
@@ -60,6 +60,7 @@ class LeaderboardCommand(commands.Cog):
                 top_x=top_x_int,
                 force_text=force_text,
                 as_thread=True,
+                guild_id=guild_id,
             )
 
 async def setup(bot):
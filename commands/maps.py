@@ -1,48 +1,69 @@
 # commands/maps.py
 
+import time
+import shutil
 import datetime
 import discord
-import pandas as pd
-import matplotlib.pyplot as plt
-import contextily as cx
-import folium
 from discord.ext import commands
 
-from helper_scripts.data_analysis import scrape_data, generate_plots_images, DATA_ROOT
-# Updated import to pull the new progress function
-from helper_scripts.geo import get_city_coords_with_progress, get_city_color
+from helper_scripts.globals import LOCAL_DATA_PATH_DIR
+from helper_scripts.lazy_imports import import_heavy
+from helper_scripts.metrics import span, cache_hit, cache_miss
+
+# mode -> (file name, message); renderers live in helper_scripts/map_render.py
+MAP_MODES = {
+    'png': ("map.png", "🗺️ **Statische Karte**"),
+    'html': ("map.html", "🗺️ **Interaktive Karte**"),
+    'cluster': ("map_cluster.html", "🗺️ **Interaktive Karte (gruppiert)**"),
+}
+
+# Daily output folders (scrims_out_<date>) that are kept, older ones are deleted
+OUTPUT_FOLDERS_KEPT = 3
+
+
+def prune_output_folders(keep: int = OUTPUT_FOLDERS_KEPT) -> list:
+    """Delete all but the newest `keep` scrims_out_* folders, returns the deleted paths."""
+    folders = sorted(p for p in LOCAL_DATA_PATH_DIR.glob("scrims_out_*") if p.is_dir())  # ISO dates sort by name
+    old = folders[:-keep] if keep > 0 else folders
+    for folder in old:
+        shutil.rmtree(folder, ignore_errors=True)
+    if old:
+        print(f"[MAPS] Removed {len(old)} old output folder(s).")
+    return old
+
 
 class MapsCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
     async def get_or_scrape_data(self, ctx):
-        today = datetime.date.today().isoformat()
-        folder = DATA_ROOT / f"scrims_out_{today}"
-        data_path = folder / "data.csv"
-        
-        # Check if recent data exists (1 hour cache)
-        if data_path.exists() and (datetime.datetime.now() - datetime.datetime.fromtimestamp(data_path.stat().st_mtime)).total_seconds() < 3600:
-            print(f"[MAPS] Using cached data from {today}.")
-            return pd.read_csv(data_path), folder
-        
+        # pandas & co. are loaded on first use, not at bot startup
+        data_analysis = await import_heavy(self.bot.loop, "helper_scripts.data_analysis")
+
+        # time.time() instead of date.today(), so the virtual clock of development/soak_test.py moves the date too
+        folder = LOCAL_DATA_PATH_DIR / f"scrims_out_{datetime.date.fromtimestamp(time.time()).isoformat()}"
+        if not folder.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+            await self.bot.loop.run_in_executor(None, prune_output_folders)
+
+        df = await self.bot.loop.run_in_executor(None, data_analysis.load_cached_analysis_data)
+        if df is not None:
+            print("[MAPS] Using cached analysis data.")
+            cache_hit("analysis_data")
+            return df, folder
+
+        cache_miss("analysis_data")
         await ctx.send("🌐 Lade Daten und Geocoding... (dies kann kurz dauern)")
-        print("[MAPS] Starting scrape...")
-        df_result = await self.bot.loop.run_in_executor(None, scrape_data)
-        
+        with span("map.scrape"):
+            df_result = await self.bot.loop.run_in_executor(None, data_analysis.refresh_analysis_data)
+
         if isinstance(df_result, dict) and "error" in df_result:
             await ctx.send(f"❌ Scraping-Fehler: {df_result['error']}")
             return None, None
 
-        folder.mkdir(parents=True, exist_ok=True)
-        df_result.to_csv(data_path, index=False)
-        # Generate stats plots while we are at it
-        await self.bot.loop.run_in_executor(None, generate_plots_images, df_result, folder)
-        print("[MAPS] Scrape complete. Data saved.")
-        
         return df_result, folder
 
-    @commands.command(name='map', aliases=['maps', 'm'], help="Generiert eine Karte. !maps [png | html]")
+    @commands.command(name='map', aliases=['maps', 'm'], help="Generiert eine Karte. !maps [png | html | cluster]")
     @commands.cooldown(1, 30, commands.BucketType.user)
     async def maps_command(self, ctx: commands.Context, mode: str = 'png'):
         """
@@ -50,7 +71,12 @@ class MapsCommand(commands.Cog):
         Modes:
         - png (default): Sendet ein statisches Bild.
         - html: Sendet eine interaktive HTML-Datei.
+        - cluster: Kompakte interaktive HTML-Datei mit gruppierten Markern (schnell auf dem Handy).
         """
+        with span("map.total"):
+            await self.send_map(ctx, mode)
+
+    async def send_map(self, ctx: commands.Context, mode: str):
         await ctx.defer()
 
         df, folder = await self.get_or_scrape_data(ctx)
@@ -59,83 +85,37 @@ class MapsCommand(commands.Cog):
         if 'city' not in df.columns or df['city'].empty:
             return await ctx.send("❌ Keine Stadt-Daten verfügbar.")
 
+        geo = await import_heavy(self.bot.loop, "helper_scripts.geo")
+        map_render = await import_heavy(self.bot.loop, "helper_scripts.map_render")
+
         # --- GEOCODING (with progress reporting) ---
         # Execute the function that includes progress prints in a thread
-        mapped_coords = await self.bot.loop.run_in_executor(
-            None, get_city_coords_with_progress, df
-        )
+        with span("map.geocode"):
+            mapped_coords = await self.bot.loop.run_in_executor(
+                None, geo.get_city_coords_with_progress, df
+            )
 
         if not mapped_coords:
             return await ctx.send("❌ Konnte keine Koordinaten ermitteln.")
 
-        # --- MAP GENERATION ---
-        
-        # Calculate Average Center and Max Count
-        avg_lat = sum(c['coords'][0] for c in mapped_coords) / len(mapped_coords)
-        avg_lon = sum(c['coords'][1] for c in mapped_coords) / len(mapped_coords)
-        max_count = max(c['count'] for c in mapped_coords) # Recalculate max count for scaling
-
-        if mode.lower() == 'html':
-            # --- FOLIUM HTML MAP ---
-            print("[MAPS] Generating Folium HTML map.")
-            m = folium.Map(location=[avg_lat, avg_lon], zoom_start=6)
-            
-            for data in mapped_coords:
-                lat, lon = data['coords']
-                city_count = data['count']
-                
-                radius = 5 + (city_count / max_count) * 15 if max_count > 0 else 5
-                color = get_city_color(city_count, max_count)
-
-                folium.CircleMarker(
-                    location=[lat, lon], 
-                    radius=radius, 
-                    popup=f"{data['city']} ({city_count} bots)", 
-                    color=color, 
-                    fill=True, 
-                    fill_color=color,
-                    fill_opacity=0.7
-                ).add_to(m)
-
-            map_path = folder / "map.html"
-            m.save(str(map_path))
-            print(f"[MAPS] HTML map saved to {map_path}")
-            
-            await ctx.send("🗺️ **Interaktive Karte**", file=discord.File(map_path))
-        
+        # --- MAP GENERATION (cached per fingerprint) ---
+        mode = mode.lower() if mode.lower() in MAP_MODES else 'png'
+        filename, title = MAP_MODES[mode]
+        map_path = folder / filename
+        fingerprint = map_render.map_fingerprint(mapped_coords, mode)
+
+        if map_render.cached_map_path(map_path, fingerprint):
+            print(f"[MAPS] Reusing cached {map_path.name} (unchanged cities).")
+            cache_hit("maps")
         else:
-            # --- STATIC PNG MAP (Matplotlib + Contextily) ---
-            print("[MAPS] Generating static PNG map.")
-            fig, ax = plt.subplots(figsize=(10, 10))
-            
-            lons = [c['coords'][1] for c in mapped_coords]
-            lats = [c['coords'][0] for c in mapped_coords]
-            sizes = [50 + (c['count'] / max_count) * 300 for c in mapped_coords]
-            colors = [get_city_color(c['count'], max_count) for c in mapped_coords]
-
-            ax.scatter(lons, lats, s=sizes, c=colors, alpha=0.8, zorder=2, edgecolors='white')
-            
-            try:
-                # Add padding
-                min_lon, max_lon = min(lons), max(lons)
-                min_lat, max_lat = min(lats), max(lats)
-                ax.set_xlim(min_lon - 2, max_lon + 2)
-                ax.set_ylim(min_lat - 2, max_lat + 2)
-
-                cx.add_basemap(ax, crs='EPSG:4326', source=cx.providers.CartoDB.Positron)
-            except Exception as e:
-                print(f"[MAPS] Basemap Error (PNG generation): {e}")
-
-            ax.set_axis_off()
-            ax.set_title(f"Bot Locations ({len(mapped_coords)} cities)", fontsize=16)
-
-            map_path = folder / "map.png"
-            fig.tight_layout()
-            fig.savefig(map_path, dpi=100)
-            plt.close(fig)
-            print(f"[MAPS] PNG map saved to {map_path}")
-
-            await ctx.send("🗺️ **Statische Karte**", file=discord.File(map_path))
+            cache_miss("maps")
+            with span(f"map.render.{mode}"):
+                await self.bot.loop.run_in_executor(
+                    None, map_render.render_map, mode, mapped_coords, map_path, fingerprint
+                )
+
+        with span("map.upload"):
+            await ctx.send(title, file=discord.File(map_path))
 
 async def setup(bot):
-    await bot.add_cog(MapsCommand(bot))
\ No newline at end of file
+    await bot.add_cog(MapsCommand(bot))
@@ -1,41 +1,69 @@
 # commands/stats.py
 
 from discord.ext import commands
-import datetime
-from pathlib import Path
+import asyncio
 import discord
-from helper_scripts.data_analysis import scrape_data, generate_plots_images, DATA_ROOT
+from helper_scripts.lazy_imports import import_heavy
+from helper_scripts.metrics import span, cache_hit, cache_miss
 
 class StatsCommand(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.warmup_task = None
+
+    async def get_or_scrape_data(self, ctx, data_analysis):
+        df = await self.bot.loop.run_in_executor(None, data_analysis.load_cached_analysis_data)
+        if df is not None:
+            cache_hit("analysis_data")
+            return df
+
+        cache_miss("analysis_data")
+        await ctx.send("🔄 Keine aktuellen Daten. Scrape...")
+        with span("stats.scrape"):
+            df = await self.bot.loop.run_in_executor(None, data_analysis.refresh_analysis_data)
+        if isinstance(df, dict) and "error" in df:
+            await ctx.send(df["error"])
+            return None
+        return df
+
+    def start_background_render(self, data_analysis, df, key):
+        """Render the remaining plots once, without blocking the command."""
+        if self.warmup_task and not self.warmup_task.done():
+            return
+        self.warmup_task = asyncio.ensure_future(
+            self.bot.loop.run_in_executor(None, data_analysis.render_missing_plots, df, key)
+        )
 
     @commands.command(name="stats", aliases=["st"], help="Zeigt Statistik-Plots an. !stats [score | gu | cf | fc | lang | city]")
     async def stats_command(self, ctx, plot_name: str = None):
-        available = {
-            "score": "score_hist.png", "gu": "gu_pct_hist.png",
-            "cf": "cf_pct_hist.png", "fc": "fc_pct_hist.png",
-            "lang": "lang_bar.png", "city": "city_bar.png"
-        }
-        
-        if not plot_name or plot_name not in available:
-            return await ctx.send(f"Verfügbar: {', '.join(available.keys())}")
-
-        # Reuse logic to get data/plots
-        today = datetime.date.today().isoformat()
-        folder = DATA_ROOT / f"scrims_out_{today}"
-        
-        if not folder.exists():
-            await ctx.send("🔄 Keine Daten von heute. Scrape...")
-            df = await self.bot.loop.run_in_executor(None, scrape_data)
-            if "error" in df: return await ctx.send(df["error"])
-            await self.bot.loop.run_in_executor(None, generate_plots_images, df, folder)
-
-        plot_path = folder / available[plot_name]
+        with span("stats.total"):
+            await self.send_stats(ctx, plot_name)
+
+    async def send_stats(self, ctx, plot_name: str = None):
+        # pandas / matplotlib are loaded on first use, not at bot startup
+        data_analysis = await import_heavy(self.bot.loop, "helper_scripts.data_analysis")
+
+        if not plot_name or plot_name not in data_analysis.PLOT_FILES:
+            return await ctx.send(f"Verfügbar: {', '.join(data_analysis.PLOT_FILES.keys())}")
+
+        df = await self.get_or_scrape_data(ctx, data_analysis)
+        if df is None: return
+
+        # Only the requested plot is drawn now, cached under the hash of the data
+        key = data_analysis.data_hash(df)
+        if (data_analysis.PLOT_CACHE_DIR / key / data_analysis.PLOT_FILES[plot_name]).exists():
+            cache_hit("plots")
+        else:
+            cache_miss("plots")
+        with span("stats.plot"):
+            plot_path = await self.bot.loop.run_in_executor(None, data_analysis.get_plot_path, df, plot_name, key)
         if plot_path.exists():
-            await ctx.send(file=discord.File(plot_path))
+            with span("stats.upload"):
+                await ctx.send(file=discord.File(plot_path))
         else:
             await ctx.send("❌ Plot nicht gefunden.")
 
+        self.start_background_render(data_analysis, df, key)
+
 async def setup(bot):
-    await bot.add_cog(StatsCommand(bot))
\ No newline at end of file
+    await bot.add_cog(StatsCommand(bot))
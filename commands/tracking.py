@@ -13,7 +13,45 @@ from discord import TextChannel
 # Own modules
 # Stellen Sie sicher, dass diese Imports korrekt sind, basierend auf Ihrer Projektstruktur
 from helper_scripts.helper_functions import get_leaderboard_json
-from helper_scripts.data_functions import get_tracked_bots, set_tracked_bots, load_polls, save_polls
+from helper_scripts.data_functions import get_tracked_bots, set_tracked_bots, load_polls, save_polls, get_polls_mtime
+from helper_scripts.metrics import count
+
+
+# MARK: PollTickContext
+class PollTickContext:
+    """
+    Shared state for a single poll_watcher_task tick.
+    The leaderboard is fetched at most once per tick and tracked-bot lists are
+    loaded once per guild; changes are written back with one write per guild.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self._leaderboard_json: Optional[List[Dict]] = None
+        self._tracked: Dict[Optional[int], List[Dict]] = {}
+        self._changed: set = set()
+
+    async def get_leaderboard_json(self) -> List[Dict]:
+        """Fetch the leaderboard on first use (in a worker thread) and reuse it afterwards."""
+        if self._leaderboard_json is None:
+            self._leaderboard_json, _ = await self.loop.run_in_executor(None, get_leaderboard_json)
+        return self._leaderboard_json
+
+    def get_tracked_bots(self, guild_id) -> List[Dict]:
+        """Return the (mutable) tracked list for a guild, loading it once per tick."""
+        if guild_id not in self._tracked:
+            self._tracked[guild_id] = get_tracked_bots(guild_id=guild_id)
+        return self._tracked[guild_id]
+
+    def mark_changed(self, guild_id):
+        self._changed.add(guild_id)
+
+    def flush(self, guild_id):
+        """Write the tracked list of a guild back, if it was changed during this tick."""
+        if guild_id in self._changed:
+            set_tracked_bots(guild_id=guild_id, tracked=self._tracked[guild_id])
+            self._changed.discard(guild_id)
+
 
 
 class TrackingCommand(commands.Cog):
@@ -297,6 +335,7 @@ class TrackingCommand(commands.Cog):
         self.bot = bot
         # Lade die Poll-Daten beim Start und speichere sie als Klassen-Attribut
         self.poll_data: dict = load_polls()
+        self.poll_mtime = get_polls_mtime()
         
         # Starte die Hintergrundaufgabe
         self.poll_watcher_task.start()
@@ -310,9 +349,16 @@ class TrackingCommand(commands.Cog):
     async def poll_watcher_task(self):
         """Überwacht laufende Discord-Abstimmungen und verarbeitet die Ergebnisse nach Ablauf."""
         
-        # Lade die Poll-Daten neu, um den neuesten Stand zu erhalten
-        self.poll_data = load_polls()
-        finished_polls = []
+        # Poll-Daten nur neu laden, wenn die Datei seit dem letzten Tick geändert wurde
+        mtime = get_polls_mtime()
+        if mtime != self.poll_mtime:
+            self.poll_data = load_polls()
+            self.poll_mtime = mtime
+            count("polls.reloads")
+        polls_changed = False
+
+        # 1. Beendete Polls einsammeln und nach Guild gruppieren
+        finished_by_guild: Dict[Optional[int], List[tuple]] = {}
 
         for message_id, data in self.poll_data.copy().items(): # Iteriere über eine Kopie, da wir das Original ändern
             channel_id = data["channel_id"]
@@ -320,130 +366,126 @@ class TrackingCommand(commands.Cog):
             channel = self.bot.get_channel(channel_id)
 
             if channel is None:
-                finished_polls.append(message_id)
+                self.poll_data.pop(message_id, None)
+                polls_changed = True
                 continue
 
-            guild_id = channel.guild.id if channel.guild else None
-            tracked_bots = get_tracked_bots(guild_id=guild_id)
             try:
                 # Verwende self.bot zum Holen der Nachricht
                 msg = await channel.fetch_message(int(message_id))
             except:
-                finished_polls.append(message_id)
+                self.poll_data.pop(message_id, None)
+                polls_changed = True
                 continue
 
             if msg.poll is None:
-                finished_polls.append(message_id)
+                self.poll_data.pop(message_id, None)
+                polls_changed = True
                 continue
 
-            poll = msg.poll
-            if poll.is_finalised:
-                # Poll beendet: Daten entfernen und Ergebnis verarbeiten
+            if msg.poll.is_finalised:
+                # Poll beendet: Daten entfernen, Ergebnis wird unten verarbeitet
                 self.poll_data.pop(message_id, None)
+                polls_changed = True
 
-                save_polls(self.poll_data)
-                
-                
-                # Sicherer Zugriff auf die Zähler (Ja/Nein sind Index 1 und 2)
-                ja_answer = poll.get_answer(1)
-                nein_answer = poll.get_answer(2)
-                
-                # Use asynchronous list comprehension to gather all voters and get the count
-                ja_voters = [v async for v in ja_answer.voters()] if ja_answer else []
-                nein_voters = [v async for v in nein_answer.voters()] if nein_answer else []
+                guild_id = channel.guild.id if channel.guild else None
+                finished_by_guild.setdefault(guild_id, []).append((channel, msg.poll))
 
-                ja = len(ja_voters)
-                nein = len(nein_voters)
+        # Entfernte Polls einmalig speichern, bevor die Ergebnisse verarbeitet werden
+        if polls_changed:
+            save_polls(self.poll_data)
+            self.poll_mtime = get_polls_mtime()
 
-                match = re.search(r"Bot '(.+?)' \((.+?)\)", poll.question)
-                if match:
-                    actionedbot_name = match.group(1)
-                    actionedbot_author = match.group(2)
-                else:
-                    actionedbot_name = None
-                    actionedbot_author = None
-                    
-                leaderboard_json, _ = get_leaderboard_json()
-                actionedbot_info = None
-                
-                for bot_entry in leaderboard_json:
-                    if actionedbot_name and actionedbot_author and (
-                        bot_entry.get("Bot", "").lower() == actionedbot_name.lower() and
-                        bot_entry.get("Autor / Team", "").lower() == actionedbot_author.lower()
-                    ):
-                        actionedbot_info = bot_entry
-                        break
+        if not finished_by_guild:
+            return
 
-                if not actionedbot_info:
-                    await channel.send(f"❌ Bot '{actionedbot_name}' ({actionedbot_author}) nicht in Leaderboard gefunden.")
-                    continue 
-                    
-                # Bestimme, ob es eine 'add' oder 'remove' Abstimmung war
-                mode = "remove" if "entfernt" in poll.question else "add"
+        # 2. Ergebnisse pro Guild verarbeiten (ein Leaderboard-Abruf pro Tick, ein Schreibvorgang pro Guild)
+        tick = PollTickContext(self.bot.loop)
+        for guild_id, finished_polls in finished_by_guild.items():
+            for channel, poll in finished_polls:
+                await self.resolve_finished_poll(tick, guild_id, channel, poll)
+            tick.flush(guild_id)
+
+    async def resolve_finished_poll(self, tick: "PollTickContext", guild_id, channel, poll: discord.Poll):
+        """Wertet eine beendete Abstimmung aus und wendet das Ergebnis auf die Tracking-Liste der Guild an."""
+        # Sicherer Zugriff auf die Zähler (Ja/Nein sind Index 1 und 2)
+        ja_answer = poll.get_answer(1)
+        nein_answer = poll.get_answer(2)
+        
+        # Use asynchronous list comprehension to gather all voters and get the count
+        ja_voters = [v async for v in ja_answer.voters()] if ja_answer else []
+        nein_voters = [v async for v in nein_answer.voters()] if nein_answer else []
+
+        ja = len(ja_voters)
+        nein = len(nein_voters)
+
+        match = re.search(r"Bot '(.+?)' \((.+?)\)", poll.question)
+        if match:
+            actionedbot_name = match.group(1)
+            actionedbot_author = match.group(2)
+        else:
+            actionedbot_name = None
+            actionedbot_author = None
+
+        leaderboard_json = await tick.get_leaderboard_json()
+        if leaderboard_json and "error" in leaderboard_json[0]:
+            await channel.send(leaderboard_json[0]["error"])
+            return
+
+        actionedbot_info = None
+        for bot_entry in leaderboard_json:
+            if actionedbot_name and actionedbot_author and (
+                bot_entry.get("Bot", "").lower() == actionedbot_name.lower() and
+                bot_entry.get("Autor / Team", "").lower() == actionedbot_author.lower()
+            ):
+                actionedbot_info = bot_entry
+                break
+
+        if not actionedbot_info:
+            await channel.send(f"❌ Bot '{actionedbot_name}' ({actionedbot_author}) nicht in Leaderboard gefunden.")
+            return
+
+        tracked_bots = tick.get_tracked_bots(guild_id)
+
+        # Bestimme, ob es eine 'add' oder 'remove' Abstimmung war
+        mode = "remove" if "entfernt" in poll.question else "add"
+            
+        if mode == "add":
+            if ja > nein:
+                await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nun zu den Getrackten Bots Hinzugefügt!")
+
+                MAX_TRACKED_BOTS = 25
+                bot_dict = {
+                    "name": actionedbot_info.get("Bot"),
+                    "emoji": actionedbot_info.get("Col1", ""),
+                    "author": actionedbot_info.get("Autor / Team", ""),
+                }
+
+                if len(tracked_bots) < MAX_TRACKED_BOTS and bot_dict not in tracked_bots:
+                    tracked_bots.append(bot_dict)
+                    tick.mark_changed(guild_id)
                     
-                if mode == "add":
-                    if ja > nein:
-                        await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nun zu den Getrackten Bots Hinzugefügt!")
-                        
-                        leaderboard_json, _ = get_leaderboard_json()
-                        if "error" in leaderboard_json[0]:
-                            await channel.send(leaderboard_json[0]["error"])
-                            continue
-
-                        bot_names = [actionedbot_info] 
-                        added_bots = []
-                        MAX_TRACKED_BOTS = 25
-
-                        for bot_name_dict in bot_names:
-                            bot_info = bot_name_dict 
-                            
-                            bot_dict = {
-                                "name": bot_info.get("Bot"),
-                                "emoji": bot_info.get("Col1", ""),
-                                "author": bot_info.get("Autor / Team", ""),
-                            }
-                            
-                            if len(tracked_bots) >= MAX_TRACKED_BOTS:
-                                continue
-
-                            if bot_dict in tracked_bots:
-                                continue
-
-                            tracked_bots.append(bot_dict)
-                            added_bots.append(bot_dict)
-                            
-                        if added_bots:
-                            set_tracked_bots(guild_id=guild_id, tracked=tracked_bots)
-                            
-                    else:
-                        await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nicht zu den Getrackten Bots Hinzugefügt!")
+            else:
+                await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nicht zu den Getrackten Bots Hinzugefügt!")
+        
+        else: # mode == "remove"
+            if ja > nein:
+                await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nun von den Getrackten Bots Entfernt!")
                 
-                else: # mode == "remove"
-                    if ja > nein:
-                        await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nun von den Getrackten Bots Entfernt!")
-                        
-                        removed = None
-                        for i, b in enumerate(tracked_bots):
-                            if b["name"].lower() == actionedbot_name.lower() and b["author"].lower() == actionedbot_author.lower():
-                                removed = tracked_bots.pop(i)
-                                break
-                                
-                        if removed:
-                            set_tracked_bots(guild_id=guild_id, tracked=tracked_bots)
-                            await channel.send(f"✅ Bot '{actionedbot_name} ({actionedbot_author})' wurde entfernt!")
-                        else:
-                            await channel.send(f"❌ Bot '{actionedbot_name} ({actionedbot_author})' nicht in der Tracking-Liste gefunden!")
+                removed = None
+                for i, b in enumerate(tracked_bots):
+                    if b["name"].lower() == actionedbot_name.lower() and b["author"].lower() == actionedbot_author.lower():
+                        removed = tracked_bots.pop(i)
+                        break
                         
-                    else:
-                        await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nicht von den Getrackten Bots Entfernt!")
-
-        # Entferne Polls, deren Channel/Nachricht nicht mehr erreichbar waren
-        for message_id in finished_polls:
-            if message_id in self.poll_data:
-                del self.poll_data[message_id]
+                if removed:
+                    tick.mark_changed(guild_id)
+                    await channel.send(f"✅ Bot '{actionedbot_name} ({actionedbot_author})' wurde entfernt!")
+                else:
+                    await channel.send(f"❌ Bot '{actionedbot_name} ({actionedbot_author})' nicht in der Tracking-Liste gefunden!")
                 
-        if self.poll_data:
-            save_polls(self.poll_data)
+            else:
+                await channel.send(f"Der Bot {actionedbot_name} ({actionedbot_author}) wurde nach dem Voting nicht von den Getrackten Bots Entfernt!")
             
     @poll_watcher_task.before_loop
     async def before_poll_watcher_task(self):
@@ -457,6 +499,7 @@ class TrackingCommand(commands.Cog):
         
         # Lade Poll-Daten neu, um den aktuellsten Stand zu haben, falls eine andere Instanz sie geändert hat
         self.poll_data = load_polls()
+        self.poll_mtime = get_polls_mtime()
 
         if mode not in ["add", "remove"]:
             await ctx.send("Nutze: `!polltrack add <Botname>` oder `!polltrack remove <Botname>`")
@@ -545,4 +588,5 @@ class TrackingCommand(commands.Cog):
         }
 
         save_polls(self.poll_data)
+        self.poll_mtime = get_polls_mtime()
         await ctx.send("🗳️ Abstimmung wurde erstellt und endet in 1 Stunde!")
\ No newline at end of file
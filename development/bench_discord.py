@@ -0,0 +1,176 @@
+# development/bench_discord.py
+#
+# End-to-end timing of the !lb path and the scheduled fan-out against the fake
+# Discord harness (fake_discord.py) and the stand-in site (standin_server.py),
+# so nothing leaves the machine:
+#
+#   python development/bench_discord.py
+#   python development/bench_discord.py --channels 25 --rows 1000 --repeat 3
+#   python development/bench_discord.py --only lb_images scheduled_fanout --json
+#
+# Besides the wall time, every scenario reports the recorded Discord calls
+# (sends, edits, threads, attachment bytes, simulated rate-limit waits). The
+# call counts are deterministic, so --check fails when they change compared to
+# the expected shape below.
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from bench_utils import use_temp_local_data
+from fake_discord import FakeDiscord
+from standin_server import StandinConfig, start_standin_thread
+
+local_data = use_temp_local_data()
+
+from helper_scripts.data_functions import save_bot_data
+from helper_scripts.helper_functions import (
+    send_leaderboard,
+    send_table_images,
+    send_table_texts,
+    post_lb_in_scheduled_channels,
+    get_leaderboard_json,
+)
+
+TRACKED_EVERY = 10
+
+
+def tracked_sample(leaderboard_json, every: int = TRACKED_EVERY):
+    return [{"name": e.get("Bot", ""), "author": e.get("Autor / Team", "")} for e in leaderboard_json[::every]]
+
+
+async def scenario_lb_images(harness, ctx):
+    await send_leaderboard(harness.channel(), ctx["tracked"], top_x=20, force_text=False, as_thread=True, guild_id=1)
+
+
+async def scenario_lb_all_images(harness, ctx):
+    await send_leaderboard(harness.channel(), [], top_x=0, force_text=False, as_thread=True)
+
+
+async def scenario_lb_text(harness, ctx):
+    await send_leaderboard(harness.channel(), ctx["tracked"], top_x=0, force_text=True, as_thread=False)
+
+
+async def scenario_table_images(harness, ctx):
+    channel = harness.channel()
+    status_msg = await channel.send("status")
+    await send_table_images(channel, status_msg, ctx["json"], 0, "# Leaderboard")
+
+
+async def scenario_table_texts(harness, ctx):
+    channel = harness.channel()
+    status_msg = await channel.send("status")
+    await send_table_texts(channel, status_msg, ctx["json"], 0, "# Leaderboard")
+
+
+async def scenario_scheduled_fanout(harness, ctx):
+    guilds = {}
+    for i in range(ctx["channels"]):
+        guild = harness.guild(f"Guild {i}")
+        channel = guild.channel("leaderboard")
+        guilds[str(guild.id)] = {
+            "tracked_bots": ctx["tracked"],
+            "scheduled_channels": [channel.id],
+            "tracked_voting_bots": ctx["tracked"][:3] if i % 2 else [],
+            "alert_channels": [],
+        }
+    save_bot_data({"guild_data": guilds})
+    await post_lb_in_scheduled_channels(harness.bot())
+
+
+SCENARIOS = {
+    "lb_images": scenario_lb_images,
+    "lb_all_images": scenario_lb_all_images,
+    "lb_text": scenario_lb_text,
+    "table_images": scenario_table_images,
+    "table_texts": scenario_table_texts,
+    "scheduled_fanout": scenario_scheduled_fanout,
+}
+
+# Call counts for the recorded fixtures (25 scrims rows, 3 tracked bots)
+EXPECTED_FIXTURE_CALLS = {
+    "lb_images": {"send_calls": 4, "edit_calls": 4, "attachments": 2},
+    "lb_all_images": {"send_calls": 4, "edit_calls": 2, "create_thread_calls": 1, "attachments": 3},
+    "lb_text": {"send_calls": 6, "edit_calls": 2, "attachments": 0},
+}
+
+
+async def run_scenario(fn, ctx, repeat: int, time_scale: float):
+    times, summary = [], None
+    for _ in range(repeat):
+        harness = FakeDiscord(time_scale=time_scale)
+        start = time.perf_counter()
+        await fn(harness, ctx)
+        times.append((time.perf_counter() - start) * 1000)
+        summary = harness.summary()
+    return {
+        "median_ms": round(statistics.median(times), 2),
+        "min_ms": round(min(times), 2),
+        **summary,
+    }
+
+
+def check(results) -> list[str]:
+    problems = []
+    for name, expected in EXPECTED_FIXTURE_CALLS.items():
+        if name not in results:
+            continue
+        for key, value in expected.items():
+            if results[name].get(key, 0) != value:
+                problems.append(f"{name}: {key} = {results[name].get(key, 0)}, expected {value}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=0, help="synthetic rows (default: recorded fixtures)")
+    parser.add_argument("--channels", type=int, default=3, help="scheduled channels for the fan-out")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="stand-in site latency")
+    parser.add_argument("--time-scale", type=float, default=0.0, help="1 = really sleep the rate-limit waits")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS))
+    parser.add_argument("--json", action="store_true")
+    parser.add_argument("--check", action="store_true", help="compare call counts with the fixture expectations")
+    args = parser.parse_args()
+
+    base_url, site, stop = start_standin_thread(StandinConfig(latency_ms=args.latency_ms, synthetic_rows=args.rows))
+    os.environ["HIDDEN_GEMS_BASE_URL"] = base_url
+
+    try:
+        leaderboard_json, _meta = get_leaderboard_json()
+        if "error" in leaderboard_json[0]:
+            sys.exit(leaderboard_json[0]["error"])
+        ctx = {"json": leaderboard_json, "tracked": tracked_sample(leaderboard_json), "channels": args.channels}
+
+        results = {}
+        for name, fn in SCENARIOS.items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = asyncio.run(run_scenario(fn, ctx, args.repeat, args.time_scale))
+            if not args.json:
+                r = results[name]
+                print(f"{name:18} median {r['median_ms']:9.1f} ms  calls {r['calls']:4}  "
+                      f"files {r['attachments']:3} ({r['attachment_bytes'] / 1024:8.1f} KiB)  "
+                      f"rate-limit wait {r['rate_limit_wait_s']:6.1f} s")
+    finally:
+        stop()
+
+    report = {"rows": len(leaderboard_json), "site_requests": dict(site.stats), "results": results}
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+    if args.check:
+        if args.rows:
+            sys.exit("--check only works with the recorded fixtures")
+        problems = check(results)
+        for problem in problems:
+            print(f"[CHECK] {problem}")
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
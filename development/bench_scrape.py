@@ -0,0 +1,171 @@
+# development/bench_scrape.py
+#
+# Checks that the column-wise parse_scrims_html() returns exactly what the old
+# row-by-row parser returned, and compares their per-row cost. Building the
+# BeautifulSoup tree is the same for both and dominates the total, so the
+# conversion step (cell strings -> typed columns) is also timed on its own.
+#
+#   python development/bench_scrape.py [--rows 100 1000 10000] [--repeat 3]
+
+import argparse
+import os
+import re
+import time
+
+from bench_utils import use_temp_local_data, FIXTURES_DIR
+from synthetic_leaderboard import generate_leaderboard_html
+
+use_temp_local_data()
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from helper_scripts.data_analysis import parse_scrims_html, collect_scrims_cells, convert_scrims_columns, LANG_MAP
+
+FIXTURE = FIXTURES_DIR / "scrims.html"
+
+
+# MARK: legacy parser
+# The row-by-row parser scrape_data() used before, kept as the reference.
+def legacy_parse_float(text: str):
+    if not text: return None
+    t = text.strip().replace('%', '').replace(',', '.')
+    try:
+        m = re.search(r'(-?\d+(.\d+)?)', t)
+        if m: return float(m.group(1))
+    except: pass
+    return None
+
+
+def legacy_parse(html: str):
+    soup = BeautifulSoup(html, 'html.parser')
+
+    target_table = None
+    for tbl in soup.find_all('table'):
+        headers_text = [th.get_text(strip=True) for th in tbl.find_all('th')]
+        if "Bot" in headers_text and "Score" in headers_text:
+            target_table = tbl
+            break
+
+    if not target_table:
+        return {"error": "Keine Leaderboard-Tabelle auf der Webseite gefunden."}
+
+    rows = []
+    tbody = target_table.find('tbody') or target_table
+    for tr in tbody.find_all('tr'):
+        if 'spacer' in (tr.get('class') or []): continue
+        tds = tr.find_all('td')
+        if len(tds) < 10: continue
+
+        def txt(i): return tds[i].get_text(strip=True) if i < len(tds) else ""
+
+        rank_raw = txt(0)
+        rank = int(re.sub(r'\D', '', rank_raw)) if re.search(r'\d', rank_raw) else None
+
+        try: score = int(re.sub(r'[^\d\-]', '', txt(3)))
+        except: score = 0
+
+        lang = "Unknown"
+        img = tds[9].find('img')
+        if img and img.get('src'):
+            src_base = os.path.basename(img.get('src').split('?')[0])
+            m = re.match(r'([a-z0-9_\-]+)-logo', src_base, flags=re.I)
+            if m:
+                key = m.group(1).lower()
+                lang = LANG_MAP.get(key, key.capitalize())
+
+        rows.append({
+            "rank": rank, "bot": txt(2), "score": score,
+            "gu_pct": legacy_parse_float(txt(4)), "cf_pct": legacy_parse_float(txt(5)),
+            "fc_pct": legacy_parse_float(txt(6)),
+            "author": txt(7), "city": txt(8), "language": lang
+        })
+
+    return pd.DataFrame(rows)
+
+
+def legacy_convert(raw, logo_src):
+    """The per-row conversions of legacy_parse(), applied to already collected cells."""
+    rows = []
+    for r in range(len(logo_src)):
+        rank_raw = raw["rank"][r]
+        rank = int(re.sub(r'\D', '', rank_raw)) if re.search(r'\d', rank_raw) else None
+
+        try: score = int(re.sub(r'[^\d\-]', '', raw["score"][r]))
+        except: score = 0
+
+        lang = "Unknown"
+        if logo_src[r]:
+            src_base = os.path.basename(logo_src[r].split('?')[0])
+            m = re.match(r'([a-z0-9_\-]+)-logo', src_base, flags=re.I)
+            if m:
+                key = m.group(1).lower()
+                lang = LANG_MAP.get(key, key.capitalize())
+
+        rows.append({
+            "rank": rank, "bot": raw["bot"][r], "score": score,
+            "gu_pct": legacy_parse_float(raw["gu_pct"][r]), "cf_pct": legacy_parse_float(raw["cf_pct"][r]),
+            "fc_pct": legacy_parse_float(raw["fc_pct"][r]),
+            "author": raw["author"][r], "city": raw["city"][r], "language": lang
+        })
+    return pd.DataFrame(rows)
+
+
+# Cells the synthetic pages never contain: non-ASCII digits (which \\d matches and
+# int()/float() accept), a lone minus, DNQ ranks and text around the numbers.
+UNUSUAL_CELLS = [
+    {"rank": "٣", "score": "٣", "gu_pct": "٣", "cf_pct": "٣,٥ %", "fc_pct": "٣٫٥"},
+    {"rank": "#12", "score": "-٤٢", "gu_pct": "12,5 %", "cf_pct": "ca. 7.25", "fc_pct": "n/a"},
+    {"rank": "DNQ", "score": "-", "gu_pct": "", "cf_pct": "-3", "fc_pct": "1.5.2"},
+]
+
+
+def check_unusual_cells():
+    raw = {name: [] for name in ("rank", "bot", "score", "gu_pct", "cf_pct", "fc_pct", "author", "city")}
+    for i, cells in enumerate(UNUSUAL_CELLS):
+        for name in raw:
+            raw[name].append(cells.get(name, f"{name}{i}"))
+    logo_src = ["/img/python-logo-256.png?v=1", "", "/img/zig-logo.png"]
+    pd.testing.assert_frame_equal(convert_scrims_columns(raw, logo_src), legacy_convert(raw, logo_src))
+    print(f"{len(UNUSUAL_CELLS)} unusual rows: output identical to the legacy parser")
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    html = FIXTURE.read_text(encoding="utf-8")
+    pd.testing.assert_frame_equal(parse_scrims_html(html), legacy_parse(html))
+    print(f"fixture {FIXTURE.name}: output identical to the legacy parser")
+    check_unusual_cells()
+
+    print(f"{'rows':>7} | {'full old':>10} {'full new':>10} | {'convert old':>11} {'convert new':>11} {'us/row old':>10} {'us/row new':>10}")
+    for rows in args.rows:
+        doc = generate_leaderboard_html(rows, seed=rows)
+        pd.testing.assert_frame_equal(parse_scrims_html(doc), legacy_parse(doc))
+        full_old = best_of(lambda: legacy_parse(doc), args.repeat)
+        full_new = best_of(lambda: parse_scrims_html(doc), args.repeat)
+
+        cells = collect_scrims_cells(doc)
+        conv_old = best_of(lambda: legacy_convert(*cells), args.repeat)
+        conv_new = best_of(lambda: convert_scrims_columns(*cells), args.repeat)
+        print(
+            f"{rows:>7} | {full_old * 1000:>8.1f}ms {full_new * 1000:>8.1f}ms "
+            f"| {conv_old * 1000:>9.1f}ms {conv_new * 1000:>9.1f}ms "
+            f"{conv_old / rows * 1e6:>10.2f} {conv_new / rows * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
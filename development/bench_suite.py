@@ -0,0 +1,147 @@
+# development/bench_suite.py
+#
+# Offline benchmark suite for the parse, render and filter hot paths.
+# Runs against the recorded fixtures in development/fixtures/ and against
+# synthetic leaderboards with 100, 1k and 10k rows. Results are written as
+# JSON so two commits can be compared:
+#
+#   python development/bench_suite.py                       # -> development/bench_results/<commit>.json
+#   python development/bench_suite.py --sizes 100 1000 --repeat 3 --only parse_html_to_json
+#   python development/bench_suite.py --compare development/bench_results/abc1234.json
+#
+# All runtime files go to a temp HG_LOCAL_DATA_DIR, local_data/ stays untouched.
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_utils import use_temp_local_data, load_fixture, measure, git_commit
+from synthetic_leaderboard import generate_leaderboard_html
+
+use_temp_local_data()
+
+import helper_scripts.data_analysis as data_analysis
+from helper_scripts.helper_functions import (
+    extract_leaderboard_meta,
+    parse_html_to_json,
+    json_to_text_table,
+    generate_images_from_json,
+    filter_json_tracked,
+)
+
+RESULTS_DIR = Path(__file__).resolve().parent / "bench_results"
+RECORDED_FIXTURES = {"scrims": "scrims.html", "voting": "voting.html"}
+DEFAULT_SIZES = [100, 1000, 10000]
+SYNTHETIC_SEED = 42
+
+
+def build_fixtures(sizes):
+    """name -> html. Synthetic pages come from synthetic_leaderboard.py with a fixed seed."""
+    fixtures = {name: load_fixture(file_name) for name, file_name in RECORDED_FIXTURES.items()}
+    for rows in sizes:
+        fixtures[f"synthetic-{rows}"] = generate_leaderboard_html(rows, seed=SYNTHETIC_SEED)
+    return fixtures
+
+
+def tracked_sample(leaderboard_json, every: int = 10):
+    """Every n-th bot as tracked list (the shape stored in bot_data.json)."""
+    return [
+        {"name": e.get("Bot", ""), "author": e.get("Autor / Team", "")}
+        for e in leaderboard_json[::every]
+    ]
+
+
+def scrape_data_offline(html):
+    """scrape_data() with the download replaced by the fixture."""
+    fetch = data_analysis.fetch_scrims_html
+    data_analysis.fetch_scrims_html = lambda: html
+    try:
+        return data_analysis.scrape_data()
+    finally:
+        data_analysis.fetch_scrims_html = fetch
+
+
+# name -> fn(context) ; context holds html, json, df, tracked list and an output folder
+BENCHMARKS = {
+    "extract_leaderboard_meta": lambda c: extract_leaderboard_meta(c["html"]),
+    "parse_html_to_json": lambda c: parse_html_to_json(c["html"]),
+    "scrape_data": lambda c: scrape_data_offline(c["html"]),
+    "json_to_text_table": lambda c: json_to_text_table(c["json"]),
+    "generate_images_from_json": lambda c: generate_images_from_json(c["json"]),
+    "filter_json_tracked": lambda c: filter_json_tracked(c["json"], c["tracked"]),
+    "generate_plots_images": lambda c: data_analysis.generate_plots_images(c["df"], c["plots_dir"]),
+}
+
+
+def run_suite(fixtures, repeat, only=None):
+    results = []
+    plots_root = Path(tempfile.mkdtemp(prefix="hg_bench_plots_"))
+    for fixture_name, html in fixtures.items():
+        leaderboard_json = parse_html_to_json(html)
+        context = {
+            "html": html,
+            "json": leaderboard_json,
+            "df": data_analysis.parse_scrims_html(html),
+            "tracked": tracked_sample(leaderboard_json),
+            "plots_dir": plots_root / fixture_name,
+        }
+        for bench_name, fn in BENCHMARKS.items():
+            if only and bench_name not in only:
+                continue
+            # Very slow paths get fewer runs on the big fixtures
+            runs = 1 if len(leaderboard_json) >= 5000 else repeat
+            stats = measure(lambda: fn(context), repeat=runs, warmup=0 if runs == 1 else 1)
+            result = {"benchmark": bench_name, "fixture": fixture_name, "rows": len(leaderboard_json), **stats}
+            results.append(result)
+            print(f"{bench_name:28} {fixture_name:17} {len(leaderboard_json):>6} rows  "
+                  f"median {stats['median_ms']:11.3f} ms  min {stats['min_ms']:11.3f} ms")
+    return results
+
+
+def compare(results, baseline_path: Path):
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    old = {(r["benchmark"], r["fixture"]): r for r in baseline["results"]}
+    print(f"\nCompared to {baseline['commit']} (median, <1.00 = faster now):")
+    for r in results:
+        before = old.get((r["benchmark"], r["fixture"]))
+        if before and before["median_ms"] > 0:
+            ratio = r["median_ms"] / before["median_ms"]
+            flag = "  <-- slower" if ratio > 1.10 else ""
+            print(f"  {r['benchmark']:28} {r['fixture']:17} {before['median_ms']:11.3f} -> "
+                  f"{r['median_ms']:11.3f} ms  x{ratio:.2f}{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run only these benchmarks")
+    parser.add_argument("--output", type=Path, help="result file (default: bench_results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = run_suite(build_fixtures(args.sizes), args.repeat, args.only)
+
+    report = {
+        "commit": commit,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# development/bench_utils.py
+#
+# Shared helpers for the development/bench_*.py scripts.
+# Call use_temp_local_data() BEFORE importing anything from helper_scripts,
+# so benchmarks never touch the bot's real local_data/ folder.
+
+import math
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def use_temp_local_data() -> Path:
+    """Point HG_LOCAL_DATA_DIR to a fresh temp folder (unless it is already set)."""
+    if not os.getenv("HG_LOCAL_DATA_DIR"):
+        os.environ["HG_LOCAL_DATA_DIR"] = tempfile.mkdtemp(prefix="hg_bench_")
+    path = Path(os.environ["HG_LOCAL_DATA_DIR"])
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def load_fixture(name: str) -> str:
+    return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+def measure(fn, repeat: int = 5, warmup: int = 1, min_sample_ms: float = 5.0) -> dict:
+    """
+    Run fn repeatedly, return per-call timing stats in milliseconds.
+    Fast functions are called several times per sample (at least min_sample_ms,
+    calibrated during warm-up), otherwise timer resolution and noise dominate.
+    """
+    number = 1
+    for _ in range(warmup):
+        start = time.perf_counter()
+        fn()
+        first_ms = (time.perf_counter() - start) * 1000
+        if first_ms < min_sample_ms:
+            number = max(1, math.ceil(min_sample_ms / max(first_ms, 1e-3)))
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "min_ms": round(min(times), 4),
+        "median_ms": round(statistics.median(times), 4),
+        "mean_ms": round(statistics.fmean(times), 4),
+        "max_ms": round(max(times), 4),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
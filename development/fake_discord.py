@@ -0,0 +1,335 @@
+# development/fake_discord.py
+#
+# In-process stand-ins for the discord.py objects the leaderboard paths use
+# (channel, message, thread, guild, user, context, bot). Every send / edit / create_thread is
+# recorded with content length, attachment byte sizes and the rate-limit wait
+# Discord would have imposed, so send_leaderboard() and the scheduled fan-out
+# can be timed and checked offline:
+#
+#   harness = FakeDiscord()
+#   channel = harness.channel()
+#   await send_leaderboard(channel, tracked_bots=[], top_x=20, force_text=False, as_thread=False)
+#   print(harness.summary())
+#
+# Rate limits are simulated per channel and action with a fixed window bucket
+# (5 messages / 5 s per channel like Discord). The waits are only recorded by
+# default (time_scale=0); time_scale=1 actually sleeps them.
+
+import asyncio
+import itertools
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# (requests, window in seconds) per action and channel
+DEFAULT_RATE_LIMITS = {
+    "send": (5, 5.0),
+    "edit": (5, 5.0),
+    "create_thread": (10, 300.0),
+}
+
+_ids = itertools.count(1_000_000_000_000_000)
+
+
+def _next_id() -> int:
+    return next(_ids)
+
+
+def attachment_size(file) -> int:
+    """Byte size of a discord.File (or anything with an fp), the file is closed afterwards."""
+    fp = getattr(file, "fp", None)
+    if fp is None:
+        return 0
+    try:
+        try:
+            return os.fstat(fp.fileno()).st_size
+        except (AttributeError, OSError, ValueError):
+            position = fp.tell()
+            fp.seek(0, os.SEEK_END)
+            size = fp.tell() - position
+            fp.seek(position)
+            return size
+    finally:
+        close = getattr(file, "close", None)
+        if close:
+            close()
+
+
+@dataclass
+class FakeCall:
+    action: str                 # send / edit / create_thread
+    target: str                 # channel or thread name
+    target_id: int
+    at: float                   # seconds since harness start (incl. simulated waits)
+    content_len: int = 0
+    attachments: List[int] = field(default_factory=list)
+    embeds: int = 0
+    rate_limit_wait: float = 0.0
+
+
+class RateLimiter:
+    """Fixed window buckets keyed by (action, channel id), on the harness clock."""
+
+    def __init__(self, harness: "FakeDiscord", limits: Dict[str, tuple]):
+        self.harness = harness
+        self.limits = limits
+        self.buckets: Dict[tuple, list] = {}  # key -> [window_start, used]
+
+    def acquire(self, action: str, channel_id: int) -> float:
+        """Take one request from the bucket, return the wait needed before it."""
+        if action not in self.limits:
+            return 0.0
+        limit, window = self.limits[action]
+        now = self.harness.now()
+        bucket = self.buckets.setdefault((action, channel_id), [now, 0])
+        if now - bucket[0] >= window:
+            bucket[0], bucket[1] = now, 0
+
+        wait = 0.0
+        if bucket[1] >= limit:
+            wait = bucket[0] + window - now
+            bucket[0], bucket[1] = now + wait, 0
+        bucket[1] += 1
+        return wait
+
+
+# MARK: FakeDiscord
+class FakeDiscord:
+    """Owns the clock, the call log and the rate limiter shared by all fakes."""
+
+    def __init__(self, rate_limits: Optional[Dict[str, tuple]] = None, time_scale: float = 0.0, latency_ms: float = 0.0):
+        self.time_scale = time_scale
+        self.latency = latency_ms / 1000
+        self.calls: List[FakeCall] = []
+        self.rate_limiter = RateLimiter(self, DEFAULT_RATE_LIMITS if rate_limits is None else rate_limits)
+        self._start = time.perf_counter()
+        self._virtual_offset = 0.0
+        self.channels: Dict[int, "FakeChannel"] = {}
+
+    def now(self) -> float:
+        """Harness clock: real elapsed time plus simulated waits that were not slept."""
+        return time.perf_counter() - self._start + self._virtual_offset
+
+    async def _api_call(self, action: str, target, content=None, files=(), embeds=0):
+        wait = self.rate_limiter.acquire(action, target.id)
+        if wait:
+            if self.time_scale:
+                await asyncio.sleep(wait * self.time_scale)
+            self._virtual_offset += wait * (1 - self.time_scale)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        else:
+            await asyncio.sleep(0)  # still yield like a real request would
+
+        self.calls.append(FakeCall(
+            action=action,
+            target=target.name,
+            target_id=target.id,
+            at=self.now(),
+            content_len=len(content) if content else 0,
+            attachments=[attachment_size(f) for f in files],
+            embeds=embeds,
+            rate_limit_wait=wait,
+        ))
+
+    def guild(self, name: str = "Test Guild", guild_id: Optional[int] = None) -> "FakeGuild":
+        return FakeGuild(self, name, guild_id or _next_id())
+
+    def channel(self, name: str = "leaderboard", guild: Optional["FakeGuild"] = None, channel_id: Optional[int] = None) -> "FakeChannel":
+        channel = FakeChannel(self, name, channel_id or _next_id(), guild)
+        self.channels[channel.id] = channel
+        return channel
+
+    def bot(self) -> "FakeBot":
+        return FakeBot(self)
+
+    def reset(self):
+        """Forget calls, rate-limit state and sent messages (channels and guilds stay)."""
+        self.calls.clear()
+        self.rate_limiter.buckets.clear()
+        for channel in self.channels.values():
+            channel.messages.clear()
+            channel.threads.clear()
+
+    def summary(self) -> dict:
+        actions = Counter(c.action for c in self.calls)
+        sizes = [size for c in self.calls for size in c.attachments]
+        return {
+            "calls": len(self.calls),
+            **{f"{action}_calls": count for action, count in sorted(actions.items())},
+            "messages_with_files": sum(1 for c in self.calls if c.attachments),
+            "attachments": len(sizes),
+            "attachment_bytes": sum(sizes),
+            "max_attachment_bytes": max(sizes, default=0),
+            "content_chars": sum(c.content_len for c in self.calls),
+            "rate_limited_calls": sum(1 for c in self.calls if c.rate_limit_wait),
+            "rate_limit_wait_s": round(sum(c.rate_limit_wait for c in self.calls), 3),
+            "simulated_duration_s": round(self.calls[-1].at - self.calls[0].at, 3) if self.calls else 0.0,
+        }
+
+
+class _Messageable:
+    """send() shared by channels and threads."""
+
+    def __init__(self, harness: FakeDiscord, name: str, channel_id: int):
+        self.harness = harness
+        self.name = name
+        self.id = channel_id
+        self.messages: List[FakeMessage] = []
+
+    async def send(self, content=None, *, file=None, files=None, embed=None, embeds=None, **kwargs):
+        all_files = ([file] if file else []) + list(files or [])
+        all_embeds = ([embed] if embed else []) + list(embeds or [])
+        await self.harness._api_call("send", self, content, all_files, len(all_embeds))
+        message = FakeMessage(self, content, len(all_files), all_embeds)
+        message.poll = kwargs.get("poll")
+        self.messages.append(message)
+        return message
+
+    def typing(self):
+        return _Typing()
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+
+class _Typing:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeChannel(_Messageable):
+    def __init__(self, harness: FakeDiscord, name: str, channel_id: int, guild: Optional["FakeGuild"] = None):
+        super().__init__(harness, name, channel_id)
+        self.guild = guild
+        self.threads: List[FakeThread] = []
+
+    async def fetch_message(self, message_id: int) -> "FakeMessage":
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise LookupError(f"Unknown Message {message_id}")  # discord.NotFound in the real client
+
+
+class FakeThread(_Messageable):
+    def __init__(self, harness: FakeDiscord, name: str, parent: _Messageable):
+        super().__init__(harness, name, _next_id())
+        self.parent = parent
+        self.guild = getattr(parent, "guild", None)
+
+
+class FakeMessage:
+    def __init__(self, channel: _Messageable, content: Optional[str], attachment_count: int = 0, embeds=None):
+        self.id = _next_id()
+        self.channel = channel
+        self.content = content
+        self.attachment_count = attachment_count
+        self.embeds = embeds or []
+        self.thread: Optional[FakeThread] = None
+        self.poll = None
+
+    async def edit(self, content=None, *, embed=None, embeds=None, **kwargs):
+        await self.channel.harness._api_call("edit", self.channel, content, embeds=int(embed is not None) + len(embeds or []))
+        if content is not None:
+            self.content = content
+        return self
+
+    async def create_thread(self, *, name: str, **kwargs) -> FakeThread:
+        await self.channel.harness._api_call("create_thread", self.channel, name)
+        self.thread = FakeThread(self.channel.harness, name, self.channel)
+        if isinstance(self.channel, FakeChannel):
+            self.channel.threads.append(self.thread)
+        return self.thread
+
+    async def add_reaction(self, emoji):
+        return None
+
+
+class FakeGuild:
+    def __init__(self, harness: FakeDiscord, name: str, guild_id: int):
+        self.harness = harness
+        self.name = name
+        self.id = guild_id
+        self.channels: List[FakeChannel] = []
+
+    def channel(self, name: str = "leaderboard", channel_id: Optional[int] = None) -> FakeChannel:
+        channel = self.harness.channel(name, guild=self, channel_id=channel_id)
+        self.channels.append(channel)
+        return channel
+
+
+class FakeUser:
+    def __init__(self, name: str = "tester", user_id: Optional[int] = None):
+        self.name = name
+        self.display_name = name
+        self.id = user_id or _next_id()
+        self.bot = False
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+
+class FakeContext:
+    """
+    commands.Context replacement for invoking cog commands directly:
+    await ctx.invoke(bot.get_command("lb"), "20"). Checks and cooldowns are
+    skipped, like with the real Context.invoke(), the command events are
+    dispatched (listeners such as the profiler see them).
+    """
+
+    def __init__(self, bot, channel: _Messageable, author: Optional[FakeUser] = None, prefix: str = "!"):
+        self.bot = bot
+        self.channel = channel
+        self.guild = getattr(channel, "guild", None)
+        self.author = author or FakeUser()
+        self.prefix = prefix
+        self.command = None
+
+    async def send(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+    async def reply(self, content=None, **kwargs):
+        return await self.channel.send(content, **kwargs)
+
+    async def defer(self, **kwargs):
+        return None
+
+    def typing(self):
+        return _Typing()
+
+    async def invoke(self, command, *args, **kwargs):
+        """Run the command and dispatch on_command / on_command_completion / on_command_error like bot.invoke()."""
+        self.command = command
+        dispatch = getattr(self.bot, "dispatch", None)
+        if dispatch:
+            dispatch("command", self)
+        try:
+            result = await command(self, *args, **kwargs)
+        except Exception as e:
+            if dispatch:
+                dispatch("command_error", self, e)
+            raise
+        if dispatch:
+            dispatch("command_completion", self)
+        return result
+
+
+class FakeBot:
+    """Just enough of commands.Bot for post_lb_in_scheduled_channels()."""
+
+    def __init__(self, harness: FakeDiscord):
+        self.harness = harness
+
+    def get_channel(self, channel_id: int):
+        return self.harness.channels.get(int(channel_id))
+
+    @property
+    def guilds(self) -> List[FakeGuild]:
+        return list({c.guild.id: c.guild for c in self.harness.channels.values() if c.guild}.values())
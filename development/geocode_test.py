@@ -0,0 +1,129 @@
+# development/geocode_test.py
+#
+# Runs the geocoding pipeline (helper_scripts/geo.py) against a local fake
+# geocoder instead of Nominatim and checks:
+#   - concurrent pipelines share one rate limiter, their requests together
+#     stay within NOMINATIM_RATE_PER_SEC
+#   - gazetteer hits and cached cities are never sent to the geocoder
+#   - 'not found' answers are cached (negative cache), errors are retried
+#   - get_city_coords_with_progress() returns the normalised city counts
+#
+#   python development/geocode_test.py
+#
+# Exit code 1 if a check fails. Takes a few seconds, the shared limiter keeps
+# the real 1 request per second.
+
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+from bench_utils import use_temp_local_data
+
+use_temp_local_data()
+
+import pandas as pd
+
+from helper_scripts import geo
+
+
+# MARK: fake geocoder
+class FakeGeocoder:
+    """geopy-like geocode(query): known cities resolve, 'Fehlerstadt' raises, the rest is not found."""
+
+    KNOWN = {"Fakestadt": (50.0, 10.0), "Testhausen": (51.0, 11.0), "Nirgendwo": None}
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.fail = True
+
+    def geocode(self, query: str):
+        with self.lock:
+            self.calls.append((time.monotonic(), query))
+        city = query.removesuffix(", Germany")
+        if city == "Fehlerstadt" and self.fail:
+            raise ConnectionError("service unavailable")
+        coords = self.KNOWN.get(city)
+        if coords is None:
+            return None
+        return SimpleNamespace(latitude=coords[0], longitude=coords[1])
+
+    def queried(self, city: str) -> int:
+        return sum(1 for _, query in self.calls if query.removesuffix(", Germany") == city)
+
+
+failures = []
+
+
+def check(condition: bool, message: str):
+    print(f"[{'OK' if condition else 'FAIL'}] {message}")
+    if not condition:
+        failures.append(message)
+
+
+# MARK: checks
+def check_shared_limiter():
+    fake = FakeGeocoder()
+    first, second = geo.GeocodingPipeline(geocoder=fake), geo.GeocodingPipeline(geocoder=fake)
+    check(first.limiter is second.limiter is geo.get_shared_limiter(), "pipelines share one rate limiter")
+
+    threads = [
+        threading.Thread(target=first.resolve, args=(["Fakestadt", "Testhausen"],)),
+        threading.Thread(target=second.resolve, args=(["Fakestadt", "Testhausen"],)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stamps = sorted(at for at, _ in fake.calls)
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    min_gap = 1 / geo.NOMINATIM_RATE_PER_SEC
+    check(
+        all(gap >= min_gap * 0.95 for gap in gaps),
+        f"{len(stamps)} requests from 2 concurrent pipelines, smallest gap "
+        f"{min(gaps, default=0):.2f}s (limit {min_gap:.2f}s)",
+    )
+
+
+def check_caches():
+    fake = FakeGeocoder()
+    result = geo.GeocodingPipeline(geocoder=fake).resolve(["Berlin", "Fakestadt", "Nirgendwo", "Fehlerstadt"])
+    check(fake.queried("Berlin") == 0, "gazetteer city is not geocoded")
+    check(fake.queried("Fakestadt") == 0, "city cached by an earlier pipeline is not geocoded")
+    check(set(result) == {"Berlin", "Fakestadt"}, f"resolved cities: {sorted(result)}")
+    check(fake.queried("Nirgendwo") == 2, "unknown city tried with and without ', Germany'")
+
+    fake = FakeGeocoder()
+    fake.fail = False
+    result = geo.GeocodingPipeline(geocoder=fake).resolve(["Nirgendwo", "Fehlerstadt"])
+    check(fake.queried("Nirgendwo") == 0, "'not found' answer is cached (negative cache)")
+    check(fake.queried("Fehlerstadt") > 0, "city that failed with an error is retried")
+    check(not result, "no coordinates for unknown cities")
+
+    pipeline = geo.GeocodingPipeline(geocoder=fake, negative_ttl=0)
+    pipeline.resolve(["Nirgendwo"])
+    check(fake.queried("Nirgendwo") == 2, "expired negative cache entry is retried")
+
+
+def check_city_counts():
+    df = pd.DataFrame({"city": ["Berlin", "berlin ", "Fakestadt", "Testhausen", "Fakestadt", "Nirgendwo"]})
+    mapped = geo.get_city_coords_with_progress(df, geocoder=FakeGeocoder())
+    counts = {c["city"]: int(c["count"]) for c in mapped}
+    check(counts == {"Berlin": 2, "Fakestadt": 2, "Testhausen": 1}, f"mapped city counts: {counts}")
+
+
+def main():
+    check_shared_limiter()
+    check_caches()
+    check_city_counts()
+
+    if failures:
+        print(f"\n{len(failures)} check(s) failed.")
+        sys.exit(1)
+    print("\nAll geocoding checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# development/import_report.py
+#
+# Startup import cost of the bot, parsed from `python -X importtime`.
+# Run it from the repo root:
+#
+#   python development/import_report.py                 # imports the bot entry module
+#   python development/import_report.py -m helper_scripts.registry --top 30
+#   python development/import_report.py --json > import_report.json
+#
+# The entry module is only imported, main() does not run.
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Should not be imported before the first !map / !stats (see helper_scripts/lazy_imports.py)
+HEAVY_PACKAGES = ("pandas", "matplotlib", "folium", "geopy", "contextily", "scipy")
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_importtime(module: str):
+    env = dict(os.environ, HG_WARMUP_IMPORTS="0")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:], file=sys.stderr)
+        sys.exit(f"import of {module} failed")
+    return proc.stderr
+
+
+def parse_importtime(stderr: str):
+    """Returns a list of (module, self_us, cumulative_us, depth)."""
+    entries = []
+    for line in stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            entries.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def build_report(module: str, entries):
+    top_level = [e for e in entries if e[3] == 0]
+    packages = {}
+    for name, self_us, _cum, _depth in entries:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+
+    return {
+        "module": module,
+        "python": sys.version.split()[0],
+        "total_ms": round(sum(e[1] for e in entries) / 1000, 1),
+        "modules_imported": len(entries),
+        "heavy_loaded": sorted({e[0].split(".")[0] for e in entries} & set(HEAVY_PACKAGES)),
+        "top_level_ms": {name: round(cum / 1000, 1) for name, _s, cum, _d in sorted(top_level, key=lambda e: -e[2])},
+        "packages_ms": {name: round(us / 1000, 1) for name, us in sorted(packages.items(), key=lambda kv: -kv[1])},
+    }
+
+
+def print_report(report, top: int):
+    print(f"Import of {report['module']} (Python {report['python']}): "
+          f"{report['total_ms']} ms, {report['modules_imported']} modules")
+    heavy = report["heavy_loaded"]
+    print(f"Heavy packages at startup: {', '.join(heavy) if heavy else 'none'}")
+
+    print(f"\nTop {top} packages (self time summed):")
+    for name, ms in list(report["packages_ms"].items())[:top]:
+        print(f"  {ms:9.1f} ms  {name}")
+
+    print(f"\nTop {top} top-level imports (cumulative):")
+    for name, ms in list(report["top_level_ms"].items())[:top]:
+        print(f"  {ms:9.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-m", "--module", default="hidden_gems_leaderboard_bot")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = build_report(args.module, parse_importtime(run_importtime(args.module)))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+# development/load_generator.py
+#
+# Replays a command mix from many guilds at once against the real cogs, with
+# fake contexts (fake_discord.py) and the stand-in site (standin_server.py).
+# Reports per-command latency percentiles, event-loop lag and peak RSS:
+#
+#   python development/load_generator.py                                  # 50 guilds, burst
+#   python development/load_generator.py --mix lb=5,track_add=2,stats=2,map=1 --per-guild 3
+#   python development/load_generator.py --arrival poisson --rate 20 --duration 30
+#   python development/load_generator.py --rows 2000 --site-latency-ms 150 --json -o load.json
+#
+# Commands are invoked like ctx.invoke() does (no checks / cooldowns), one
+# fake guild, channel and user per simulated guild.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from bench_utils import use_temp_local_data, git_commit
+from fake_discord import FakeDiscord, FakeContext, FakeUser
+from standin_server import StandinConfig, start_standin_thread
+
+use_temp_local_data()
+
+import discord
+from discord.ext import commands
+
+from helper_scripts.registry import register_commands
+from helper_scripts.helper_functions import send_leaderboard, parse_html_to_json
+from helper_scripts.metrics import snapshot as metrics_snapshot
+from helper_scripts.loop_watchdog import LoopWatchdog
+
+DEFAULT_MIX = "lb=4,track_add=2,stats=3,map=1"
+STATS_PLOTS = ("score", "gu", "cf", "fc", "lang", "city")
+
+
+# name -> fn(rng, bot_names) -> (command name, args, kwargs)
+COMMANDS = {
+    "lb": lambda rng, names: ("leaderboard", (rng.choice(["10", "20", "0"]),), {}),
+    "lb_text": lambda rng, names: ("leaderboard", ("text",), {}),
+    "track_add": lambda rng, names: ("track", ("add",), {"arg": rng.choice(names)}),
+    "track_list": lambda rng, names: ("track", ("list",), {}),
+    "stats": lambda rng, names: ("stats", (rng.choice(STATS_PLOTS),), {}),
+    "map": lambda rng, names: ("map", (rng.choice(["png", "cluster"]),), {}),
+}
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in COMMANDS:
+            raise argparse.ArgumentTypeError(f"unknown command {name!r}, known: {', '.join(COMMANDS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile, 0 for an empty list."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def current_rss_mb() -> float:
+    """Resident set size from /proc (Linux), 0 elsewhere."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+# MARK: LoopMonitor
+class LoopMonitor:
+    """Measures how late a periodic sleep wakes up (= event-loop lag) and samples RSS."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags = []
+        self.rss_samples = []
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, loop.time() - start - self.interval) * 1000)
+            if len(self.lags) % 10 == 0:
+                self.rss_samples.append(current_rss_mb())
+
+    def start(self):
+        self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def report(self) -> dict:
+        return {
+            "samples": len(self.lags),
+            "p50_ms": round(percentile(self.lags, 50), 2),
+            "p95_ms": round(percentile(self.lags, 95), 2),
+            "p99_ms": round(percentile(self.lags, 99), 2),
+            "max_ms": round(max(self.lags, default=0.0), 2),
+            "blocked_over_100ms": sum(1 for lag in self.lags if lag > 100),
+        }
+
+
+def blocking_summary(stalls) -> dict:
+    """command -> number of watchdog stalls and blocked time."""
+    summary = {}
+    for stall in stalls:
+        entry = summary.setdefault(stall["command"] or stall["task"] or "?", {"stalls": 0, "blocked_ms": 0.0})
+        entry["stalls"] += 1
+        entry["blocked_ms"] = round(entry["blocked_ms"] + stall.get("duration", 0.0) * 1000, 1)
+    return summary
+
+
+def build_schedule(args, mix: dict, rng: random.Random):
+    """List of (start offset in s, guild index, command key)."""
+    keys, weights = list(mix), list(mix.values())
+    schedule = []
+    if args.arrival == "burst":
+        for guild_index in range(args.guilds):
+            for _ in range(args.per_guild):
+                schedule.append((0.0, guild_index, rng.choices(keys, weights)[0]))
+    else:
+        at = 0.0
+        while at < args.duration:
+            at += rng.expovariate(args.rate)
+            schedule.append((at, rng.randrange(args.guilds), rng.choices(keys, weights)[0]))
+    return schedule
+
+
+async def run_command(ctx, command, cmd_args, cmd_kwargs, delay, latencies, errors, key):
+    if delay:
+        await asyncio.sleep(delay)
+    start = time.perf_counter()
+    try:
+        await ctx.invoke(command, *cmd_args, **cmd_kwargs)
+    except Exception as e:
+        errors[key].append(f"{type(e).__name__}: {e}")
+    latencies[key].append((time.perf_counter() - start) * 1000)
+
+
+async def run_load(args, mix: dict, bot_names):
+    rng = random.Random(args.seed)
+    intents = discord.Intents.default()
+    intents.message_content = True
+
+    # async with sets up the bot's loop without logging in
+    async with commands.Bot(command_prefix="!", intents=intents, help_command=None) as bot:
+        await register_commands(bot, set(), set(), {}, lambda: None, send_leaderboard)
+        harness = FakeDiscord(time_scale=args.time_scale)
+
+        contexts = []
+        for i in range(args.guilds):
+            guild = harness.guild(f"Guild {i}")
+            channel = guild.channel("bot-commands")
+            contexts.append((channel, FakeUser(f"user{i}")))
+
+        latencies, errors = defaultdict(list), defaultdict(list)
+        schedule = build_schedule(args, mix, rng)
+        monitor = LoopMonitor(args.lag_interval_ms / 1000)
+        monitor.start()
+        watchdog = None
+        if args.watchdog_ms > 0:
+            watchdog = LoopWatchdog(asyncio.get_running_loop(), threshold=args.watchdog_ms / 1000)
+            watchdog.start()
+
+        start = time.perf_counter()
+        tasks = []
+        for delay, guild_index, key in schedule:
+            name, cmd_args, cmd_kwargs = COMMANDS[key](rng, bot_names)
+            channel, user = contexts[guild_index]
+            ctx = FakeContext(bot, channel, user)
+            tasks.append(run_command(ctx, bot.get_command(name), cmd_args, cmd_kwargs, delay, latencies, errors, key))
+        await asyncio.gather(*tasks)
+        wall = time.perf_counter() - start
+
+        await monitor.stop()
+        if watchdog:
+            await asyncio.sleep(watchdog.interval * 3)  # let the last stall be closed
+            watchdog.stop()
+        await bot.remove_cog("StatsCommand")  # shuts down the plot pool
+
+    return {
+        "commands": len(schedule),
+        "wall_s": round(wall, 2),
+        "throughput_per_s": round(len(schedule) / wall, 2) if wall else 0.0,
+        "latency": {
+            key: {
+                "count": len(values),
+                "errors": len(errors[key]),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+                "max_ms": round(max(values), 1),
+            }
+            for key, values in sorted(latencies.items())
+        },
+        "first_errors": {key: values[:3] for key, values in errors.items()},
+        "event_loop_lag": monitor.report(),
+        "rss_mb": {
+            "peak": round(peak_rss_mb(), 1),
+            "peak_children": round(peak_rss_mb(resource.RUSAGE_CHILDREN), 1),
+            "max_sampled": round(max(monitor.rss_samples, default=current_rss_mb()), 1),
+        },
+        "discord": harness.summary(),
+        "stages": metrics_snapshot(),
+        "blocking_stalls": blocking_summary(watchdog.stalls if watchdog else []),
+    }
+
+
+def print_report(report: dict):
+    print(f"{report['commands']} commands in {report['wall_s']} s ({report['throughput_per_s']}/s)\n")
+    print(f"{'command':12} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for key, s in report["latency"].items():
+        print(f"{key:12} {s['count']:6} {s['errors']:4} {s['p50_ms']:9.1f} {s['p95_ms']:9.1f} {s['p99_ms']:9.1f} {s['max_ms']:9.1f}")
+    for key, messages in report["first_errors"].items():
+        for message in messages:
+            print(f"[ERROR] {key}: {message}")
+
+    lag = report["event_loop_lag"]
+    print(f"\nEvent-loop lag: p50 {lag['p50_ms']} ms  p95 {lag['p95_ms']} ms  p99 {lag['p99_ms']} ms  "
+          f"max {lag['max_ms']} ms  ({lag['blocked_over_100ms']} samples > 100 ms)")
+    for command, entry in report["blocking_stalls"].items():
+        print(f"  blocked by {command}: {entry['stalls']} stall(s), {entry['blocked_ms']:.0f} ms")
+    rss = report["rss_mb"]
+    print(f"Peak RSS: {rss['peak']} MiB (children {rss['peak_children']} MiB)")
+    print("\nStages (helper_scripts/metrics.py):")
+    for name, st in report["stages"]["spans"].items():
+        print(f"  {name:22} n {st['count']:4}  p50 {st['p50_ms']:9.1f} ms  p95 {st['p95_ms']:9.1f} ms")
+    d = report["discord"]
+    print(f"Discord calls: {d['calls']}, attachments {d['attachment_bytes'] / 2**20:.1f} MiB, "
+          f"simulated rate-limit wait {d['rate_limit_wait_s']} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"command=weight list (default {DEFAULT_MIX}), known: {', '.join(COMMANDS)}")
+    parser.add_argument("--arrival", choices=["burst", "poisson"], default="burst",
+                        help="burst: all commands at once, poisson: --rate commands/s for --duration s")
+    parser.add_argument("--per-guild", type=int, default=1, help="commands per guild in burst mode")
+    parser.add_argument("--rate", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--rows", type=int, default=0, help="synthetic rows (default: recorded fixtures)")
+    parser.add_argument("--site-latency-ms", type=float, default=0.0)
+    parser.add_argument("--time-scale", type=float, default=0.0, help="1 = really sleep Discord rate-limit waits")
+    parser.add_argument("--lag-interval-ms", type=float, default=10.0)
+    parser.add_argument("--watchdog-ms", type=float, default=250.0, help="log blocking stalls above this (0 = off)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("-o", "--output", type=Path, help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    config = StandinConfig(latency_ms=args.site_latency_ms, synthetic_rows=args.rows, seed=args.seed)
+    base_url, site, stop = start_standin_thread(config)
+    os.environ["HIDDEN_GEMS_BASE_URL"] = base_url
+
+    try:
+        bot_names = [e["Bot"] for e in parse_html_to_json(site.page_body("scrims").decode("utf-8")) if e.get("Bot")]
+        report = asyncio.run(run_load(args, args.mix, bot_names))
+    finally:
+        stop()
+
+    report = {
+        "commit": git_commit(),
+        "guilds": args.guilds,
+        "arrival": args.arrival,
+        "mix": args.mix,
+        "site_requests": dict(site.stats),
+        **report,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+# development/soak_test.py
+#
+# Soak mode: runs the bot's periodic work for days of virtual time against the
+# fake Discord harness (fake_discord.py) and the stand-in site
+# (standin_server.py) and fails when a resource keeps growing:
+#
+#   python development/soak_test.py                                 # 8 virtual days
+#   python development/soak_test.py --days 14 --commands-per-hour 1 -o soak.json
+#   python development/soak_test.py --days 1 --sample-minutes 30 --json
+#
+# A virtual clock replaces time.time() (the monotonic clocks stay real, so
+# asyncio is unaffected) and is moved forward tick by tick instead of sleeping.
+# The clock starts at local midnight, then:
+#   every 5 s       poll watcher (TrackingCommand.poll_watcher_task)
+#   every 15 min    alert watcher (AlertsCommand.alert_watcher_task)
+#   every hour      --commands-per-hour commands from the load generator mix
+#   every 6 h       a poll that the watcher picks up and resolves
+#   03:00 daily     scheduled leaderboard fan-out
+#
+# Every --sample-minutes, RSS, open file descriptors, asyncio tasks, threads and
+# the size / file count of the local data folder are sampled. After the
+# warm-up (by default until the map output retention has kicked in), a metric
+# counts as leaking when
+#   - its trend (linear fit over all samples after the warm-up) rises faster
+#     than its allowed growth per day, or
+#   - the mean of the last quarter is above the first quarter by more than its
+#     absolute tolerance and the second half is still rising.
+# Exit code 1 if any metric leaks. RSS of this tree rises in steps of a few
+# MiB that level off (native allocator growth, tracemalloc shows no growing
+# Python objects), about 1-4 MiB/day; a steady 10 MiB/day leak fails the
+# default run.
+#
+# The analysis data cache compares real file mtimes with the virtual
+# time.time(), so its one-hour expiry does not follow the virtual clock.
+
+import argparse
+import asyncio
+import datetime
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from bench_utils import use_temp_local_data, git_commit
+from fake_discord import FakeDiscord, FakeContext, FakeUser
+from standin_server import StandinConfig, start_standin_thread
+from load_generator import COMMANDS, parse_mix, current_rss_mb
+
+local_data = use_temp_local_data()
+
+import discord
+from discord.ext import commands
+
+from helper_scripts.registry import register_commands
+from helper_scripts.data_functions import save_bot_data, load_polls, save_polls
+from helper_scripts.helper_functions import send_leaderboard, parse_html_to_json, post_lb_in_scheduled_channels
+from helper_scripts.metrics import snapshot as metrics_snapshot
+from commands.maps import OUTPUT_FOLDERS_KEPT
+
+DEFAULT_MIX = "lb=4,lb_text=1,track_add=1,track_list=1,stats=2,map=1"
+
+TICK_SEC = 5                      # poll watcher interval
+ALERT_INTERVAL_SEC = 15 * 60
+POLL_INTERVAL_SEC = 6 * 3600
+SCHEDULE_AT_SEC = 3 * 3600        # CronTrigger(hour=3) in the bot
+DAY_SEC = 24 * 3600
+
+# metric -> (absolute tolerance, allowed trend per virtual day)
+TOLERANCES = {
+    "rss_mb": (25.0, 5.0),
+    "fds": (4, 0.5),
+    "tasks": (3, 0.5),
+    "threads": (2, 0.5),
+    "disk_mb": (1.0, 0.25),
+    "files": (5, 1.0),
+}
+
+
+# MARK: VirtualClock
+class VirtualClock:
+    """Replaces time.time() while active; advance() moves it forward."""
+
+    def __init__(self, start: float):
+        self.now = start
+        self._real_time = None
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+    def __enter__(self):
+        self._real_time = time.time
+        time.time = lambda: self.now
+        return self
+
+    def __exit__(self, *exc):
+        time.time = self._real_time
+        return False
+
+
+def local_midnight() -> float:
+    return datetime.datetime.combine(datetime.date.today(), datetime.time()).timestamp()
+
+
+# MARK: sampling
+def open_fds() -> int:
+    """Open file descriptors of this process (Linux), 0 elsewhere."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return 0
+
+
+def folder_usage(path: Path):
+    """(size in MiB, number of files) of everything below path."""
+    size, files = 0, 0
+    for root, _dirs, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+                files += 1
+            except OSError:
+                pass  # removed while walking
+    return size / 2**20, files
+
+
+def take_sample(virtual_s: float) -> dict:
+    gc.collect()
+    disk_mb, files = folder_usage(local_data)
+    return {
+        "virtual_h": round(virtual_s / 3600, 2),
+        "rss_mb": round(current_rss_mb(), 1),
+        "fds": open_fds(),
+        "tasks": len(asyncio.all_tasks()),
+        "threads": threading.active_count(),
+        "disk_mb": round(disk_mb, 2),
+        "files": files,
+    }
+
+
+# MARK: find_leaks()
+def find_leaks(samples: list, warmup_h: float) -> dict:
+    """metric -> verdict for the samples after the warm-up (empty if there are too few)."""
+    body = [s for s in samples if s["virtual_h"] >= warmup_h]
+    if len(body) < 8:
+        return {}
+    quarter = len(body) // 4
+    second_half = body[len(body) // 2:]
+
+    verdicts = {}
+    for metric, (abs_tol, max_per_day) in TOLERANCES.items():
+        values = [s[metric] for s in body]
+        first = statistics.fmean(values[:quarter])
+        last = statistics.fmean(values[-quarter:])
+        per_day = _slope_per_day(body, metric)
+        still_rising = _slope_per_day(second_half, metric) > 0
+        verdicts[metric] = {
+            "first_quarter": round(first, 2),
+            "last_quarter": round(last, 2),
+            "allowed_growth": abs_tol,
+            "trend_per_day": round(per_day, 3),
+            "allowed_per_day": max_per_day,
+            "leak": per_day > max_per_day or (last - first > abs_tol and still_rising),
+        }
+    return verdicts
+
+
+def _slope_per_day(samples: list, metric: str) -> float:
+    values = [s[metric] for s in samples]
+    if len(set(values)) < 2:
+        return 0.0
+    return statistics.linear_regression([s["virtual_h"] for s in samples], values).slope * 24
+
+
+# MARK: run_soak()
+async def run_soak(args, entries) -> dict:
+    rng = random.Random(args.seed)
+    keys, weights = list(args.mix), list(args.mix.values())
+    bot_names = [e["Bot"] for e in entries]
+    intents = discord.Intents.default()
+    intents.message_content = True
+
+    # async with sets up the bot's loop without logging in
+    async with commands.Bot(command_prefix="!", intents=intents, help_command=None) as bot:
+        await register_commands(bot, set(), set(), {}, lambda: None, send_leaderboard)
+        harness = FakeDiscord()
+        bot.get_channel = harness.bot().get_channel  # watchers and fan-out resolve the fake channels
+        tracking, alerts = bot.get_cog("TrackingCommand"), bot.get_cog("AlertsCommand")
+
+        guilds, contexts = {}, []
+        for i in range(args.guilds):
+            guild = harness.guild(f"Guild {i}")
+            channel = guild.channel("leaderboard")
+            guilds[str(guild.id)] = {
+                "tracked_bots": [
+                    {"name": e["Bot"], "author": e.get("Autor / Team", ""), "emoji": e.get("Col1", "")}
+                    for e in entries[i::args.guilds][:3]
+                ],
+                "scheduled_channels": [channel.id],
+                "tracked_voting_bots": [],
+                "alert_channels": [channel.id],
+            }
+            contexts.append((channel, FakeUser(f"user{i}")))
+        save_bot_data({"guild_data": guilds})
+
+        samples, errors, ran = [], Counter(), Counter()
+        total_ticks = int(args.days * DAY_SEC) // TICK_SEC
+        sample_every = int(args.sample_minutes * 60)
+        real_start = time.perf_counter()
+
+        with VirtualClock(local_midnight()) as clock:
+            for tick in range(total_ticks + 1):
+                t = tick * TICK_SEC
+
+                if t % sample_every == 0:
+                    harness.reset()  # the harness' own call log must not count as a leak
+                    samples.append(take_sample(t))
+                    if args.progress and t % DAY_SEC == 0:
+                        s = samples[-1]
+                        print(f"[SOAK] day {t // DAY_SEC}: RSS {s['rss_mb']} MiB, fds {s['fds']}, "
+                              f"tasks {s['tasks']}, disk {s['disk_mb']} MiB ({s['files']} files), "
+                              f"{time.perf_counter() - real_start:.0f}s real", file=sys.stderr)
+                if tick == total_ticks:
+                    break
+
+                await tracking.poll_watcher_task()
+                ran["poll_watcher"] += 1
+
+                if t % ALERT_INTERVAL_SEC == 0:
+                    await alerts.alert_watcher_task()
+                    ran["alert_watcher"] += 1
+
+                if t % POLL_INTERVAL_SEC == 0:
+                    channel, _user = rng.choice(contexts)
+                    msg = await channel.send("🗳️ Soll der Bot getrackt werden?")
+                    polls = load_polls()
+                    polls[str(msg.id)] = {"channel_id": channel.id, "bot_name": rng.choice(bot_names), "bot_author": ""}
+                    save_polls(polls)
+                    ran["polls"] += 1
+
+                if t % DAY_SEC == SCHEDULE_AT_SEC:
+                    await post_lb_in_scheduled_channels(bot)
+                    ran["scheduled_fanout"] += 1
+
+                if t % 3600 == 0:
+                    for _ in range(args.commands_per_hour):
+                        key = rng.choices(keys, weights)[0]
+                        name, cmd_args, cmd_kwargs = COMMANDS[key](rng, bot_names)
+                        channel, user = rng.choice(contexts)
+                        try:
+                            await FakeContext(bot, channel, user).invoke(bot.get_command(name), *cmd_args, **cmd_kwargs)
+                        except Exception as e:
+                            errors[f"{key}: {type(e).__name__}: {e}"] += 1
+                        ran[key] += 1
+
+                clock.advance(TICK_SEC)
+                await asyncio.sleep(0)
+
+        await bot.remove_cog("StatsCommand")  # shuts down the plot pool
+
+    return {
+        "real_s": round(time.perf_counter() - real_start, 1),
+        "ran": dict(ran),
+        "errors": dict(errors.most_common(10)),
+        "samples": samples,
+        "leaks": find_leaks(samples, args.warmup_hours),
+        "output_folders": sorted(p.name for p in local_data.glob("scrims_out_*")),
+        "counters": metrics_snapshot()["counters"],
+    }
+
+
+def print_report(report: dict):
+    print(f"{report['days']} virtual day(s) in {report['real_s']} s real time")
+    print("Ran: " + ", ".join(f"{k} {v}" for k, v in sorted(report["ran"].items())))
+    for message, n in report["errors"].items():
+        print(f"[ERROR] {n}x {message}")
+    print(f"Output folders kept: {', '.join(report['output_folders']) or '-'}")
+    print(f"Poll file reloads: {report['counters'].get('polls.reloads', 0)}\n")
+
+    if not report["leaks"]:
+        print("Not enough samples after the warm-up for a verdict (use more --days or smaller --sample-minutes).")
+        return
+    print(f"{'metric':8} {'first q.':>10} {'last q.':>10} {'allowed':>9} {'trend/day':>10} {'allowed':>9}  verdict")
+    for metric, v in report["leaks"].items():
+        verdict = "LEAK" if v["leak"] else "ok"
+        print(f"{metric:8} {v['first_quarter']:10.2f} {v['last_quarter']:10.2f} {v['allowed_growth']:9.2f} "
+              f"{v['trend_per_day']:10.3f} {v['allowed_per_day']:9.2f}  {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=float, default=OUTPUT_FOLDERS_KEPT + 5.0, help="virtual days to run")
+    parser.add_argument("--guilds", type=int, default=5)
+    parser.add_argument("--commands-per-hour", type=int, default=2, help="user commands per virtual hour")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"command=weight list (default {DEFAULT_MIX}), known: {', '.join(COMMANDS)}")
+    parser.add_argument("--sample-minutes", type=float, default=60.0, help="virtual minutes between samples")
+    parser.add_argument("--warmup-hours", type=float, default=(OUTPUT_FOLDERS_KEPT + 1) * 24.0,
+                        help="virtual hours ignored by the leak check (default: until old map folders get pruned)")
+    parser.add_argument("--change-every", type=int, default=8,
+                        help="stand-in pages change every n requests (drives alerts and snapshots)")
+    parser.add_argument("--rows", type=int, default=0, help="synthetic rows (default: recorded fixtures)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--progress", action="store_true", help="print one line per virtual day to stderr")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("-o", "--output", type=Path, help="also write the JSON report to this file")
+    args = parser.parse_args()
+    if args.sample_minutes * 60 % TICK_SEC:
+        parser.error(f"--sample-minutes must be a multiple of {TICK_SEC} s")
+
+    config = StandinConfig(synthetic_rows=args.rows, change_every=args.change_every, seed=args.seed)
+    base_url, site, stop = start_standin_thread(config)
+    os.environ["HIDDEN_GEMS_BASE_URL"] = base_url
+
+    try:
+        entries = [e for e in parse_html_to_json(site.page_body("scrims").decode("utf-8")) if e.get("Bot")]
+        report = asyncio.run(run_soak(args, entries))
+    finally:
+        stop()
+
+    report = {
+        "commit": git_commit(),
+        "days": args.days,
+        "guilds": args.guilds,
+        "commands_per_hour": args.commands_per_hour,
+        "site_requests": dict(site.stats),
+        **report,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    sys.exit(1 if any(v["leak"] for v in report["leaks"].values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# development/standin_server.py
+#
+# Local stand-in for the Hidden Gems site (aiohttp). Serves /scrims and /voting
+# from the fixtures (or synthetic pages) and can misbehave on purpose, so the
+# fetch, caching and timeout paths of the bot can be exercised offline:
+#
+#   python development/standin_server.py --port 8765 --latency-ms 200 --jitter-ms 50
+#   python development/standin_server.py --synthetic-rows 5000 --change-every 10
+#   python development/standin_server.py --error-rate 0.2 --error-status 503
+#   python development/standin_server.py --drip-bytes-per-sec 20000 --hang-rate 0.05
+#
+# Point the bot at it with HIDDEN_GEMS_BASE_URL=http://127.0.0.1:8765
+#
+# Runtime control:
+#   GET  /_stats    -> request counters as JSON
+#   POST /_config   -> JSON body updates the config, e.g. {"latency_ms": 0, "error_rate": 0.5}
+#   POST /_reset    -> reset the counters
+
+import argparse
+import asyncio
+import dataclasses
+import hashlib
+import random
+import threading
+from collections import Counter
+
+from aiohttp import web
+
+from bench_utils import load_fixture
+from synthetic_leaderboard import generate_leaderboard_html
+
+PAGES = ("scrims", "voting")
+
+
+@dataclasses.dataclass
+class StandinConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    etag: bool = True                  # send ETag, answer If-None-Match with 304
+    error_rate: float = 0.0            # share of requests answered with error_status
+    error_status: int = 503
+    hang_rate: float = 0.0             # share of requests that never answer (client timeout)
+    drip_bytes_per_sec: float = 0.0    # > 0: send the body slowly in chunks
+    drip_chunk: int = 1024
+    synthetic_rows: int = 0            # > 0: synthetic pages instead of the fixtures
+    change_every: int = 0              # > 0: new page content every n requests per page
+    seed: int = 0
+
+
+def parse_option(current, value):
+    """Convert a /_config value to the type of the current one; bool("false") would be True."""
+    if isinstance(current, bool):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in ("1", "true", "yes", "on"):
+            return True
+        if text in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"not a boolean: {value!r}")
+    return type(current)(value)
+
+
+class StandinSite:
+    """Page store, counters and the request handler."""
+
+    def __init__(self, config: StandinConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.stats = Counter()
+        self.versions = Counter()
+        self.bodies = {}
+
+    def page_body(self, page: str) -> bytes:
+        """Current body of a page, rebuilt only when its version changes."""
+        version = self.versions[page] // self.config.change_every if self.config.change_every else 0
+        key = (version, self.config.synthetic_rows)
+        cached = self.bodies.get(page)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        if self.config.synthetic_rows:
+            html = generate_leaderboard_html(self.config.synthetic_rows, seed=self.config.seed + version, board=page)
+        else:
+            html = load_fixture(f"{page}.html")
+            if version:
+                # Enough of a change for a new ETag / snapshot hash
+                html = html.replace("</body>", f"<!-- v{version} --></body>")
+        body = html.encode("utf-8")
+        self.bodies[page] = (key, body)
+        return body
+
+    async def handle_page(self, request: web.Request) -> web.StreamResponse:
+        page = request.match_info["page"]
+        cfg = self.config
+        self.stats["requests"] += 1
+        self.stats[f"requests_{page}"] += 1
+        self.versions[page] += 1
+
+        delay = max(0.0, cfg.latency_ms + self.rng.uniform(-cfg.jitter_ms, cfg.jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+        if cfg.hang_rate and self.rng.random() < cfg.hang_rate:
+            self.stats["hung"] += 1
+            await asyncio.sleep(3600)
+
+        if cfg.error_rate and self.rng.random() < cfg.error_rate:
+            self.stats[f"status_{cfg.error_status}"] += 1
+            return web.Response(status=cfg.error_status, text="injected error")
+
+        body = self.page_body(page)
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if cfg.etag:
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            headers["ETag"] = etag
+            if request.headers.get("If-None-Match") == etag:
+                self.stats["status_304"] += 1
+                return web.Response(status=304, headers={"ETag": etag})
+
+        self.stats["status_200"] += 1
+        self.stats["bytes_sent"] += len(body)
+
+        if cfg.drip_bytes_per_sec > 0:
+            self.stats["dripped"] += 1
+            response = web.StreamResponse(status=200, headers=headers)
+            response.content_length = len(body)
+            await response.prepare(request)
+            pause = cfg.drip_chunk / cfg.drip_bytes_per_sec
+            for start in range(0, len(body), cfg.drip_chunk):
+                await response.write(body[start:start + cfg.drip_chunk])
+                await asyncio.sleep(pause)
+            await response.write_eof()
+            return response
+
+        return web.Response(body=body, headers=headers)
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(dict(self.stats))
+
+    async def handle_config(self, request: web.Request) -> web.Response:
+        changes = await request.json()
+        parsed = {}
+        for name, value in changes.items():
+            if not hasattr(self.config, name):
+                return web.json_response({"error": f"unknown option {name}"}, status=400)
+            try:
+                parsed[name] = parse_option(getattr(self.config, name), value)
+            except ValueError as e:
+                return web.json_response({"error": f"{name}: {e}"}, status=400)
+        # Only applied when every value is valid
+        for name, value in parsed.items():
+            setattr(self.config, name, value)
+        return web.json_response(dataclasses.asdict(self.config))
+
+    async def handle_reset(self, request: web.Request) -> web.Response:
+        self.stats.clear()
+        return web.json_response({})
+
+
+# MARK: create_app()
+def create_app(config: StandinConfig | None = None) -> web.Application:
+    """aiohttp app, also usable in-process (e.g. with aiohttp.test_utils.TestServer)."""
+    site = StandinSite(config or StandinConfig())
+    app = web.Application()
+    app["site"] = site
+    app.router.add_get("/{page:(" + "|".join(PAGES) + ")}", site.handle_page)
+    app.router.add_get("/_stats", site.handle_stats)
+    app.router.add_post("/_config", site.handle_config)
+    app.router.add_post("/_reset", site.handle_reset)
+    return app
+
+
+# MARK: start_standin_thread()
+def start_standin_thread(config: StandinConfig | None = None, host: str = "127.0.0.1"):
+    """
+    Run the stand-in in a daemon thread with its own event loop, so blocking
+    clients (requests in get_leaderboard_json) can be used from the caller's
+    loop. Returns (base_url, site, stop).
+    """
+    app = create_app(config)
+    started = threading.Event()
+    state = {}
+
+    def run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        tcp_site = web.TCPSite(runner, host, 0)
+        loop.run_until_complete(tcp_site.start())
+        state["loop"], state["runner"] = loop, runner
+        state["port"] = tcp_site._server.sockets[0].getsockname()[1]
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
+
+    thread = threading.Thread(target=run, name="standin-server", daemon=True)
+    thread.start()
+    started.wait()
+
+    def stop():
+        state["loop"].call_soon_threadsafe(state["loop"].stop)
+        thread.join(timeout=5)
+
+    return f"http://{host}:{state['port']}", app["site"], stop
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    for field in dataclasses.fields(StandinConfig):
+        flag = "--" + field.name.replace("_", "-")
+        if field.type in (bool, "bool"):
+            parser.add_argument(flag, action=argparse.BooleanOptionalAction, default=field.default)
+        else:
+            kind = int if field.type in (int, "int") else float
+            parser.add_argument(flag, type=kind, default=field.default)
+    args = parser.parse_args()
+
+    config = StandinConfig(**{f.name: getattr(args, f.name) for f in dataclasses.fields(StandinConfig)})
+    print(f"Stand-in server on http://{args.host}:{args.port} - {config}")
+    web.run_app(create_app(config), host=args.host, port=args.port, print=None)
+
+
+if __name__ == "__main__":
+    main()
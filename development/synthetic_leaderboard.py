@@ -0,0 +1,163 @@
+# development/synthetic_leaderboard.py
+#
+# Generates leaderboard pages shaped like the Hidden Gems scrims / voting
+# pages, but as big and as strange as needed: col-md-4 meta boxes, spacer
+# rows, emoji and blackstar cells, <lang>-logo-256.png images (also unknown
+# languages, query strings and missing logos), DNQ rows, duplicate bot names,
+# HTML special characters and long Unicode names (CJK, RTL, combining marks,
+# ZWJ emoji sequences). The same seed always gives the same page.
+#
+#   python development/synthetic_leaderboard.py --rows 10000 --seed 1 -o /tmp/scrims_10k.html
+#   python development/synthetic_leaderboard.py --board voting --rows 500 > voting.html
+
+import argparse
+import datetime
+import html
+import random
+import sys
+
+LANGUAGES = ["python", "cpp", "c", "csharp", "ts", "ruby", "java", "js", "go", "rust", "kotlin", "zig", "haskell"]
+EMOJIS = ["💎", "🔥", "🐢", "⛏️", "🪨", "🦊", "👩‍💻", "🏳️‍🌈", "🇩🇪", ""]
+CITIES = [
+    "Berlin", "Berlin-Steglitz", "berlin ", "Steglitz, Berlin", "München", "Köln", "Hamburg", "Wien",
+    "Zürich", "Graz", "Frankfurt am Main", "Halle (Saale)", "St. Gallen", "Neustadt", "", "Atlantis",
+]
+NAME_PARTS = [
+    "Gem", "Kristall", "Diamant", "Schatz", "Juwel", "Tunnel", "Maulwurf", "Bot", "Hunter",
+    "Jäger", "Räuber", "König", "Sammler", "Greedy", "A*", "Monte Carlo", "Σπίθα", "Ω", "δ",
+]
+WEIRD_NAMES = [
+    "宝石ハンター", "بوت الجواهر", "Ünïcödé Ümläüt", "Z̷a̷l̷g̷o̷ Bot", "👩‍👩‍👧‍👦 Familienbot",
+    "<script>alert(1)</script>", "Tom & Jerry", "   spaces   ", "x" * 120,
+    "Bot mit sehr, sehr langem Namen der garantiert nicht in die Spalte passt",
+]
+AUTHORS = ["Team Steglitz", "Jana K.", "Mehmet Ö.", "Ana & Luca", "Zoë", "Marie-Claire", "Team 7b", "Sören", "李雷", "Die Drei ???"]
+
+
+def _bot_name(rng: random.Random) -> str:
+    if rng.random() < 0.08:
+        return rng.choice(WEIRD_NAMES)
+    parts = rng.sample(NAME_PARTS, k=rng.randint(1, 3))
+    name = "-".join(parts) if rng.random() < 0.3 else " ".join(parts)
+    if rng.random() < 0.3:
+        name += f"_{rng.randint(1, 999)}"
+    return name
+
+
+def _percent(rng: random.Random) -> str:
+    value = rng.uniform(0, 100)
+    style = rng.random()
+    if style < 0.05:
+        return ""
+    if style < 0.4:
+        return f"{value:.1f}".replace(".", ",") + " %"
+    return f"{value:.2f}%"
+
+
+def _score(rng: random.Random, rank_index: int, rows: int) -> str:
+    score = max(0, int(30000 * (1 - rank_index / max(rows, 1)) + rng.randint(-300, 300)))
+    if rng.random() < 0.01:
+        return rng.choice(["–", "n/a", ""])
+    return f"{score:,}".replace(",", ".") if score > 999 and rng.random() < 0.5 else str(score)
+
+
+def _emoji_cell(rng: random.Random, rank_index: int) -> str:
+    if rank_index < 3:
+        return '<td class="emoji"><img src="/images/blackstar.png"></td>'
+    return f'<td class="emoji">{rng.choice(EMOJIS)}</td>'
+
+
+def _language_cell(rng: random.Random) -> str:
+    if rng.random() < 0.05:
+        return "<td></td>"
+    lang = rng.choice(LANGUAGES)
+    query = f"?v={rng.randint(1, 9)}" if rng.random() < 0.3 else ""
+    return f'<td><img src="/images/{lang}-logo-256.png{query}" alt="{lang}"></td>'
+
+
+# MARK: generate_leaderboard_html()
+def generate_leaderboard_html(
+    rows: int = 100,
+    seed: int = 0,
+    board: str = "scrims",
+    dnq_fraction: float = 0.15,
+    spacer_every: int = 0,
+) -> str:
+    """
+    Build a full page with `rows` bot rows. The last dnq_fraction of the rows
+    are DNQ (empty rank). A spacer row separates qualified and DNQ bots and,
+    with spacer_every > 0, is also inserted every n rows.
+    """
+    rng = random.Random(f"{board}-{seed}")
+    qualified = rows - int(rows * dnq_fraction)
+    esc = html.escape
+
+    lines = []
+    for i in range(rows):
+        if i == qualified or (spacer_every and i and i % spacer_every == 0):
+            lines.append('<tr class="spacer"><td colspan="11"></td></tr>')
+
+        rank = f"{i + 1}." if i < qualified else ""
+        cells = [
+            f"<td>{rank}</td>",
+            _emoji_cell(rng, i),
+            f"<td>{esc(_bot_name(rng))}</td>",
+            f"<td>{_score(rng, i, rows)}</td>",
+            f"<td>{_percent(rng)}</td>",
+            f"<td>{_percent(rng)}</td>",
+            f"<td>{_percent(rng)}</td>",
+            f"<td>{esc(rng.choice(AUTHORS))}</td>",
+            f"<td>{esc(rng.choice(CITIES))}</td>",
+            _language_cell(rng),
+            f"<td><code>{rng.getrandbits(28):07x}</code></td>",
+        ]
+        lines.append("<tr>" + "".join(cells) + "</tr>")
+
+    day = datetime.date(2026, 1, 1) + datetime.timedelta(days=rng.randint(0, 300))
+    stage = rng.randint(1, 5)
+    stage_name = "Voting-Runde" if board == "voting" else "Labyrinth der Kristalle"
+    seed_text = f"{rng.getrandbits(24):06x} ({rng.choice([20, 50, 100])} Runden)"
+
+    return f"""<!DOCTYPE html>
+<html lang="de">
+<head><meta charset="utf-8"><title>Hidden Gems – {board.capitalize()}</title></head>
+<body>
+<div class="container">
+<div class="row">
+<div class="col-md-4"><h3>Datum</h3><p>{day.day}. {day.strftime('%B')} {day.year}</p></div>
+<div class="col-md-4"><h3>Stage #{stage}</h3><p>{stage_name}</p></div>
+<div class="col-md-4"><h3>Seed</h3><p>{seed_text}</p></div>
+</div>
+<table class="table">
+<thead><tr><th>Rang</th><th></th><th>Bot</th><th>Score</th><th>GU</th><th>CF</th><th>FC</th><th>Autor / Team</th><th>Ort</th><th>Sprache</th><th>Commit</th></tr></thead>
+<tbody>
+{chr(10).join(lines)}
+</tbody>
+</table>
+</div>
+</body>
+</html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--board", choices=["scrims", "voting"], default="scrims")
+    parser.add_argument("--dnq-fraction", type=float, default=0.15)
+    parser.add_argument("--spacer-every", type=int, default=0)
+    parser.add_argument("-o", "--output", help="file to write (default: stdout)")
+    args = parser.parse_args()
+
+    page = generate_leaderboard_html(args.rows, args.seed, args.board, args.dnq_fraction, args.spacer_every)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(page)
+    else:
+        sys.stdout.reconfigure(encoding="utf-8")
+        sys.stdout.write(page)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@
 
 # Standard library imports
 import re
+import functools
 from enum import Enum
 from typing import Type
 from PIL import Image
@@ -115,7 +116,7 @@ LANGUAGE_ICONS = {
 
 
 def get_lang_icon(lang_str: str) -> Image.Image:
-    """Return the local icon image matching the language string."""
+    """Return the local icon image matching the language string (shared, do not modify it)."""
     lang_key = lang_str.strip().lower()  # normalize input
 
     # exact match first
@@ -128,14 +129,23 @@ def get_lang_icon(lang_str: str) -> Image.Image:
             # fallback icon if no match found
             filename = LANGUAGE_ICONS["noLanguage"]
 
-    return Image.open(os.path.join(LANGUAGE_LOGOS_DIR, filename)).resize((32, 32))
+    return _load_lang_icon(filename)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_lang_icon(filename: str) -> Image.Image:
+    # Loaded once per icon, the file handle is closed right away
+    with Image.open(os.path.join(LANGUAGE_LOGOS_DIR, filename)) as img:
+        return img.resize((32, 32))
 
 
 # --- Twemoji access ---
+@functools.lru_cache(maxsize=256)
 def get_twemoji_image(emoji: str, size: int = 32) -> Image.Image:
     """
     Given a Unicode emoji, return a PIL.Image from the local twemoji repo.
     Automatically resizes to `size` x `size`.
+    The image is cached and shared between callers, do not modify it.
     """
     # Convert emoji to codepoints string
     codepoints = "_".join(f"{ord(c):x}" for c in emoji)
@@ -145,7 +155,8 @@ def get_twemoji_image(emoji: str, size: int = 32) -> Image.Image:
         img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
         return img
 
-    img = Image.open(path).convert("RGBA")
+    with Image.open(path) as file_img:
+        img = file_img.convert("RGBA")
     if size != img.width:
         img = img.resize((size, size), Image.Resampling.LANCZOS)
     return img
@@ -0,0 +1,242 @@
+# helper_scripts/basemap.py
+
+# Standard library imports
+import io
+import json
+import math
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+# Third-party imports
+import numpy as np
+import requests
+from PIL import Image
+
+# Own modules
+from helper_scripts.globals import LOCAL_DATA_PATH_DIR
+from helper_scripts.metrics import cache_hit, cache_miss
+
+
+#       |==========================|
+#       |       BASEMAP.PY         |
+#       |==========================|
+#
+# Static map backgrounds without contextily:
+# - XYZ tiles (CartoDB Positron) are cached on disk, capped in size, evicted LRU (by mtime)
+# - the usual DACH extent is stitched once into a pre-baked raster and reused
+# Everything is in Web Mercator (EPSG:3857), markers have to be projected with
+# lonlat_to_mercator() before plotting.
+
+
+TILE_URL = "https://a.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png"
+# Required credit for CARTO / OpenStreetMap tiles (contextily used to draw it)
+TILE_ATTRIBUTION = "© OpenStreetMap contributors © CARTO"
+TILE_USER_AGENT = "hidden_gems_bot_maps"
+TILE_SIZE = 256
+TILE_CACHE_DIR = LOCAL_DATA_PATH_DIR / "tile_cache"
+TILE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+# (west, south, east, north) in degrees, covers Germany, Austria and Switzerland with padding
+PREBAKED_BOUNDS = (3.0, 44.0, 19.0, 57.0)
+PREBAKED_ZOOM = 7
+PREBAKED_IMAGE = LOCAL_DATA_PATH_DIR / f"basemap_dach_z{PREBAKED_ZOOM}.png"
+PREBAKED_META = LOCAL_DATA_PATH_DIR / f"basemap_dach_z{PREBAKED_ZOOM}.json"
+
+# After a failed tile download, only cached tiles are used for this long
+OFFLINE_BACKOFF_SEC = 60
+
+EARTH_RADIUS = 6378137.0
+MISSING_TILE_COLOR = (242, 242, 240)
+
+
+# MARK: projection
+def lonlat_to_mercator(lon, lat):
+    """Vectorised lon/lat (degrees) -> Web Mercator (meters)."""
+    lon = np.asarray(lon, dtype=float)
+    lat = np.clip(np.asarray(lat, dtype=float), -85.0511, 85.0511)
+    x = np.radians(lon) * EARTH_RADIUS
+    y = np.log(np.tan(np.pi / 4 + np.radians(lat) / 2)) * EARTH_RADIUS
+    return x, y
+
+
+def _lonlat_to_tile(lon: float, lat: float, zoom: int) -> Tuple[int, int]:
+    n = 2 ** zoom
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _tile_origin_mercator(x: int, y: int, zoom: int) -> Tuple[float, float]:
+    """Upper-left corner of a tile in Web Mercator."""
+    world = 2 * math.pi * EARTH_RADIUS
+    tile_span = world / 2 ** zoom
+    return -world / 2 + x * tile_span, world / 2 - y * tile_span
+
+
+def choose_zoom(west: float, east: float, target_px: int = 1000) -> int:
+    span = max(east - west, 0.01)
+    zoom = math.ceil(math.log2(target_px * 360.0 / (TILE_SIZE * span)))
+    return min(max(zoom, 1), 12)
+
+
+# MARK: tile cache
+class TileCache:
+    """On-disk XYZ tile cache with a size cap and LRU eviction."""
+
+    def __init__(self, root=TILE_CACHE_DIR, max_bytes: int = TILE_CACHE_MAX_BYTES, url: str = TILE_URL):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.url = url
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = TILE_USER_AGENT
+        self._total_bytes: Optional[int] = None
+        self._offline_until = 0.0
+
+    def _path(self, z: int, x: int, y: int):
+        return self.root / str(z) / str(x) / f"{y}.png"
+
+    def _scan_total(self) -> int:
+        if self._total_bytes is None:
+            self._total_bytes = sum(
+                p.stat().st_size for p in self.root.rglob("*.png")
+            ) if self.root.exists() else 0
+        return self._total_bytes
+
+    def _evict(self):
+        """Delete least recently used tiles until the cache is below its cap."""
+        if self._scan_total() <= self.max_bytes:
+            return
+        tiles = sorted(self.root.rglob("*.png"), key=lambda p: p.stat().st_mtime)
+        for tile in tiles:
+            if self._total_bytes <= self.max_bytes * 0.9:
+                break
+            size = tile.stat().st_size
+            tile.unlink(missing_ok=True)
+            self._total_bytes -= size
+        print(f"[MAPS] Tile cache evicted to {self._total_bytes / 1e6:.1f} MB")
+
+    def get(self, z: int, x: int, y: int) -> Optional[Image.Image]:
+        path = self._path(z, x, y)
+        if path.exists():
+            cache_hit("tiles")
+            os.utime(path)  # mark as recently used
+            with Image.open(path) as img:
+                return img.convert("RGB")
+
+        cache_miss("tiles")
+        if time.monotonic() < self._offline_until:
+            return None
+
+        try:
+            resp = self.session.get(self.url.format(z=z, x=x, y=y), timeout=10)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            print(f"[MAPS] Tile {z}/{x}/{y} not available, using cached tiles only: {e}")
+            self._offline_until = time.monotonic() + OFFLINE_BACKOFF_SEC
+            return None
+
+        with self.lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(resp.content)
+            self._total_bytes = self._scan_total() + len(resp.content)
+            self._evict()
+
+        with Image.open(io.BytesIO(resp.content)) as img:
+            return img.convert("RGB")
+
+
+_tile_cache: Optional[TileCache] = None
+
+
+def get_tile_cache() -> TileCache:
+    global _tile_cache
+    if _tile_cache is None:
+        _tile_cache = TileCache()
+    return _tile_cache
+
+
+# MARK: stitch_basemap()
+def stitch_basemap(west: float, south: float, east: float, north: float, zoom: int):
+    """
+    Stitch all tiles covering the bounds (degrees) into one image.
+    Returns (image as np.ndarray, extent (xmin, xmax, ymin, ymax) in Web Mercator,
+    True if no tile was missing).
+    """
+    cache = get_tile_cache()
+    x0, y0 = _lonlat_to_tile(west, north, zoom)
+    x1, y1 = _lonlat_to_tile(east, south, zoom)
+
+    mosaic = Image.new("RGB", ((x1 - x0 + 1) * TILE_SIZE, (y1 - y0 + 1) * TILE_SIZE), MISSING_TILE_COLOR)
+    fetched = 0
+    total = (x1 - x0 + 1) * (y1 - y0 + 1)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            tile = cache.get(zoom, x, y)
+            if tile is not None:
+                mosaic.paste(tile, ((x - x0) * TILE_SIZE, (y - y0) * TILE_SIZE))
+                fetched += 1
+
+    if fetched == 0:
+        raise RuntimeError("no basemap tiles available (offline and not cached)")
+
+    left, top = _tile_origin_mercator(x0, y0, zoom)
+    right, bottom = _tile_origin_mercator(x1 + 1, y1 + 1, zoom)
+    return np.asarray(mosaic), (left, right, bottom, top), fetched == total
+
+
+def _load_prebaked():
+    if not (PREBAKED_IMAGE.exists() and PREBAKED_META.exists()):
+        return None
+    try:
+        extent = tuple(json.loads(PREBAKED_META.read_text(encoding="utf-8"))["extent"])
+        with Image.open(PREBAKED_IMAGE) as img:
+            return np.asarray(img.convert("RGB")), extent
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+_prebaked = None
+
+
+# MARK: get_basemap()
+def get_basemap(west: float, south: float, east: float, north: float):
+    """
+    Return (image, mercator extent) covering the bounds (degrees).
+    Bounds inside the usual DACH extent use the pre-baked raster (built once
+    from the tile cache); everything else is stitched from cached tiles.
+    """
+    global _prebaked
+    pw, ps, pe, pn = PREBAKED_BOUNDS
+    if west >= pw and south >= ps and east <= pe and north <= pn:
+        if _prebaked is None:
+            _prebaked = _load_prebaked()
+        if _prebaked is None:
+            print("[MAPS] Building pre-baked DACH basemap...")
+            image, extent, complete = stitch_basemap(pw, ps, pe, pn, PREBAKED_ZOOM)
+            if not complete:
+                # Do not persist a raster with holes, retry next time
+                return image, extent
+            PREBAKED_IMAGE.parent.mkdir(parents=True, exist_ok=True)
+            Image.fromarray(image).save(PREBAKED_IMAGE)
+            PREBAKED_META.write_text(json.dumps({"extent": list(extent)}), encoding="utf-8")
+            _prebaked = (image, extent)
+        return _prebaked
+
+    image, extent, _complete = stitch_basemap(west, south, east, north, choose_zoom(west, east))
+    return image, extent
+
+
+# MARK: draw_basemap()
+def draw_basemap(ax, west: float, south: float, east: float, north: float):
+    """Draw the basemap below everything else on a Web Mercator axis, with the tile credit."""
+    image, extent = get_basemap(west, south, east, north)
+    ax.imshow(image, extent=extent, origin="upper", zorder=0, interpolation="bilinear")
+    ax.text(
+        0.995, 0.005, TILE_ATTRIBUTION, transform=ax.transAxes, ha="right", va="bottom",
+        fontsize=8, color="#333333", zorder=3,
+        bbox=dict(facecolor="white", alpha=0.7, edgecolor="none", pad=1.5),
+    )
@@ -0,0 +1,145 @@
+# helper_scripts/city_normalization.py
+
+# Standard library imports
+import csv
+import json
+import re
+from typing import Dict, Optional
+
+# Third-party imports
+import pandas as pd
+
+# Own modules
+from helper_scripts.globals import LOCAL_DATA_PATH_DIR, GEODATA_DIR
+from helper_scripts.gazetteer import get_gazetteer, normalize_place_name
+
+
+#       |==========================|
+#       |  CITY_NORMALIZATION.PY   |
+#       |==========================|
+#
+# "Berlin", "berlin ", "BERLIN" and "Berlin-Steglitz" are the same city.
+# Raw names from the leaderboard are mapped to one canonical name before any
+# geocoding happens:
+#   1. persisted alias index (raw name -> canonical name, local_data/city_alias_index.json)
+#   2. district -> city table (geodata/city_districts.csv)
+#   3. gazetteer names and aliases
+#   4. compound names ("Berlin-Steglitz", "Steglitz, Berlin", "Berlin (Steglitz)")
+# Unknown names are grouped by their normalised form.
+
+
+CITY_ALIAS_INDEX_FILE = LOCAL_DATA_PATH_DIR / "city_alias_index.json"
+CITY_DISTRICTS_FILE = GEODATA_DIR / "city_districts.csv"
+
+_PART_SPLIT = re.compile(r"[,/()\-]+")
+
+
+def load_city_alias_index() -> Dict[str, str]:
+    if CITY_ALIAS_INDEX_FILE.exists():
+        try:
+            return json.loads(CITY_ALIAS_INDEX_FILE.read_text(encoding="utf-8"))
+        except:
+            return {}
+    return {}
+
+
+def save_city_alias_index(index: Dict[str, str]):
+    CITY_ALIAS_INDEX_FILE.write_text(
+        json.dumps(index, indent=2, ensure_ascii=False, sort_keys=True), encoding="utf-8"
+    )
+
+
+def _load_districts() -> Dict[str, str]:
+    districts: Dict[str, str] = {}
+    with open(CITY_DISTRICTS_FILE, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f, delimiter=";"):
+            districts[normalize_place_name(row["district"])] = row["city"]
+    return districts
+
+
+class CityNormalizer:
+    """Maps raw city names to canonical names, remembering every resolved alias."""
+
+    def __init__(self):
+        self.gazetteer = get_gazetteer()
+        self.districts = _load_districts()
+        self.alias_index = load_city_alias_index()
+        self.changed = False
+
+    def _known(self, normalized: str) -> Optional[str]:
+        if normalized in self.districts:
+            return self.districts[normalized]
+        entry = self.gazetteer.index.get(normalized)
+        return entry[0] if entry else None
+
+    def _resolve_compound(self, raw: str) -> Optional[str]:
+        # "Steglitz, Berlin" / "Berlin (Steglitz)" / "Berlin-Steglitz": prefer a part that is a city
+        parts = [normalize_place_name(p) for p in _PART_SPLIT.split(raw)]
+        parts = [p for p in parts if p]
+        if len(parts) > 1:
+            for part in parts:
+                if self.gazetteer.index.get(part):
+                    return self.gazetteer.index[part][0]
+            for part in parts:
+                if part in self.districts:
+                    return self.districts[part]
+
+        # "Berlin Steglitz": longest known prefix
+        tokens = normalize_place_name(raw).split()
+        for k in range(len(tokens) - 1, 0, -1):
+            known = self._known(" ".join(tokens[:k]))
+            if known:
+                return known
+        return None
+
+    def canonical(self, raw: str) -> Optional[str]:
+        """Canonical city name, or None if the name is unknown."""
+        key = raw.strip()
+        if key in self.alias_index:
+            return self.alias_index[key]
+
+        normalized = normalize_place_name(key)
+        if not normalized:
+            return None
+
+        canonical = self._known(normalized) or self._resolve_compound(key)
+        if canonical:
+            self.alias_index[key] = canonical
+            self.changed = True
+        return canonical
+
+    def flush(self):
+        if self.changed:
+            save_city_alias_index(self.alias_index)
+            self.changed = False
+
+
+# MARK: aggregate_city_counts()
+def aggregate_city_counts(cities: pd.Series) -> pd.Series:
+    """
+    Count bots per normalised city. Returns a Series display name -> count,
+    sorted descending. Known cities use their canonical name, unknown ones
+    their most frequent spelling.
+    """
+    cities = cities.dropna().astype(str)
+    cities = cities[cities.str.strip() != ""]
+    if cities.empty:
+        return pd.Series(dtype="int64")
+
+    normalizer = CityNormalizer()
+    uniques = cities.unique()
+    canonical = {raw: normalizer.canonical(raw) for raw in uniques}
+    normalizer.flush()
+
+    frame = pd.DataFrame({"raw": cities.to_numpy()})
+    frame["canonical"] = frame["raw"].map(canonical)
+    frame["key"] = frame["canonical"].fillna(frame["raw"]).map(normalize_place_name)
+
+    grouped = frame.groupby("key", sort=False).agg(
+        count=("raw", "size"),
+        canonical=("canonical", "first"),
+        spelling=("raw", lambda s: s.value_counts().index[0]),
+    )
+    grouped["display"] = grouped["canonical"].fillna(grouped["spelling"].str.strip())
+
+    return grouped.set_index("display")["count"].sort_values(ascending=False)
@@ -0,0 +1,101 @@
+# helper_scripts/cluster_map.py
+
+# Standard library imports
+import html
+import json
+
+# Third-party imports
+# None
+
+# Own modules
+from helper_scripts.geo import COLOR_PALETTE
+
+
+#       |==========================|
+#       |      CLUSTER_MAP.PY      |
+#       |==========================|
+#
+# Lightweight interactive map for "!map cluster".
+# folium writes one block of JavaScript per CircleMarker, so the HTML grows with
+# every city. Here all cities go into ONE compact GeoJSON object; styling,
+# popups and clustering (Leaflet.markercluster) happen in the browser.
+# The file size is dominated by the fixed template, not by the city count.
+
+
+LEAFLET_VERSION = "1.9.4"
+MARKERCLUSTER_VERSION = "1.5.3"
+
+# Coordinates are rounded to 4 decimals (~10 m), plenty for city markers
+COORD_PRECISION = 4
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Hidden Gems Bot-Standorte</title>
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@__LEAFLET__/dist/leaflet.css">
+<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet.markercluster@__CLUSTER__/dist/MarkerCluster.css">
+<style>
+html,body,#map{height:100%;margin:0}
+.hg-cluster{border-radius:50%;color:#fff;font:bold 12px/1 sans-serif;display:flex;align-items:center;justify-content:center;opacity:.85;border:2px solid #fff}
+</style>
+</head>
+<body>
+<div id="map"></div>
+<script src="https://cdn.jsdelivr.net/npm/leaflet@__LEAFLET__/dist/leaflet.js"></script>
+<script src="https://cdn.jsdelivr.net/npm/leaflet.markercluster@__CLUSTER__/dist/leaflet.markercluster.js"></script>
+<script>
+var D=__DATA__,P=__PALETTE__,M=D.max||1;
+function col(n){return P[Math.floor(n/M*(P.length-1))]}
+var map=L.map("map",{preferCanvas:true}),cl=L.markerClusterGroup({
+maxClusterRadius:40,
+iconCreateFunction:function(c){var n=0;c.getAllChildMarkers().forEach(function(m){n+=m.options.n});
+var s=Math.round(26+Math.min(n/M,1)*20);
+return L.divIcon({html:'<div class="hg-cluster" style="width:'+s+'px;height:'+s+'px;background:'+col(Math.min(n,M))+'">'+n+'</div>',className:"",iconSize:[s,s]})}});
+L.tileLayer("https://{s}.basemaps.cartocdn.com/light_all/{z}/{x}/{y}.png",{attribution:"&copy; OpenStreetMap &copy; CARTO",maxZoom:18}).addTo(map);
+var layer=L.geoJSON(D.geo,{pointToLayer:function(f,ll){var n=f.properties.c,c=col(n);
+return L.circleMarker(ll,{n:n,radius:5+n/M*15,color:c,fillColor:c,fillOpacity:.7}).bindPopup(f.properties.n+" ("+n+" bots)")}});
+cl.addLayer(layer).addTo(map);
+map.fitBounds(layer.getBounds().pad(.1));
+</script>
+</body>
+</html>
+"""
+
+
+# MARK: build_city_geojson()
+def build_city_geojson(mapped_coords) -> dict:
+    """mapped_coords -> minimal GeoJSON FeatureCollection (properties n = HTML-escaped city, c = count)."""
+    features = []
+    for c in mapped_coords:
+        lat, lon = c['coords']
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [round(lon, COORD_PRECISION), round(lat, COORD_PRECISION)]},
+            # The popup is HTML in Leaflet and the city comes from the scraped "Ort" column
+            "properties": {"n": html.escape(c['city']), "c": int(c['count'])},
+        })
+    return {"type": "FeatureCollection", "features": features}
+
+
+# MARK: render_cluster_map()
+def render_cluster_map(mapped_coords, map_path):
+    """Write a self-contained clustered HTML map with a single embedded GeoJSON layer."""
+    print("[MAPS] Generating clustered GeoJSON HTML map.")
+    data = {
+        "max": max(int(c['count']) for c in mapped_coords),
+        "geo": build_city_geojson(mapped_coords),
+    }
+    # Compact separators, and "</" escaped so city names cannot close the script tag
+    data_js = json.dumps(data, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+
+    page = (
+        _TEMPLATE
+        .replace("__LEAFLET__", LEAFLET_VERSION)
+        .replace("__CLUSTER__", MARKERCLUSTER_VERSION)
+        .replace("__PALETTE__", json.dumps(COLOR_PALETTE, separators=(",", ":")))
+        .replace("__DATA__", data_js)
+    )
+    map_path.write_text(page, encoding="utf-8")
+    print(f"[MAPS] Clustered HTML map saved to {map_path} ({len(page) / 1024:.1f} KB)")
@@ -2,18 +2,24 @@
 
 import os
 import re
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
 import requests
 import pandas as pd
 import datetime
 import matplotlib
 matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from bs4 import BeautifulSoup
 from pathlib import Path
+from typing import Optional
 
-from helper_scripts.globals import LOCAL_DATA_PATH_DIR
+from helper_scripts.globals import LOCAL_DATA_PATH_DIR, hidden_gems_url
 
-URL = "https://hiddengems.gymnasiumsteglitz.de/scrims"
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
 DATA_ROOT = LOCAL_DATA_PATH_DIR
 
@@ -22,24 +28,89 @@ LANG_MAP = {
     'ts': 'TypeScript', 'ruby': 'Ruby', 'java': 'Java', 'js': 'JavaScript', 'go': 'Go'
 }
 
+# Precompiled patterns for the column parser
+_RANK_NON_DIGITS = re.compile(r'\D')
+_SCORE_JUNK = re.compile(r'[^\d\-]')
+_SCORE_VALID = re.compile(r'-?\d+')
+_FLOAT_NUMBER = re.compile(r'(-?\d+(.\d+)?)')
+_FLOAT_PLAIN = re.compile(r'-?\d+(\.\d+)?\s*')
+_FLOAT_TRANSLATE = str.maketrans({'%': None, ',': '.'})
+_LANG_LOGO = re.compile(r'^([a-z0-9_\-]+)-logo', flags=re.I)
+
+# Raw cell columns collected per row: column name -> td index
+_TEXT_CELLS = {"rank": 0, "bot": 2, "score": 3, "gu_pct": 4, "cf_pct": 5, "fc_pct": 6, "author": 7, "city": 8}
+
+
 def parse_float(text: str):
     if not text: return None
     t = text.strip().replace('%', '').replace(',', '.')
     try:
-        m = re.search(r'(-?\d+(.\d+)?)', t)
+        m = _FLOAT_NUMBER.search(t)
         if m: return float(m.group(1))
     except: pass
     return None
 
-def scrape_data():
+
+def _to_numeric_column(strings: pd.Series, cast) -> pd.Series:
+    """
+    pd.to_numeric() for cells that passed the digit checks. Those use \\d, which also
+    matches non-ASCII digits ("٣") that pandas cannot convert but int()/float() can,
+    so those few cells are converted with cast() like the old row parser did.
+    """
+    def convert(text):
+        try: return cast(text)
+        except ValueError: return float('nan')
+
+    values = pd.to_numeric(strings, errors='coerce')
+    unicode_digits = values.isna() & strings.notna()
+    if unicode_digits.any():
+        values[unicode_digits] = pd.to_numeric(strings[unicode_digits].map(convert))
+    return values
+
+
+def _parse_float_column(raw: pd.Series) -> pd.Series:
+    """Vectorised parse_float() for a whole column of (already stripped) cell strings."""
+    cleaned = raw.str.translate(_FLOAT_TRANSLATE)
+    # Fast path: cells that are exactly one number ("12.5", "12.5 " from "12,5 %") convert directly
+    plain = cleaned.str.fullmatch(_FLOAT_PLAIN)
+    values = _to_numeric_column(cleaned.where(plain), float)
+
+    # Everything else ("ca. 12.5", "n/a") takes the first number like parse_float()
+    rest = cleaned[~plain & (cleaned != '')]
+    if not rest.empty:
+        number = rest.str.extract(_FLOAT_NUMBER, expand=True)[0]
+        values[rest.index] = _to_numeric_column(number, float)
+    return values
+
+
+def _language_by_src(sources) -> dict:
+    """Logo src -> language name for each distinct src."""
+    languages = {}
+    for src in sources:
+        m = _LANG_LOGO.match(os.path.basename(src.split('?')[0]))
+        key = m.group(1).lower() if m else None
+        languages[src] = LANG_MAP.get(key, key.capitalize()) if key else "Unknown"
+    return languages
+
+
+def fetch_scrims_html():
+    """Download the scrims page. Returns the HTML or {"error": ...}."""
     headers = {"User-Agent": USER_AGENT}
     try:
-        resp = requests.get(URL, headers=headers, timeout=20)
+        resp = requests.get(hidden_gems_url("scrims"), headers=headers, timeout=20)
         resp.raise_for_status()
     except Exception as e:
         return {"error": f"Webseite konnte nicht abgerufen werden: {e}"}
-        
-    soup = BeautifulSoup(resp.text, 'html.parser')
+    return resp.text
+
+
+# MARK: parse_scrims_html()
+def collect_scrims_cells(html: str):
+    """
+    Find the leaderboard table and collect the raw cell strings column-wise.
+    Returns (column name -> list of strings, list of language logo src) or {"error": ...}.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
 
     target_table = None
     tables = soup.find_all('table')
@@ -52,58 +123,159 @@ def scrape_data():
     if not target_table:
         return {"error": "Keine Leaderboard-Tabelle auf der Webseite gefunden."}
 
-    rows = []
+    raw = {name: [] for name in _TEXT_CELLS}
+    logo_src = []
     tbody = target_table.find('tbody') or target_table
     for tr in tbody.find_all('tr'):
         if 'spacer' in (tr.get('class') or []): continue
         tds = tr.find_all('td')
-        if len(tds) < 10: continue 
-
-        def txt(i): return tds[i].get_text(strip=True) if i < len(tds) else ""
-
-        rank_raw = txt(0)
-        rank = int(re.sub(r'\D', '', rank_raw)) if re.search(r'\d', rank_raw) else None
-        
-        try: score = int(re.sub(r'[^\d\-]', '', txt(3)))
-        except: score = 0
-        
-        gu_pct = parse_float(txt(4))
-        cf_pct = parse_float(txt(5))
-        fc_pct = parse_float(txt(6))
-        
-        author = txt(7)
-        city = txt(8)
-        
-        lang = "Unknown"
-        if len(tds) > 9:
-            img = tds[9].find('img')
-            if img and img.get('src'):
-                src_base = os.path.basename(img.get('src').split('?')[0])
-                m = re.match(r'([a-z0-9_\-]+)-logo', src_base, flags=re.I)
-                if m:
-                    key = m.group(1).lower()
-                    lang = LANG_MAP.get(key, key.capitalize())
-
-        rows.append({
-            "rank": rank, "bot": txt(2), "score": score,
-            "gu_pct": gu_pct, "cf_pct": cf_pct, "fc_pct": fc_pct,
-            "author": author, "city": city, "language": lang
-        })
-
-    return pd.DataFrame(rows)
+        if len(tds) < 10: continue
 
-def generate_plots_images(df, folder):
-    folder.mkdir(parents=True, exist_ok=True)
-    
-    metrics_to_plot = [
-        ("Score Distribution", 'score', '#f59e0b', 'Higher', 'score_hist.png'),
-        ("Gem Utilization (GU)", 'gu_pct', '#3b82f6', 'Higher', 'gu_pct_hist.png'),
-        ("Chaos Factor (CF)", 'cf_pct', '#ef4444', 'Lower', 'cf_pct_hist.png'),
-        ("Floor Coverage (FC)", 'fc_pct', '#10b981', 'Higher', 'fc_pct_hist.png'),
-    ]
-
-    for name, col, color, better, file_name in metrics_to_plot:
-        fig, ax = plt.subplots(figsize=(6, 4))
+        for name, i in _TEXT_CELLS.items():
+            raw[name].append(tds[i].get_text(strip=True))
+        img = tds[9].find('img')
+        logo_src.append((img.get('src') or "") if img else "")
+
+    return raw, logo_src
+
+
+def convert_scrims_columns(raw, logo_src) -> pd.DataFrame:
+    """Turn the raw cell columns into the typed DataFrame, column-wise."""
+    if not logo_src:
+        return pd.DataFrame()
+
+    cols = {name: pd.Series(values, dtype=object) for name, values in raw.items()}
+
+    # Rank: all digits of the cell, None for DNQ rows
+    rank_digits = cols["rank"].str.replace(_RANK_NON_DIGITS, '', regex=True)
+    rank = _to_numeric_column(rank_digits.where(rank_digits != ''), int)
+    if not rank.isna().any():
+        rank = rank.astype('int64')
+
+    # Score: digits and minus signs, 0 if that is not a valid integer
+    score_clean = cols["score"].str.replace(_SCORE_JUNK, '', regex=True)
+    score_valid = score_clean.str.fullmatch(_SCORE_VALID)
+    score = _to_numeric_column(score_clean.where(score_valid, '0'), int).astype('int64')
+
+    # Language from ".../<lang>-logo-256.png?v=..."
+    # (only a handful of distinct logos, so they are resolved once each)
+    src = pd.Series(logo_src, dtype=object)
+    language = src.map(_language_by_src(src.unique()))
+
+    # Plain lists for the text columns, so pandas infers the same dtypes as before
+    return pd.DataFrame({
+        "rank": rank, "bot": raw["bot"], "score": score,
+        "gu_pct": _parse_float_column(cols["gu_pct"]),
+        "cf_pct": _parse_float_column(cols["cf_pct"]),
+        "fc_pct": _parse_float_column(cols["fc_pct"]),
+        "author": raw["author"], "city": raw["city"], "language": language.tolist(),
+    })
+
+
+def parse_scrims_html(html: str):
+    """Parse the scrims leaderboard into a DataFrame (or {"error": ...})."""
+    cells = collect_scrims_cells(html)
+    if isinstance(cells, dict):
+        return cells
+    return convert_scrims_columns(*cells)
+
+
+def scrape_data():
+    html = fetch_scrims_html()
+    if isinstance(html, dict):
+        return html
+    return parse_scrims_html(html)
+
+# MARK: analysis data cache
+# One cache for the scraped DataFrame, shared by !map and !stats. Stored as a
+# pickle so dtypes survive and loading is much faster than parsing a CSV.
+ANALYSIS_DATA_FILE = DATA_ROOT / "analysis_data.pkl"
+ANALYSIS_DATA_MAX_AGE_SEC = 3600
+
+_analysis_lock = threading.Lock()
+_analysis_memo = {"mtime": None, "df": None}
+
+
+def load_cached_analysis_data(max_age: int = ANALYSIS_DATA_MAX_AGE_SEC) -> Optional[pd.DataFrame]:
+    """Cached DataFrame if it is younger than max_age seconds, else None."""
+    try:
+        mtime = ANALYSIS_DATA_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    if time.time() - mtime >= max_age:
+        return None
+
+    # Unpickle only when the file changed since the last load
+    if _analysis_memo["mtime"] != mtime:
+        try:
+            df = pd.read_pickle(ANALYSIS_DATA_FILE)
+        except Exception as e:
+            print(f"[DATA] Analysis cache unreadable, scraping again: {e}")
+            return None
+        _analysis_memo.update(mtime=mtime, df=df)
+    return _analysis_memo["df"]
+
+
+def refresh_analysis_data(max_age: int = ANALYSIS_DATA_MAX_AGE_SEC):
+    """
+    Scrape and store the analysis data. Returns the DataFrame or {"error": ...}.
+    Concurrent callers wait for the running scrape instead of starting their own.
+    """
+    with _analysis_lock:
+        df = load_cached_analysis_data(max_age)
+        if df is not None:
+            return df
+
+        print("[DATA] Scraping analysis data...")
+        df = scrape_data()
+        if isinstance(df, dict):
+            return df
+
+        ANALYSIS_DATA_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = ANALYSIS_DATA_FILE.with_suffix(".tmp")
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, ANALYSIS_DATA_FILE)
+        _analysis_memo.update(mtime=ANALYSIS_DATA_FILE.stat().st_mtime, df=df)
+        print(f"[DATA] Analysis data cached ({len(df)} rows).")
+        return df
+
+
+def get_analysis_data(max_age: int = ANALYSIS_DATA_MAX_AGE_SEC):
+    """Cached analysis data, scraped again when older than max_age."""
+    df = load_cached_analysis_data(max_age)
+    return df if df is not None else refresh_analysis_data(max_age)
+
+# MARK: plots
+# Plots are drawn with the object-oriented Figure API (no pyplot state), so
+# they can be rendered one at a time and from any thread.
+PLOT_CACHE_DIR = DATA_ROOT / "plot_cache"
+PLOT_CACHE_KEEP = 5  # number of data hashes whose plots are kept on disk
+PLOT_CACHE_MIN_AGE = 10 * 60  # seconds; younger folders may still be rendered into
+
+HIST_PLOTS = {
+    "score": ("Score Distribution", 'score', '#f59e0b', 'score_hist.png'),
+    "gu": ("Gem Utilization (GU)", 'gu_pct', '#3b82f6', 'gu_pct_hist.png'),
+    "cf": ("Chaos Factor (CF)", 'cf_pct', '#ef4444', 'cf_pct_hist.png'),
+    "fc": ("Floor Coverage (FC)", 'fc_pct', '#10b981', 'fc_pct_hist.png'),
+}
+
+# plot name -> file name
+PLOT_FILES = {name: spec[3] for name, spec in HIST_PLOTS.items()}
+PLOT_FILES.update({"lang": "lang_bar.png", "city": "city_bar.png"})
+
+
+def _new_figure():
+    fig = Figure(figsize=(6, 4))
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def render_plot(df, plot_name: str) -> Figure:
+    """Draw a single stats plot and return the figure."""
+    fig, ax = _new_figure()
+
+    if plot_name in HIST_PLOTS:
+        name, col, color, _file_name = HIST_PLOTS[plot_name]
         if col in df.columns:
             data = pd.to_numeric(df[col], errors='coerce').dropna()
             if not data.empty:
@@ -113,26 +285,107 @@ def generate_plots_images(df, folder):
             else:
                 ax.text(0.5, 0.5, "No data", transform=ax.transAxes)
         ax.set_title(f"{name}")
-        fig.tight_layout()
-        fig.savefig(folder / file_name)
-        plt.close(fig)
-        
-    # Language bar chart
-    fig, ax = plt.subplots(figsize=(6, 4))
-    if 'language' in df.columns:
-        df['language'].value_counts().plot(kind='bar', ax=ax, color="#3b82f6")
-        ax.set_title("Bots per Language")
-    fig.tight_layout()
-    fig.savefig(folder / "lang_bar.png")
-    plt.close(fig)
-
-    # City bar chart
-    fig, ax = plt.subplots(figsize=(6, 4))
-    if 'city' in df.columns:
-        df['city'].value_counts().head(15).plot(kind='bar', ax=ax, color="#10b981")
-        ax.set_title("Top 15 Cities")
+
+    elif plot_name == "lang":
+        if 'language' in df.columns:
+            df['language'].value_counts().plot(kind='bar', ax=ax, color="#3b82f6")
+            ax.set_title("Bots per Language")
+
+    elif plot_name == "city":
+        if 'city' in df.columns:
+            df['city'].value_counts().head(15).plot(kind='bar', ax=ax, color="#10b981")
+            ax.set_title("Top 15 Cities")
+
+    else:
+        raise ValueError(f"Unknown plot: {plot_name}")
+
     fig.tight_layout()
-    fig.savefig(folder / "city_bar.png")
-    plt.close(fig)
-    
-    return folder
\ No newline at end of file
+    return fig
+
+
+def _atomic_write(path: Path, write):
+    """
+    write(file) into a unique temp file next to path, then rename it over path.
+    A half written PNG must never be served from the cache, and the background
+    warm-up and a !stats call may write the same plot at the same time.
+    """
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.stem + ".", suffix=".tmp", delete=False) as tmp:
+        try:
+            write(tmp)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, path)
+
+
+def save_plot(df, plot_name: str, path: Path) -> Path:
+    fig = render_plot(df, plot_name)
+    _atomic_write(path, lambda f: fig.savefig(f, format="png"))
+    return path
+
+
+# MARK: data_hash()
+def data_hash(df) -> str:
+    """Content hash of the scraped data, used as the plot cache key."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha256(row_hashes.tobytes())
+    digest.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _prune_plot_cache(keep_dir: Path):
+    dirs = sorted(
+        (d for d in PLOT_CACHE_DIR.iterdir() if d.is_dir() and d != keep_dir),
+        key=lambda d: d.stat().st_mtime,
+        reverse=True,
+    )
+    # Folders touched recently may belong to another writer that is still rendering
+    cutoff = time.time() - PLOT_CACHE_MIN_AGE
+    for old in dirs[PLOT_CACHE_KEEP - 1:]:
+        try:
+            if old.stat().st_mtime > cutoff: continue
+        except FileNotFoundError: continue
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def _use_plot_folder(folder: Path):
+    """Create or touch folder before rendering into it, so pruning leaves it alone."""
+    new_dir = not folder.exists()
+    folder.mkdir(parents=True, exist_ok=True)
+    os.utime(folder)
+    if new_dir:
+        _prune_plot_cache(folder)
+
+
+# MARK: get_plot_path()
+def get_plot_path(df, plot_name: str, key: Optional[str] = None) -> Path:
+    """
+    Return the PNG of one plot for this data, rendering only that plot if it
+    is not cached yet. Cached under plot_cache/<data hash>/, so a changed
+    leaderboard gets new plots while unchanged data is never drawn twice.
+    """
+    key = key or data_hash(df)
+    folder = PLOT_CACHE_DIR / key
+    path = folder / PLOT_FILES[plot_name]
+    if path.exists():
+        return path
+
+    _use_plot_folder(folder)
+    print(f"[STATS] Rendering {plot_name} plot for data {key}.")
+    return save_plot(df, plot_name, path)
+
+
+def render_missing_plots(df, key: Optional[str] = None):
+    """Render every plot not cached yet (meant for background warm-up)."""
+    key = key or data_hash(df)
+    for plot_name in PLOT_FILES:
+        get_plot_path(df, plot_name, key)
+
+
+def generate_plots_images(df, folder):
+    """Render all plots into folder."""
+    folder.mkdir(parents=True, exist_ok=True)
+    for plot_name, file_name in PLOT_FILES.items():
+        save_plot(df, plot_name, folder / file_name)
+    return folder
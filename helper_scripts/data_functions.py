@@ -2,7 +2,7 @@
 
 # Standard library imports
 import json
-from typing import List, Dict
+from typing import List, Dict, Optional, Set, Tuple, Iterable
 
 # Third-party imports
 # None
@@ -43,7 +43,9 @@ def get_guild_data(guild_id: int) -> dict:
             "tracked_bots": [], 
             "scheduled_channels": [],
             # NEW: Field for voting tracking
-            "tracked_voting_bots": [] 
+            "tracked_voting_bots": [],
+            # Channels receiving rank-change alerts for tracked bots
+            "alert_channels": []
         }
         save_bot_data(data)
 
@@ -76,9 +78,70 @@ def set_tracked_bots(guild_id: int, tracked: list[dict], mode: str = "leaderboar
     # This also ensures the guild data dictionary is present in 'data' before assignment
     guilds[guild_id_str] = get_guild_data(guild_id)
 
+    previous = guilds[guild_id_str].get(_get_tracking_key(mode), [])
     guilds[guild_id_str][_get_tracking_key(mode)] = tracked
     save_bot_data(data)
 
+    _update_tracking_index(guild_id_str, previous, tracked, mode)
+
+
+# MARK: Tracking Index
+# Inverted index: tracking key -> (bot name, author) -> guild ids tracking that bot.
+# Built lazily from bot_data.json and kept in sync by set_tracked_bots().
+_tracking_index: Optional[Dict[str, Dict[Tuple[str, str], Set[str]]]] = None
+
+
+def _bot_key(bot_info: dict) -> Tuple[str, str]:
+    return (bot_info.get("name", ""), bot_info.get("author", ""))
+
+
+def _build_tracking_index(data: dict) -> Dict[str, Dict[Tuple[str, str], Set[str]]]:
+    index: Dict[str, Dict[Tuple[str, str], Set[str]]] = {}
+    for guild_id_str, guild_data in data.get("guild_data", {}).items():
+        for tracking_key in ("tracked_bots", "tracked_voting_bots"):
+            mode_index = index.setdefault(tracking_key, {})
+            for bot_info in guild_data.get(tracking_key, []):
+                mode_index.setdefault(_bot_key(bot_info), set()).add(guild_id_str)
+    return index
+
+
+def get_tracking_index(mode: str = "leaderboard") -> Dict[Tuple[str, str], Set[str]]:
+    """Return the (bot name, author) -> guild ids index for a tracking mode."""
+    global _tracking_index
+    if _tracking_index is None:
+        _tracking_index = _build_tracking_index(load_bot_data())
+    return _tracking_index.setdefault(_get_tracking_key(mode), {})
+
+
+def _update_tracking_index(guild_id_str: str, previous: list[dict], tracked: list[dict], mode: str):
+    """Apply the difference between the old and new tracked list of one guild to the index."""
+    index = get_tracking_index(mode)
+    old_keys = {_bot_key(b) for b in previous}
+    new_keys = {_bot_key(b) for b in tracked}
+
+    for key in old_keys - new_keys:
+        guild_ids = index.get(key)
+        if guild_ids is not None:
+            guild_ids.discard(guild_id_str)
+            if not guild_ids:
+                del index[key]
+
+    for key in new_keys - old_keys:
+        index.setdefault(key, set()).add(guild_id_str)
+
+
+def get_guilds_tracking(
+    bot_keys: Iterable[Tuple[str, str]], mode: str = "leaderboard"
+) -> Dict[str, List[Tuple[str, str]]]:
+    """Group the given (bot name, author) keys by the guilds tracking them.
+    Cost is proportional to the number of keys, not to guilds x tracked bots."""
+    index = get_tracking_index(mode)
+    by_guild: Dict[str, List[Tuple[str, str]]] = {}
+    for key in bot_keys:
+        for guild_id_str in index.get(key, ()):
+            by_guild.setdefault(guild_id_str, []).append(key)
+    return by_guild
+
 
 
 # MARK: Poll Data Management
@@ -96,8 +159,31 @@ def load_polls() -> dict:
     except json.JSONDecodeError:
         return {}
 
+def get_polls_mtime() -> Optional[int]:
+    """Modification time (ns) of the polls file, None if it does not exist."""
+    try:
+        return get_polls_path().stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
 def save_polls(data: dict):
     """Saves active polls to JSON."""
     path = get_polls_path()
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+# MARK: Alert Channels
+def get_alert_channels(guild_id: int) -> list[int]:
+    """Return the channel IDs of a guild that receive rank-change alerts."""
+    return get_guild_data(guild_id).get("alert_channels", [])
+
+def set_alert_channels(guild_id: int, channel_ids: list[int]):
+    """Write the alert channel IDs of a guild back into bot_data.json."""
+    data = load_bot_data()
+    guilds = data.setdefault("guild_data", {})
+
+    guild_id_str = str(guild_id)
+    guilds[guild_id_str] = get_guild_data(guild_id)
+    guilds[guild_id_str]["alert_channels"] = channel_ids
+    save_bot_data(data)
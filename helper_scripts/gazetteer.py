@@ -0,0 +1,71 @@
+# helper_scripts/gazetteer.py
+
+# Standard library imports
+import csv
+import re
+import unicodedata
+from typing import Dict, Optional, Tuple
+
+# Third-party imports
+# None
+
+# Own modules
+from helper_scripts.globals import GEODATA_DIR
+
+
+#       |==========================|
+#       |       GAZETTEER.PY       |
+#       |==========================|
+#
+# Offline lookup of German / DACH place names (geodata/dach_places.csv).
+# Names and aliases are normalised once into a dict, so a lookup is a single
+# hash access. Nominatim is only needed for places that are not listed here.
+
+
+GAZETTEER_FILE = GEODATA_DIR / "dach_places.csv"
+
+_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue"})
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+# MARK: normalize_place_name()
+def normalize_place_name(name: str) -> str:
+    """'  Köln ' / 'KOELN' / 'koeln!' -> 'koeln'"""
+    text = name.casefold().translate(_UMLAUTS)  # casefold also turns ß into ss
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", text).strip()
+
+
+class Gazetteer:
+    """Normalised place name -> (canonical name, [lat, lon])."""
+
+    def __init__(self, path=GAZETTEER_FILE):
+        self.index: Dict[str, Tuple[str, list]] = {}
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f, delimiter=";"):
+                coords = [float(row["lat"]), float(row["lon"])]
+                names = [row["name"]] + [a for a in (row.get("aliases") or "").split("|") if a]
+                for name in names:
+                    # First entry wins, the file is ordered by size
+                    self.index.setdefault(normalize_place_name(name), (row["name"], coords))
+
+    def lookup(self, name: str) -> Optional[list]:
+        entry = self.index.get(normalize_place_name(name))
+        return entry[1] if entry else None
+
+    def canonical_name(self, name: str) -> Optional[str]:
+        entry = self.index.get(normalize_place_name(name))
+        return entry[0] if entry else None
+
+
+_gazetteer: Optional[Gazetteer] = None
+
+
+# MARK: get_gazetteer()
+def get_gazetteer() -> Gazetteer:
+    """Load the bundled gazetteer on first use."""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
@@ -2,16 +2,25 @@
 
 import json
 import time
-import folium
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
 from pathlib import Path
 from geopy.geocoders import Nominatim
-# Removed RateLimiter as we are manually doing time.sleep(1)
 
 from helper_scripts.globals import LOCAL_DATA_PATH_DIR
+from helper_scripts.gazetteer import get_gazetteer
+from helper_scripts.city_normalization import aggregate_city_counts
+from helper_scripts.metrics import cache_hit, cache_miss
 
 # File path for cache
 GEO_CACHE_FILE = LOCAL_DATA_PATH_DIR / "geo_cache.json"
+GEO_NEGATIVE_CACHE_FILE = LOCAL_DATA_PATH_DIR / "geo_negative_cache.json"
+
+# OpenStreetMap Nominatim usage policy: max. 1 request per second
+NOMINATIM_RATE_PER_SEC = 1.0
+# Cities that were not found are not retried for a week
+NEGATIVE_CACHE_TTL_SEC = 7 * 24 * 3600
 
 COLOR_PALETTE = [
     '#e60049', '#0bb4ff', '#50e991', '#e6d800', '#9b19f5', 
@@ -29,75 +38,196 @@ def load_geo_cache():
 def save_geo_cache(cache):
     GEO_CACHE_FILE.write_text(json.dumps(cache, indent=2), encoding='utf-8')
 
-def get_coordinates(city_name, cache):
+def load_negative_geo_cache():
+    """City -> unix timestamp of the last 'not found' answer."""
+    if GEO_NEGATIVE_CACHE_FILE.exists():
+        try:
+            return json.loads(GEO_NEGATIVE_CACHE_FILE.read_text(encoding='utf-8'))
+        except:
+            return {}
+    return {}
+
+def save_negative_geo_cache(cache):
+    GEO_NEGATIVE_CACHE_FILE.write_text(json.dumps(cache, indent=2), encoding='utf-8')
+
+
+class TokenBucket:
     """
-    Robust geocoding from Flet script, including print feedback.
+    Thread-safe token bucket. acquire() blocks until a token is available,
+    so all workers together never exceed `rate` requests per second.
     """
-    clean_city = city_name.strip()
-    if not clean_city:
-        return None
 
-    if clean_city in cache:
-        print(f"[GEO] Cached: {clean_city}")
-        return cache[clean_city]
-
-    try:
-        # Flet script logic: User Agent + Rate limiting via sleep
-        geolocator = Nominatim(user_agent="hidden_gems_bot_geo")
-        
-        print(f"[GEO] Searching: {clean_city}...")
-        
-        # Try appending Germany first
-        location = geolocator.geocode(f"{clean_city}, Germany")
-        
+    def __init__(self, rate: float, capacity: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            self.sleep(wait)
+
+
+# One Nominatim client and one rate limiter for the whole process: every !map call
+# builds its own pipeline, the 1 req/s policy applies to all of them together.
+_shared_lock = threading.Lock()
+_shared_limiter = None
+_shared_geocoder = None
+
+
+def get_shared_limiter() -> TokenBucket:
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = TokenBucket(NOMINATIM_RATE_PER_SEC)
+        return _shared_limiter
+
+
+def get_shared_geocoder():
+    global _shared_geocoder
+    with _shared_lock:
+        if _shared_geocoder is None:
+            _shared_geocoder = Nominatim(user_agent="hidden_gems_bot_geo", timeout=10)
+        return _shared_geocoder
+
+
+class GeocodingPipeline:
+    """
+    Resolves many city names with one shared geocoder client.
+    - offline gazetteer first, Nominatim only as fallback for misses
+    - positive cache (geo_cache.json) and negative cache with TTL (geo_negative_cache.json)
+    - lookups run in a small thread pool, throttled by the process-wide token bucket
+    - both caches are written once, at the end of resolve()
+
+    `geocoder` can be any object with a geopy-like geocode(query) method,
+    e.g. a local fake for testing. Without one, the shared Nominatim client is used.
+    """
+
+    def __init__(self, geocoder=None, limiter: TokenBucket = None, workers: int = 2,
+                 negative_ttl: float = NEGATIVE_CACHE_TTL_SEC):
+        self.geocoder = geocoder or get_shared_geocoder()
+        self.limiter = limiter or get_shared_limiter()
+        self.workers = workers
+        self.negative_ttl = negative_ttl
+        self.gazetteer = get_gazetteer()
+        self.cache = load_geo_cache()
+        self.negative_cache = load_negative_geo_cache()
+
+    def _geocode(self, query: str):
+        self.limiter.acquire()
+        return self.geocoder.geocode(query)
+
+    def _lookup(self, city: str):
+        """Returns coords, None for 'not found', or raises on network/service errors."""
+        print(f"[GEO] Searching: {city}...")
+
+        # Try appending Germany first, fallback to raw city name
+        location = self._geocode(f"{city}, Germany")
         if not location:
-            # Fallback to raw city name
-            location = geolocator.geocode(clean_city)
+            location = self._geocode(city)
 
         if location:
-            coords = [location.latitude, location.longitude]
-            cache[clean_city] = coords
-            save_geo_cache(cache)
-            time.sleep(1)  # Respect OpenStreetMap API limits
-            print(f"[GEO] SUCCESS: {clean_city} -> {coords[0]:.2f}, {coords[1]:.2f}")
-            return coords
-        else:
-            print(f"[GEO] FAIL: {clean_city} (Location not found)")
-
-    except Exception as e:
-        print(f"[GEO] Geocoding error for {clean_city}: {e}")
-
-    return None
+            return [location.latitude, location.longitude]
+        return None
 
-def get_city_coords_with_progress(df: pd.DataFrame):
+    def _is_negative(self, city: str, now: float) -> bool:
+        failed_at = self.negative_cache.get(city)
+        return failed_at is not None and now - failed_at < self.negative_ttl
+
+    def resolve(self, cities: list[str]) -> dict[str, list[float]]:
+        """Geocode all cities, returns city -> [lat, lon] for every city that could be resolved."""
+        now = time.time()
+        results = {}
+        misses = []
+        offline_hits = 0
+
+        for city in cities:
+            clean_city = city.strip()
+            if not clean_city:
+                continue
+            coords = self.gazetteer.lookup(clean_city)
+            if coords:
+                results[city] = coords
+                offline_hits += 1
+            elif clean_city in self.cache:
+                results[city] = self.cache[clean_city]
+            elif not self._is_negative(clean_city, now):
+                misses.append((city, clean_city))
+
+        # Gazetteer and geo_cache.json count as hits
+        cache_hit("geo", len(results))
+        cache_miss("geo", len(misses))
+        if not misses:
+            return results
+
+        print(
+            f"[GEO] {offline_hits} offline, {len(results) - offline_hits} cached, "
+            f"{len(misses)} to geocode ({self.workers} workers, {self.limiter.rate} req/s)"
+        )
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(self._lookup, clean_city): (city, clean_city) for city, clean_city in misses}
+            for done, future in enumerate(as_completed(futures), start=1):
+                city, clean_city = futures[future]
+                if done % 5 == 0 or done == len(misses):
+                    print(f"[MAPS] Progress: {done}/{len(misses)} new cities processed...")
+
+                try:
+                    coords = future.result()
+                except Exception as e:
+                    # Service/network errors are not cached, retry next time
+                    print(f"[GEO] Geocoding error for {clean_city}: {e}")
+                    continue
+
+                if coords:
+                    self.cache[clean_city] = coords
+                    self.negative_cache.pop(clean_city, None)
+                    results[city] = coords
+                    print(f"[GEO] SUCCESS: {clean_city} -> {coords[0]:.2f}, {coords[1]:.2f}")
+                else:
+                    self.negative_cache[clean_city] = time.time()
+                    print(f"[GEO] FAIL: {clean_city} (Location not found)")
+
+        self.flush()
+        return results
+
+    def flush(self):
+        save_geo_cache(self.cache)
+        save_negative_geo_cache(self.negative_cache)
+
+
+def get_city_coords_with_progress(df: pd.DataFrame, geocoder=None):
     """
     Geocodes all unique cities in the DataFrame and prints progress to the console.
+    City names are normalised first ("berlin ", "Berlin-Steglitz" -> "Berlin"),
+    so every city is counted and geocoded once.
     Returns a list of dictionaries with city, coords, and count.
     """
-    geo_cache = load_geo_cache()
-    city_counts = df['city'].dropna().value_counts()
+    city_counts = aggregate_city_counts(df['city'])
     cities_to_map = city_counts.index.tolist()
-    max_count = city_counts.max()
-    mapped_coords = []
     total_cities = len(cities_to_map)
 
-    print(f"\n[MAPS] Starting geocoding for {total_cities} unique cities. (1 sec delay per new city)")
+    print(f"\n[MAPS] Starting geocoding for {total_cities} unique cities.")
     
     start_time = time.time()
-    
-    for i, city in enumerate(cities_to_map):
-        # Progress every 5 cities
-        if (i + 1) % 5 == 0 or i == 0 or i == total_cities - 1:
-            print(f"[MAPS] Progress: {i + 1}/{total_cities} cities processed...")
-            
-        coords = get_coordinates(city, geo_cache)
-        
-        if coords:
-            mapped_coords.append({
-                'city': city,
-                'coords': coords,
-                'count': city_counts[city]
-            })
+
+    coords_by_city = GeocodingPipeline(geocoder=geocoder).resolve(cities_to_map)
+    mapped_coords = [
+        {'city': city, 'coords': coords_by_city[city], 'count': city_counts[city]}
+        for city in cities_to_map
+        if city in coords_by_city
+    ]
 
     end_time = time.time()
     print(f"[MAPS] Geocoding finished. Mapped {len(mapped_coords)} cities in {end_time - start_time:.1f} seconds.")
@@ -1,6 +1,7 @@
 # helper_scripts/globals.py
 
 # Standard library imports
+import os
 from pathlib import Path
 
 # Third-party imports
@@ -11,8 +12,20 @@ from pathlib import Path
 
 
 BASE_DIR = Path(__file__).parent.parent
-LOCAL_DATA_PATH_DIR = BASE_DIR / "local_data"
+# HG_LOCAL_DATA_DIR points all runtime data somewhere else (benchmarks, test harnesses)
+LOCAL_DATA_PATH_DIR = Path(os.getenv("HG_LOCAL_DATA_DIR") or BASE_DIR / "local_data")
 IMAGES_DIR = BASE_DIR / "images"
 LANGUAGE_LOGOS_DIR = IMAGES_DIR / "languages"
+GEODATA_DIR = BASE_DIR / "geodata"
 
 DOTENV_PATH = Path("..") / "environment_variables.env"
+
+# Upstream Hidden Gems site. HIDDEN_GEMS_BASE_URL (environment / .env) replaces the host,
+# e.g. with development/standin_server.py for offline tests.
+DEFAULT_HIDDEN_GEMS_BASE_URL = "https://hiddengems.gymnasiumsteglitz.de"
+
+
+def hidden_gems_url(page: str) -> str:
+    """URL of a page of the Hidden Gems site, e.g. hidden_gems_url("scrims")."""
+    base = os.getenv("HIDDEN_GEMS_BASE_URL") or DEFAULT_HIDDEN_GEMS_BASE_URL
+    return f"{base.rstrip('/')}/{page}"
@@ -17,7 +17,11 @@ import requests
 # Own modules
 from helper_scripts.asset_access import language_logos, get_lang_icon, get_twemoji_image
 from helper_scripts.data_functions import load_bot_data
-from helper_scripts.globals import BASE_DIR, LOCAL_DATA_PATH_DIR
+from helper_scripts.snapshots import record_snapshot, load_snapshot_diff, diff_is_empty, diff_recorded_at
+from helper_scripts.history import archive_snapshot
+from helper_scripts.sparklines import get_sparkline_series, draw_sparkline
+from helper_scripts.globals import BASE_DIR, LOCAL_DATA_PATH_DIR, hidden_gems_url
+from helper_scripts.metrics import span, timed, count
 
 FONTS_DIR = BASE_DIR / "fonts"
 GENERATED_TABLES_DIR = LOCAL_DATA_PATH_DIR / "generated_tables"
@@ -25,29 +29,38 @@ TEXT_FONT_PATH = FONTS_DIR / "DejaVuSans.ttf"
 HTML_FILE_PATH = LOCAL_DATA_PATH_DIR / "leaderboard.html"
 JSON_FILE_PATH = LOCAL_DATA_PATH_DIR / "leaderboard.json"
 
-# URL for the voting leaderboard (Adjust if necessary)
-VOTING_URL = "https://hiddengems.gymnasiumsteglitz.de/voting" 
+# Number of days shown in the sparkline column of the tracked bots table
+SPARKLINE_DAYS = 14
+
+# Older movers are not shown under !lb anymore, they would look like fresh changes
+MOVERS_MAX_AGE = datetime.timedelta(hours=24)
 
 os.makedirs(GENERATED_TABLES_DIR, exist_ok=True)
 
 
 # MARK: generate_images_from_json()
 def generate_images_from_json(
-    leaderboard_json: list[dict], top_x: int | None = None
+    leaderboard_json: list[dict],
+    top_x: int | None = None,
+    sparklines: dict[tuple[str, str], Any] | None = None,
 ) -> list[str]:
-    """Generate one or more PNG images from the leaderboard JSON."""
+    """Generate one or more PNG images from the leaderboard JSON.
+    If `sparklines` maps (Bot, Autor / Team) to a rank series, an extra trend column is drawn."""
 
     # ----- COLORS -----
     BACKGROUND_COLOR = (21, 21, 20)
     HEADER_COLOR = (255, 200, 0)
     NORMAL_TEXT_COLOR = (231, 230, 225)
     DNQ_TEXT_COLOR = (108, 107, 105)
+    SPARKLINE_COLOR = (255, 200, 0)
+    SPARKLINE_DOT_COLOR = (231, 230, 225)
 
     # ----- LAYOUT -----
     PADDING = 5
     LINE_HEIGHT = 36
     MAX_ROWS_PER_IMAGE = 20
     TEXT_FONT = ImageFont.truetype(TEXT_FONT_PATH, 18)
+    SPARKLINE_WIDTH = 120
 
     # slice top_x rows if provided
     rows = leaderboard_json[:top_x] if top_x else leaderboard_json
@@ -62,7 +75,7 @@ def generate_images_from_json(
         end_idx = min(start_idx + rows_per_image, total_rows)
         chunk = rows[start_idx:end_idx]
 
-        img_width = 1140
+        img_width = 1140 + (SPARKLINE_WIDTH if sparklines is not None else 0)
         img_height = PADDING * 2 + (len(chunk) + 1) * LINE_HEIGHT
         img = Image.new("RGB", (img_width, img_height), color=BACKGROUND_COLOR)
         draw = ImageDraw.Draw(img)
@@ -92,6 +105,11 @@ def generate_images_from_json(
                     (col_x[col_idx], PADDING), head, fill=HEADER_COLOR, font=TEXT_FONT
                 )
 
+        # optional sparkline column right of the language icon
+        spark_x = col_x[-1] + col_widths[-1]
+        if sparklines is not None:
+            draw.text((spark_x, PADDING), "Verlauf", fill=HEADER_COLOR, font=TEXT_FONT)
+
         # ----- ROWS -----
         y = PADDING + LINE_HEIGHT
         for row_idx, entry in enumerate(chunk, start=start_idx + 1):
@@ -147,10 +165,23 @@ def generate_images_from_json(
             lang_img = get_lang_icon(sprache)
             img.paste(lang_img, (col_x[-1], y - 8), lang_img.convert("RGBA"))
 
+            # rank sparkline
+            if sparklines is not None:
+                ranks = sparklines.get((bot, author))
+                if ranks is not None:
+                    draw_sparkline(
+                        draw,
+                        (spark_x, y + 2, spark_x + SPARKLINE_WIDTH - 15, y + LINE_HEIGHT - 14),
+                        ranks,
+                        SPARKLINE_COLOR,
+                        SPARKLINE_DOT_COLOR,
+                    )
+
             y += LINE_HEIGHT
 
         file_path = os.path.join(GENERATED_TABLES_DIR, f"leaderboard_part_{i + 1}.png")
-        img.save(file_path)
+        with span("table.png_encode"):
+            img.save(file_path)
         images.append(file_path)
 
     return images
@@ -168,11 +199,12 @@ def fit_text_to_column(draw, text, font, max_width):
 
 # MARK: send_table_images()
 async def send_table_images(
-    channel, status_msg, leaderboard_json, top_x, title: str | None = None
+    channel, status_msg, leaderboard_json, top_x, title: str | None = None, sparklines=None
 ):
     await status_msg.edit(content="📊 Generating leaderboard images...")
 
-    image_paths = generate_images_from_json(leaderboard_json, top_x)
+    with span("table.render"):  # includes table.png_encode
+        image_paths = generate_images_from_json(leaderboard_json, top_x, sparklines)
 
     # Build header message
     header = title or "**Aktuelles Leaderboard**"
@@ -198,11 +230,13 @@ async def send_table_images(
                 thread = await status_msg.create_thread(name=thread_title)
                 thread_created = True
             if thread:
-                await thread.send(file=discord.File(path))
+                with span("table.upload"):
+                    await thread.send(file=discord.File(path))
 
         # Always send first MAX_IMAGES_BEFORE_THREAD images in main channel
         if i < MAX_IMAGES_BEFORE_THREAD:
-            await channel.send(file=discord.File(path))
+            with span("table.upload"):
+                await channel.send(file=discord.File(path))
 
 
 # MARK: extract_leaderboard_meta()
@@ -394,19 +428,26 @@ def json_to_text_table(leaderboard_json: list[dict]) -> list[str]:
 
 # MARK: get_leaderboard_json()
 def get_leaderboard_json() -> tuple[list[dict], dict[str, Any]]:
-    url = "https://hiddengems.gymnasiumsteglitz.de/scrims"
+    url = hidden_gems_url("scrims")
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        with span("fetch.scrims"):
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
         html = response.text
     except requests.RequestException as e:
+        count("fetch.scrims.errors")
         return [{"error": f"Fehler beim Abrufen des Leaderboards: {e}"}], {}
 
-    # Extract the leaderboard date
-    leaderboard_meta = extract_leaderboard_meta(html)
+    with span("parse.scrims"):
+        # Extract the leaderboard date
+        leaderboard_meta = extract_leaderboard_meta(html)
 
-    # Extract the leaderboard JSON (default file names)
-    leaderboard_json = parse_html_to_json(html)
+        # Extract the leaderboard JSON (default file names)
+        leaderboard_json = parse_html_to_json(html)
+    if leaderboard_json:
+        with span("snapshot.scrims"):
+            record_snapshot(leaderboard_json)
+            archive_snapshot(leaderboard_json, leaderboard_meta)
 
     return leaderboard_json, leaderboard_meta
 
@@ -414,19 +455,26 @@ def get_leaderboard_json() -> tuple[list[dict], dict[str, Any]]:
 # MARK: get_voting_leaderboard_json()
 def get_voting_leaderboard_json() -> tuple[list[dict], dict[str, Any]]:
     """Fetches and parses the voting leaderboard."""
-    url = VOTING_URL
+    url = hidden_gems_url("voting")
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
+        with span("fetch.voting"):
+            response = requests.get(url, timeout=10)
+            response.raise_for_status()
         html = response.text
     except requests.RequestException as e:
+        count("fetch.voting.errors")
         return [{"error": f"Fehler beim Abrufen des Voting-Leaderboards: {e}"}], {}
 
-    # Extract the leaderboard date
-    leaderboard_meta = extract_leaderboard_meta(html)
+    with span("parse.voting"):
+        # Extract the leaderboard date
+        leaderboard_meta = extract_leaderboard_meta(html)
 
-    # Extract the leaderboard JSON (saved with _voting suffix)
-    leaderboard_json = parse_html_to_json(html, file_suffix="_voting")
+        # Extract the leaderboard JSON (saved with _voting suffix)
+        leaderboard_json = parse_html_to_json(html, file_suffix="_voting")
+    if leaderboard_json:
+        with span("snapshot.voting"):
+            record_snapshot(leaderboard_json, file_suffix="_voting")
+            archive_snapshot(leaderboard_json, leaderboard_meta, board="voting")
 
     return leaderboard_json, leaderboard_meta
 
@@ -455,11 +503,13 @@ async def send_table_texts(
     chunk = ""
     for line in lines:
         if len(chunk) + len(line) + 1 > MAX_LEN:
-            await channel.send(chunk)
+            with span("table.upload_text"):
+                await channel.send(chunk)
             chunk = ""
         chunk += line + "\n"
     if chunk:
-        await channel.send(chunk)
+        with span("table.upload_text"):
+            await channel.send(chunk)
 
 
 # MARK: filter_json_tracked()
@@ -479,6 +529,38 @@ def filter_json_tracked(
     return filtered
 
 
+# MARK: build_movers_text()
+def build_movers_text(diff: dict | None, limit: int = 3, recorded_at: datetime.datetime | None = None) -> str | None:
+    """Short summary of the biggest rank changes since the previous snapshot (with its time, if known)."""
+    if diff_is_empty(diff):
+        return None
+
+    ranked = [c for c in diff["changes"] if c.get("rank_delta")]
+    risers = sorted((c for c in ranked if c["rank_delta"] > 0), key=lambda c: -c["rank_delta"])[:limit]
+    fallers = sorted((c for c in ranked if c["rank_delta"] < 0), key=lambda c: c["rank_delta"])[:limit]
+
+    lines = ["**📊 Movers seit dem letzten Snapshot**"]
+    for c in risers:
+        lines.append(f"- 📈 {c['emoji']} {c['bot']} ({c['author']}): `{c['old_rank']}` → `{c['new_rank']}` (+{c['rank_delta']})")
+    for c in fallers:
+        lines.append(f"- 📉 {c['emoji']} {c['bot']} ({c['author']}): `{c['old_rank']}` → `{c['new_rank']}` ({c['rank_delta']})")
+    for c in diff["dnq_changes"][:limit]:
+        status = "qualifiziert" if c["qualified"] else "DNQ"
+        lines.append(f"- 🔁 {c['emoji']} {c['bot']} ({c['author']}): jetzt {status}")
+    if diff["new_bots"]:
+        names = ", ".join(b["bot"] for b in diff["new_bots"][:limit])
+        more = f" (+{len(diff['new_bots']) - limit} weitere)" if len(diff["new_bots"]) > limit else ""
+        lines.append(f"- 🆕 Neu: {names}{more}")
+    if diff["removed_bots"]:
+        lines.append(f"- 🗑️ Entfernt: {len(diff['removed_bots'])} Bot(s)")
+
+    if len(lines) == 1:
+        return None
+    if recorded_at is not None:
+        lines.append(f"-# Stand: {recorded_at:%d.%m.%Y %H:%M} Uhr")
+    return "\n".join(lines)
+
+
 # MARK: send_leaderboard()
 async def send_leaderboard(
     channel, 
@@ -486,12 +568,19 @@ async def send_leaderboard(
     top_x: Optional[int], 
     force_text: bool, 
     as_thread: bool, 
-    mode: str = "leaderboard"
+    mode: str = "leaderboard",
+    guild_id: Optional[int] = None,
 ):
     """
     Orchestrates sending the leaderboard. 
     'mode' can be 'leaderboard' (default) or 'voting'.
+    If 'guild_id' is given, the tracked bots image gets a rank sparkline column.
     """
+    with span("voting.total" if mode.lower() == "voting" else "lb.total"):
+        await _send_leaderboard(channel, tracked_bots, top_x, force_text, as_thread, mode, guild_id)
+
+
+async def _send_leaderboard(channel, tracked_bots, top_x, force_text, as_thread, mode, guild_id):
     status_msg = await channel.send(f"*⌛Fetching {mode} data...*")
 
     # Fetch data based on mode
@@ -538,12 +627,22 @@ async def send_leaderboard(
     else:
         await send_table_images(channel, status_msg, leaderboard_json, top_x, title)
 
+    # Movers since the previous snapshot (cached diff, no extra work)
+    diff_record = load_snapshot_diff("_voting" if mode.lower() == "voting" else "")
+    recorded_at = diff_recorded_at(diff_record)
+    movers_text = None
+    if recorded_at is not None and datetime.datetime.now() - recorded_at <= MOVERS_MAX_AGE:
+        movers_text = build_movers_text(diff_record.get("diff"), recorded_at=recorded_at)
+    if movers_text:
+        await channel.send(movers_text)
+
     # Tracked bots
     if tracked_bots:
         status_msg = await channel.send(f"*⌛Extracting data for tracked bots ({mode})...*")
         title = f"**Tracked Bots ({mode.capitalize()})**"
         
-        leaderboard_json_tracked = filter_json_tracked(leaderboard_json, tracked_bots)
+        with span("tracked.filter"):
+            leaderboard_json_tracked = filter_json_tracked(leaderboard_json, tracked_bots)
         
         if leaderboard_json_tracked and len(leaderboard_json_tracked) > 0:
             if force_text:
@@ -551,14 +650,24 @@ async def send_leaderboard(
                     channel, status_msg, leaderboard_json_tracked, 0, title
                 )
             else:
+                sparklines = None
+                if guild_id is not None:
+                    with span("tracked.sparklines"):
+                        sparklines = get_sparkline_series(
+                            guild_id,
+                            [(e.get("Bot", ""), e.get("Autor / Team", "")) for e in leaderboard_json_tracked],
+                            days=SPARKLINE_DAYS,
+                            board="voting" if mode.lower() == "voting" else "leaderboard",
+                        )
                 await send_table_images(
-                    channel, status_msg, leaderboard_json_tracked, 0, title
+                    channel, status_msg, leaderboard_json_tracked, 0, title, sparklines
                 )
         else:
             await status_msg.edit(content=f"ℹ️ Keine getrackten Bots im {mode}-Leaderboard gefunden.")
 
 
 # MARK: post_lb_in_scheduled_channels()
+@timed("scheduler.fanout")
 async def post_lb_in_scheduled_channels(bot):
     data = load_bot_data()
     guilds = data.get("guild_data", {})
@@ -583,8 +692,11 @@ async def post_lb_in_scheduled_channels(bot):
 
             if channel is None:
                 print(f"Channel {channel_id} nicht gefunden.")
+                count("scheduler.missing_channels")
                 continue
 
+            count("scheduler.posts")
+
             # 1. Post Standard Leaderboard
             await send_leaderboard(
                 channel,
@@ -592,7 +704,8 @@ async def post_lb_in_scheduled_channels(bot):
                 top_x=20, # Default to Top 20 for automated posts
                 force_text=False,
                 as_thread=True,
-                mode="leaderboard"
+                mode="leaderboard",
+                guild_id=int(guild_id),
             )
 
             # 2. Post Voting Leaderboard (only if there are tracked bots for it)
@@ -603,5 +716,6 @@ async def post_lb_in_scheduled_channels(bot):
                     top_x=20, 
                     force_text=False,
                     as_thread=True,
-                    mode="voting"
+                    mode="voting",
+                    guild_id=int(guild_id),
                 )
\ No newline at end of file
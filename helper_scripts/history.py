@@ -0,0 +1,232 @@
+# helper_scripts/history.py
+
+# Standard library imports
+import sqlite3
+import datetime
+from contextlib import closing
+from typing import Optional, Dict, Any, List, Tuple
+
+# Third-party imports
+# None
+
+# Own modules
+from helper_scripts.globals import LOCAL_DATA_PATH_DIR
+from helper_scripts.snapshots import snapshot_hash, parse_rank, parse_score
+
+
+#       |==========================|
+#       |        HISTORY.PY        |
+#       |==========================|
+#
+# Compact SQLite archive of all distinct leaderboard snapshots.
+# - snapshots: one row per change (a snapshot equal to the board's latest one is skipped)
+# - bots:      one row per (name, author), unique index doubles as lookup index
+# - entries:   typed values per (bot, snapshot), clustered by bot for fast series reads
+
+
+HISTORY_DB_PATH = LOCAL_DATA_PATH_DIR / "history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id           INTEGER PRIMARY KEY,
+    board        TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    lb_date      TEXT NOT NULL,
+    recorded_at  TEXT NOT NULL,
+    stage        TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_board_date ON snapshots (board, lb_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_board_id ON snapshots (board, id);
+
+CREATE TABLE IF NOT EXISTS bots (
+    id     INTEGER PRIMARY KEY,
+    name   TEXT NOT NULL,
+    author TEXT NOT NULL,
+    UNIQUE (name, author)
+);
+CREATE INDEX IF NOT EXISTS idx_bots_name_nocase ON bots (name COLLATE NOCASE, author);
+
+CREATE TABLE IF NOT EXISTS entries (
+    bot_id      INTEGER NOT NULL REFERENCES bots (id),
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    rank        INTEGER,
+    score       INTEGER,
+    gu          TEXT,
+    cf          TEXT,
+    fc          TEXT,
+    PRIMARY KEY (bot_id, snapshot_id)
+) WITHOUT ROWID;
+"""
+
+# Database files whose schema was already ensured in this process
+_schema_ready: set = set()
+
+
+def _drop_content_hash_unique(conn: sqlite3.Connection):
+    """
+    Archives created before used UNIQUE (board, content_hash), which never stored a
+    board going back to an earlier state (A -> B -> A). SQLite cannot drop a table
+    constraint, so the snapshots table is rebuilt once without it (ids are kept).
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'snapshots'").fetchone()
+    if not row or "UNIQUE" not in row[0]:
+        return
+
+    print("[HISTORY] Migrating snapshots table (dropping UNIQUE (board, content_hash)).")
+    conn.executescript("""
+        BEGIN;
+        CREATE TABLE snapshots_new (
+            id           INTEGER PRIMARY KEY,
+            board        TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            lb_date      TEXT NOT NULL,
+            recorded_at  TEXT NOT NULL,
+            stage        TEXT
+        );
+        INSERT INTO snapshots_new (id, board, content_hash, lb_date, recorded_at, stage)
+            SELECT id, board, content_hash, lb_date, recorded_at, stage FROM snapshots;
+        DROP TABLE snapshots;
+        ALTER TABLE snapshots_new RENAME TO snapshots;
+        COMMIT;
+    """)
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(HISTORY_DB_PATH)
+    if HISTORY_DB_PATH not in _schema_ready:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _drop_content_hash_unique(conn)
+        conn.executescript(_SCHEMA)
+        _schema_ready.add(HISTORY_DB_PATH)
+    return conn
+
+
+# MARK: archive_snapshot()
+def archive_snapshot(
+    leaderboard_json: list[dict],
+    leaderboard_meta: Optional[Dict[str, Any]] = None,
+    board: str = "leaderboard",
+) -> bool:
+    """
+    Store a snapshot in the archive unless it equals the latest stored snapshot
+    of this board. Returns True if a new snapshot was written.
+    """
+    if not leaderboard_json or "error" in leaderboard_json[0]:
+        return False
+
+    content_hash = snapshot_hash(leaderboard_json)
+    meta = leaderboard_meta or {}
+    lb_date = meta.get("date") or datetime.date.today()
+
+    with closing(_connect()) as conn, conn:
+        latest = conn.execute(
+            "SELECT content_hash FROM snapshots WHERE board = ? ORDER BY id DESC LIMIT 1",
+            (board,),
+        ).fetchone()
+        if latest and latest[0] == content_hash:
+            return False
+
+        cur = conn.execute(
+            "INSERT INTO snapshots (board, content_hash, lb_date, recorded_at, stage) VALUES (?, ?, ?, ?, ?)",
+            (
+                board,
+                content_hash,
+                lb_date.isoformat(),
+                datetime.datetime.now().isoformat(timespec="seconds"),
+                meta.get("stage"),
+            ),
+        )
+        snapshot_id = cur.lastrowid
+
+        rows = []
+        for entry in leaderboard_json:
+            name, author = entry.get("Bot", ""), entry.get("Autor / Team", "")
+            conn.execute("INSERT OR IGNORE INTO bots (name, author) VALUES (?, ?)", (name, author))
+            bot_id = conn.execute(
+                "SELECT id FROM bots WHERE name = ? AND author = ?", (name, author)
+            ).fetchone()[0]
+            rows.append((
+                bot_id,
+                snapshot_id,
+                parse_rank(entry.get("Rang", "")),
+                parse_score(entry.get("Score", "")),
+                entry.get("GU", ""),
+                entry.get("CF", ""),
+                entry.get("FC", ""),
+            ))
+
+        # Duplicate (Bot, Autor / Team) rows: keep the first (best ranked) one
+        conn.executemany(
+            "INSERT OR IGNORE INTO entries (bot_id, snapshot_id, rank, score, gu, cf, fc) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    return True
+
+
+# MARK: get_bot_history()
+def get_bot_history(
+    bot_name: str, days: int = 14, board: str = "leaderboard"
+) -> Dict[Tuple[str, str], List[Tuple[str, Optional[int], Optional[int]]]]:
+    """
+    Return the daily (date, rank, score) series of all bots with this name
+    (case-insensitive), grouped by (name, author). The last snapshot of each
+    day is used. Only index lookups, no scan over all snapshots.
+    """
+    since = (datetime.date.today() - datetime.timedelta(days=days - 1)).isoformat()
+
+    query = """
+        SELECT b.name, b.author, s.lb_date, e.rank, e.score
+        FROM bots b
+        JOIN entries e ON e.bot_id = b.id
+        JOIN snapshots s ON s.id = e.snapshot_id
+        WHERE b.name = ? COLLATE NOCASE
+          AND s.board = ?
+          AND s.lb_date >= ?
+          AND s.id = (
+              SELECT MAX(s2.id) FROM snapshots s2
+              WHERE s2.board = s.board AND s2.lb_date = s.lb_date
+          )
+        ORDER BY b.author, s.lb_date
+    """
+
+    series: Dict[Tuple[str, str], List[Tuple[str, Optional[int], Optional[int]]]] = {}
+    with closing(_connect()) as conn:
+        for name, author, lb_date, rank, score in conn.execute(query, (bot_name, board, since)):
+            series.setdefault((name, author), []).append((lb_date, rank, score))
+    return series
+
+
+# MARK: get_daily_series()
+def get_daily_series(
+    bot_keys: List[Tuple[str, str]], since: datetime.date, board: str = "leaderboard"
+) -> Dict[Tuple[str, str], List[Tuple[str, Optional[int], Optional[int]]]]:
+    """
+    Like get_bot_history(), but for an exact list of (name, author) keys and
+    a fixed start date. Used to fill the in-memory sparkline windows.
+    """
+    if not bot_keys:
+        return {}
+
+    key_filter = " OR ".join("(b.name = ? AND b.author = ?)" for _ in bot_keys)
+    query = f"""
+        SELECT b.name, b.author, s.lb_date, e.rank, e.score
+        FROM bots b
+        JOIN entries e ON e.bot_id = b.id
+        JOIN snapshots s ON s.id = e.snapshot_id
+        WHERE ({key_filter})
+          AND s.board = ?
+          AND s.lb_date >= ?
+          AND s.id = (
+              SELECT MAX(s2.id) FROM snapshots s2
+              WHERE s2.board = s.board AND s2.lb_date = s.lb_date
+          )
+    """
+    params: List[Any] = [part for key in bot_keys for part in key]
+    params += [board, since.isoformat()]
+
+    series: Dict[Tuple[str, str], List[Tuple[str, Optional[int], Optional[int]]]] = {}
+    with closing(_connect()) as conn:
+        for name, author, lb_date, rank, score in conn.execute(query, params):
+            series.setdefault((name, author), []).append((lb_date, rank, score))
+    return series
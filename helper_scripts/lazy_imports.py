@@ -0,0 +1,65 @@
+# helper_scripts/lazy_imports.py
+
+# Standard library imports
+import os
+import sys
+import time
+import importlib
+from types import ModuleType
+
+# Third-party imports
+# None
+
+# Own modules
+# None
+
+
+#       |==========================|
+#       |     LAZY_IMPORTS.PY      |
+#       |==========================|
+#
+# pandas, matplotlib, folium and geopy are only needed by !map and !stats.
+# Those cogs import their helper modules through import_heavy() on first use,
+# so the bot can log in without loading them. After on_ready they can be
+# warmed up in the background (HG_WARMUP_IMPORTS=0 disables that).
+
+
+HEAVY_MODULES = (
+    "helper_scripts.data_analysis",
+    "helper_scripts.geo",
+    "helper_scripts.map_render",
+)
+
+WARMUP_ENABLED = os.getenv("HG_WARMUP_IMPORTS", "1") != "0"
+
+# Modules whose import has finished. sys.modules alone is not enough: while
+# another thread is still importing, it already holds the half-initialised module.
+_imported: set = set()
+_pending: dict = {}
+
+
+# MARK: import_heavy()
+async def import_heavy(loop, name: str) -> ModuleType:
+    """Import a module in an executor thread, so the first import does not block the event loop."""
+    if name in _imported:
+        return sys.modules[name]
+
+    # Concurrent first calls share one import instead of racing each other
+    future = _pending.get(name)
+    if future is None:
+        future = _pending[name] = loop.run_in_executor(None, importlib.import_module, name)
+    try:
+        module = await future
+    finally:
+        _pending.pop(name, None)
+    _imported.add(name)
+    return module
+
+
+# MARK: warm_up_heavy_modules()
+def warm_up_heavy_modules():
+    """Import all heavy modules (meant to run in an executor after on_ready)."""
+    start = time.perf_counter()
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+    print(f"[STARTUP] Heavy modules warmed up in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,142 @@
+# helper_scripts/loop_watchdog.py
+
+# Standard library imports
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from typing import Optional
+
+# Third-party imports
+# None
+
+# Own modules
+from helper_scripts.metrics import observe, count
+
+
+#       |==========================|
+#       |     LOOP_WATCHDOG.PY     |
+#       |==========================|
+#
+# Detects blocking calls on the event loop. A heartbeat task on the loop
+# wakes up every WATCHDOG_INTERVAL_SEC and records how late it was
+# (span "loop.lag"). A daemon thread checks the last heartbeat; when the loop
+# has not answered for longer than the threshold, it grabs the loop thread's
+# stack (the blocking code is at the bottom, the command coroutine above it),
+# finds the running command through the `ctx` local of the coroutine frames
+# and logs both. Every stall counts as loop.blocked (+ loop.blocked.<command>)
+# and its total duration is recorded in the "loop.blocked" span.
+#
+# HG_LOOP_WATCHDOG_MS sets the threshold (default 250 ms), 0 disables it.
+
+
+WATCHDOG_THRESHOLD_SEC = int(os.getenv("HG_LOOP_WATCHDOG_MS", "250")) / 1000
+WATCHDOG_INTERVAL_SEC = 0.05
+STACK_LIMIT = 30
+
+_watchdog: Optional["LoopWatchdog"] = None
+
+
+def _command_name(frame) -> Optional[str]:
+    """Name of the command whose coroutine is on the stack (via its ctx local)."""
+    while frame is not None:
+        ctx = frame.f_locals.get("ctx")
+        command = getattr(ctx, "command", None)
+        if command is not None:
+            return getattr(command, "qualified_name", str(command))
+        frame = frame.f_back
+    return None
+
+
+class LoopWatchdog:
+    def __init__(self, loop, threshold: float = WATCHDOG_THRESHOLD_SEC, interval: float = WATCHDOG_INTERVAL_SEC):
+        self.loop = loop
+        self.threshold = threshold
+        self.interval = interval
+        self.last_beat = time.monotonic()
+        self.loop_thread_id: Optional[int] = None
+        self.stalls: list[dict] = []  # recent stalls, for tools / tests
+        self._stall: Optional[dict] = None
+        self._stop = threading.Event()
+        self._task = None
+        self._thread = None
+
+    # MARK: > heartbeat (event loop)
+    async def _heartbeat(self):
+        self.loop_thread_id = threading.get_ident()
+        while True:
+            before = time.monotonic()
+            self.last_beat = before
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.last_beat = now
+            observe("loop.lag", max(0.0, now - before - self.interval))
+
+    # MARK: > monitor (thread)
+    def _monitor(self):
+        while not self._stop.wait(self.interval):
+            silent = time.monotonic() - self.last_beat
+            if self._stall is None and silent > self.threshold:
+                self._stall = self._capture(silent)
+            elif self._stall is not None and silent <= self.threshold:
+                self._finish_stall()
+
+    def _capture(self, silent: float) -> dict:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=STACK_LIMIT)) if frame else ""
+        command = _command_name(frame) if frame else None
+        task = asyncio.current_task(self.loop) if frame else None
+        stall = {
+            "started": self.last_beat,
+            "command": command,
+            "task": task.get_name() if task else None,
+            "stack": stack,
+        }
+        del frame
+
+        count("loop.blocked")
+        if command:
+            count(f"loop.blocked.{command}")
+        where = f"Befehl !{command}" if command else f"Task {stall['task'] or '?'}"
+        print(f"[WATCHDOG] Event loop blocked for > {silent * 1000:.0f} ms ({where}):\n{stack}")
+        return stall
+
+    def _finish_stall(self):
+        stall, self._stall = self._stall, None
+        stall["duration"] = self.last_beat - stall["started"] - self.interval
+        observe("loop.blocked", stall["duration"])
+        self.stalls = (self.stalls + [stall])[-50:]
+        print(f"[WATCHDOG] Event loop free again after {stall['duration'] * 1000:.0f} ms.")
+
+    # MARK: > start / stop
+    def start(self):
+        self._task = self.loop.create_task(self._heartbeat(), name="loop-watchdog-heartbeat")
+        self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+
+
+# MARK: start_loop_watchdog()
+def start_loop_watchdog(loop, threshold: float = WATCHDOG_THRESHOLD_SEC) -> Optional[LoopWatchdog]:
+    """Start the watchdog once per process (no-op when the threshold is 0)."""
+    global _watchdog
+    if threshold <= 0:
+        return None
+    if _watchdog is None:
+        _watchdog = LoopWatchdog(loop, threshold)
+        _watchdog.start()
+        print(f"[WATCHDOG] Watching the event loop (threshold {threshold * 1000:.0f} ms).")
+    return _watchdog
+
+
+def stop_loop_watchdog():
+    global _watchdog
+    if _watchdog is not None:
+        _watchdog.stop()
+        _watchdog = None
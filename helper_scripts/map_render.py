@@ -0,0 +1,157 @@
+# helper_scripts/map_render.py
+
+# Standard library imports
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Third-party imports
+import folium
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Own modules
+from helper_scripts.geo import get_city_color
+from helper_scripts.basemap import draw_basemap, lonlat_to_mercator
+from helper_scripts.cluster_map import render_cluster_map
+
+
+#       |==========================|
+#       |      MAP_RENDER.PY       |
+#       |==========================|
+#
+# Renderers and the fingerprint cache behind !map. Kept out of commands/maps.py
+# so matplotlib and folium are only imported when a map is actually drawn.
+# Figures use the OO API, renderers run in executor threads.
+
+
+# Bump when the map rendering changes, so cached maps are rebuilt
+MAP_RENDER_VERSION = 3
+
+
+# MARK: map_fingerprint()
+def map_fingerprint(mapped_coords, mode: str) -> str:
+    """Hash of everything a map depends on: mode, cities, counts and coordinates."""
+    points = sorted(
+        (c['city'], int(c['count']), round(c['coords'][0], 5), round(c['coords'][1], 5))
+        for c in mapped_coords
+    )
+    payload = json.dumps({"v": MAP_RENDER_VERSION, "mode": mode, "points": points}, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def cached_map_path(map_path, fingerprint: str):
+    """Return map_path if it was rendered from the same fingerprint, else None."""
+    fp_path = map_path.with_suffix(map_path.suffix + ".fingerprint")
+    if map_path.exists() and fp_path.exists() and fp_path.read_text(encoding="utf-8").strip() == fingerprint:
+        return map_path
+    return None
+
+
+def store_map_fingerprint(map_path, fingerprint: str):
+    fp_path = map_path.with_suffix(map_path.suffix + ".fingerprint")
+    _write_via_temp(fp_path, lambda tmp: tmp.write_text(fingerprint, encoding="utf-8"))
+
+
+def _write_via_temp(path, write):
+    """
+    write(temp path) next to path, then rename it over path, so a half written
+    map is never uploaded. The temp name keeps the suffix, matplotlib picks the
+    format from it.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.stem + ".", suffix=".tmp" + path.suffix)
+    os.close(fd)
+    tmp = Path(tmp)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+# MARK: render_map()
+def render_map(mode: str, mapped_coords, map_path, fingerprint: str):
+    """Render the map for mode into map_path, then record the fingerprint it was built from."""
+    render = MAP_RENDERERS[mode]
+    _write_via_temp(map_path, lambda tmp: render(mapped_coords, tmp))
+    store_map_fingerprint(map_path, fingerprint)
+
+
+# MARK: render_html_map()
+def render_html_map(mapped_coords, map_path):
+    print("[MAPS] Generating Folium HTML map.")
+    avg_lat = sum(c['coords'][0] for c in mapped_coords) / len(mapped_coords)
+    avg_lon = sum(c['coords'][1] for c in mapped_coords) / len(mapped_coords)
+    max_count = max(c['count'] for c in mapped_coords)
+
+    m = folium.Map(location=[avg_lat, avg_lon], zoom_start=6)
+
+    for data in mapped_coords:
+        lat, lon = data['coords']
+        city_count = data['count']
+
+        radius = 5 + (city_count / max_count) * 15 if max_count > 0 else 5
+        color = get_city_color(city_count, max_count)
+
+        folium.CircleMarker(
+            location=[lat, lon],
+            radius=radius,
+            popup=f"{data['city']} ({city_count} bots)",
+            color=color,
+            fill=True,
+            fill_color=color,
+            fill_opacity=0.7
+        ).add_to(m)
+
+    m.save(str(map_path))
+    print(f"[MAPS] HTML map saved to {map_path}")
+
+
+# MARK: render_png_map()
+def render_png_map(mapped_coords, map_path):
+    print("[MAPS] Generating static PNG map.")
+    max_count = max(c['count'] for c in mapped_coords)
+    fig = Figure(figsize=(10, 10))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    lons = [c['coords'][1] for c in mapped_coords]
+    lats = [c['coords'][0] for c in mapped_coords]
+    sizes = [50 + (c['count'] / max_count) * 300 for c in mapped_coords]
+    colors = [get_city_color(c['count'], max_count) for c in mapped_coords]
+
+    # Plot in Web Mercator, the projection of the basemap tiles
+    xs, ys = lonlat_to_mercator(lons, lats)
+    ax.scatter(xs, ys, s=sizes, c=colors, alpha=0.8, zorder=2, edgecolors='white')
+
+    # Add padding
+    west, east = min(lons) - 2, max(lons) + 2
+    south, north = min(lats) - 2, max(lats) + 2
+    try:
+        draw_basemap(ax, west, south, east, north)
+    except Exception as e:
+        print(f"[MAPS] Basemap Error (PNG generation): {e}")
+
+    (x_min, x_max), (y_min, y_max) = lonlat_to_mercator([west, east], [south, north])
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
+
+    ax.set_axis_off()
+    ax.set_title(f"Bot Locations ({len(mapped_coords)} cities)", fontsize=16)
+
+    fig.tight_layout()
+    fig.savefig(map_path, dpi=100)
+    print(f"[MAPS] PNG map saved to {map_path}")
+
+
+# mode -> renderer
+MAP_RENDERERS = {
+    'png': render_png_map,
+    'html': render_html_map,
+    'cluster': render_cluster_map,
+}
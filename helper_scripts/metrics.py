@@ -0,0 +1,276 @@
+# helper_scripts/metrics.py
+
+# Standard library imports
+import os
+import time
+import threading
+import functools
+import inspect
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+# Third-party imports
+# None
+
+# Own modules
+# None
+
+
+#       |==========================|
+#       |        METRICS.PY        |
+#       |==========================|
+#
+# In-memory timings and counters for the slow paths (!lb, !stats, !map, the
+# scheduler). Stages are wrapped in spans:
+#
+#   with span("fetch.scrims"):
+#       ...
+#
+# Every span name gets a latency histogram (fixed buckets for Prometheus,
+# plus the last samples for exact percentiles). Cache lookups are counted with
+# cache_hit("plots") / cache_miss("plots"). `!bot metrics` shows the summary;
+# with HG_METRICS_FILE set, a Prometheus text file is written (at most every
+# METRICS_FILE_INTERVAL_SEC seconds) for the node_exporter textfile collector.
+# Spans can be used from executor threads, all updates take one lock.
+
+
+# Upper bounds in seconds
+HISTOGRAM_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RECENT_SAMPLES = 512
+
+METRICS_FILE = os.getenv("HG_METRICS_FILE")
+METRICS_FILE_INTERVAL_SEC = 15
+
+
+class Histogram:
+    def __init__(self):
+        self.bucket_counts = [0] * (len(HISTOGRAM_BUCKETS) + 1)  # last one is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, seconds: float):
+        self.bucket_counts[bisect_left(HISTOGRAM_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Nearest-rank percentile over the recent samples, in seconds."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+_lock = threading.Lock()
+_histograms: Dict[str, Histogram] = {}
+_counters: Dict[str, int] = {}
+_started = time.time()
+_last_file_write = 0.0
+
+
+# MARK: observe()
+def observe(name: str, seconds: float):
+    """Record one duration for name."""
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+    if METRICS_FILE:
+        _maybe_write_metrics_file()
+
+
+# MARK: span()
+@contextmanager
+def span(name: str):
+    """Time the block under name (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+# MARK: timed()
+def timed(name: str):
+    """Decorator version of span() for sync and async functions."""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# MARK: counters
+def count(name: str, value: int = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def cache_hit(cache: str, value: int = 1):
+    count(f"cache.{cache}.hit", value)
+
+
+def cache_miss(cache: str, value: int = 1):
+    count(f"cache.{cache}.miss", value)
+
+
+def reset_metrics():
+    global _started
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _started = time.time()
+
+
+# MARK: snapshot()
+def snapshot() -> dict:
+    """Copy of all metrics: {"uptime_s", "spans": {name: stats in ms}, "counters": {...}}."""
+    with _lock:
+        spans = {
+            name: {
+                "count": h.count,
+                "p50_ms": round(h.percentile(50) * 1000, 1),
+                "p95_ms": round(h.percentile(95) * 1000, 1),
+                "max_ms": round(h.max * 1000, 1),
+                "total_s": round(h.total, 2),
+            }
+            for name, h in sorted(_histograms.items())
+        }
+        counters = dict(sorted(_counters.items()))
+    return {"uptime_s": round(time.time() - _started), "spans": spans, "counters": counters}
+
+
+def cache_ratios(counters: dict) -> Dict[str, tuple]:
+    """cache name -> (hits, misses) from the cache.<name>.hit/miss counters."""
+    caches = {}
+    for name, value in counters.items():
+        if name.startswith("cache."):
+            cache, _, kind = name[len("cache."):].rpartition(".")
+            hits, misses = caches.get(cache, (0, 0))
+            caches[cache] = (hits + value, misses) if kind == "hit" else (hits, misses + value)
+    return caches
+
+
+def _code_block(title: str, rows: list[str]) -> str:
+    return f"{title}\n```\n" + "\n".join(rows) + "\n```"
+
+
+# MARK: format_metrics_messages()
+def format_metrics_messages(data: Optional[dict] = None) -> list[str]:
+    """Discord messages (one per section, each below 2000 chars) with spans, cache hit rates and counters."""
+    data = data or snapshot()
+    hours, rest = divmod(data["uptime_s"], 3600)
+    header = f"📈 **Bot-Metriken** (seit {hours}h {rest // 60}min)"
+
+    if not data["spans"] and not data["counters"]:
+        return [f"{header}\n-# Noch keine Messungen."]
+
+    sections = []
+    if data["spans"]:
+        width = max(4, *(len(name) for name in data["spans"]))
+        rows = [f"{'Span':{width}}  {'n':>5}  {'p50':>8}  {'p95':>8}  {'max':>8}"]
+        for name, s in data["spans"].items():
+            rows.append(f"{name:{width}}  {s['count']:5}  {s['p50_ms']:6.0f}ms  {s['p95_ms']:6.0f}ms  {s['max_ms']:6.0f}ms")
+        sections.append(("**Laufzeiten**", rows))
+
+    caches = cache_ratios(data["counters"])
+    if caches:
+        rows = []
+        for cache, (hits, misses) in sorted(caches.items()):
+            total = hits + misses
+            rows.append(f"{cache:14} {hits:6} / {total:<6} Treffer ({hits / total:.0%})")
+        sections.append(("**Caches**", rows))
+
+    other = {k: v for k, v in data["counters"].items() if not k.startswith("cache.")}
+    if other:
+        sections.append(("**Zähler**", [f"{k:30} {v}" for k, v in other.items()]))
+
+    messages = []
+    for title, rows in sections:
+        chunk = []
+        for row in rows:
+            if chunk and sum(len(r) + 1 for r in chunk) + len(row) > 1900:
+                messages.append(_code_block(title, chunk))
+                chunk = []
+            chunk.append(row)
+        messages.append(_code_block(title, chunk))
+    messages[0] = f"{header}\n{messages[0]}"
+    return messages
+
+
+# MARK: Prometheus text file
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+def format_prometheus() -> str:
+    with _lock:
+        histograms = {name: (list(h.bucket_counts), h.count, h.total) for name, h in _histograms.items()}
+        counters = dict(_counters)
+
+    lines = [
+        "# HELP hg_span_seconds Duration of instrumented bot stages.",
+        "# TYPE hg_span_seconds histogram",
+    ]
+    for name, (bucket_counts, total_count, total) in sorted(histograms.items()):
+        cumulative = 0
+        for bound, value in zip(HISTOGRAM_BUCKETS + ("+Inf",), bucket_counts):
+            cumulative += value
+            lines.append(f'hg_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'hg_span_seconds_sum{{span="{name}"}} {total:.6f}')
+        lines.append(f'hg_span_seconds_count{{span="{name}"}} {total_count}')
+
+    caches = cache_ratios(counters)
+    if caches:
+        lines += ["# HELP hg_cache_requests_total Cache lookups by result.", "# TYPE hg_cache_requests_total counter"]
+        for cache, (hits, misses) in sorted(caches.items()):
+            lines.append(f'hg_cache_requests_total{{cache="{cache}",result="hit"}} {hits}')
+            lines.append(f'hg_cache_requests_total{{cache="{cache}",result="miss"}} {misses}')
+
+    for name, value in sorted(counters.items()):
+        if not name.startswith("cache."):
+            metric = f"hg_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics_file(path: Optional[str] = None) -> Optional[Path]:
+    """Write the Prometheus text file atomically (to HG_METRICS_FILE by default)."""
+    path = path or METRICS_FILE
+    if not path:
+        return None
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(format_prometheus(), encoding="utf-8")
+    os.replace(tmp_path, path)
+    return path
+
+
+def _maybe_write_metrics_file():
+    global _last_file_write
+    now = time.monotonic()
+    if now - _last_file_write < METRICS_FILE_INTERVAL_SEC:
+        return
+    _last_file_write = now
+    try:
+        write_metrics_file()
+    except OSError as e:
+        print(f"[METRICS] Could not write {METRICS_FILE}: {e}")
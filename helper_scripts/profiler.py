@@ -0,0 +1,213 @@
+# helper_scripts/profiler.py
+
+# Standard library imports
+import io
+import time
+import asyncio
+import cProfile
+import datetime
+import marshal
+import pstats
+import tracemalloc
+from typing import Optional
+
+# Third-party imports
+import discord
+
+# Own modules
+# None
+
+
+#       |==========================|
+#       |       PROFILER.PY        |
+#       |==========================|
+#
+# On-demand profiling for `!bot profile`. A capture runs cProfile on the
+# event-loop thread and tracemalloc (all threads) until N more commands have
+# finished or a time window has passed, then uploads a report with the top
+# functions and the top allocations (+ the raw .pstats file for snakeviz).
+# Nothing is hooked in while no capture runs: the command listeners are only
+# added for the duration of a capture, so there is no overhead otherwise.
+# cProfile only sees the event-loop thread; work in run_in_executor shows up
+# there as waiting time, its allocations are in the tracemalloc part.
+
+
+PROFILE_MAX_COMMANDS = 200
+PROFILE_MAX_SECONDS = 30 * 60
+# Safety net for "next N commands" if the bot stays idle
+PROFILE_COMMAND_TIMEOUT_SEC = 15 * 60
+REPORT_TOP_FUNCTIONS = 40
+REPORT_TOP_ALLOCATIONS = 25
+
+_active: Optional["ProfileCapture"] = None
+
+
+class ProfileCapture:
+    def __init__(self, bot, channel, start_ctx=None, max_commands: int = 0, duration: float = 0.0):
+        self.bot = bot
+        self.channel = channel
+        self.start_ctx = start_ctx
+        self.max_commands = max_commands
+        self.duration = duration or PROFILE_COMMAND_TIMEOUT_SEC
+        self.commands: list[str] = []
+        self.finished_commands = 0
+        self.profile = cProfile.Profile()
+        self.started_tracemalloc = False
+        self.start_snapshot = None
+        self.started_at = 0.0
+        self.timer: Optional[asyncio.Task] = None
+        self.done = False
+
+    # MARK: > start
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self.started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self.start_snapshot = tracemalloc.take_snapshot()
+
+        self.bot.add_listener(self._on_command, "on_command")
+        self.bot.add_listener(self._on_command_finished, "on_command_completion")
+        self.bot.add_listener(self._on_command_finished, "on_command_error")
+        self.timer = asyncio.get_running_loop().create_task(self._finish_after(self.duration))
+
+        self.started_at = time.perf_counter()
+        self.profile.enable()
+
+    async def _finish_after(self, seconds: float):
+        await asyncio.sleep(seconds)
+        await self.finish("Zeitfenster abgelaufen" if not self.max_commands else "Timeout")
+
+    def _ignored(self, ctx) -> bool:
+        """The !bot command that manages the capture is not counted."""
+        if self.start_ctx is None:
+            return False
+        return ctx is self.start_ctx or ctx.command is self.start_ctx.command
+
+    async def _on_command(self, ctx):
+        if not self._ignored(ctx) and ctx.command is not None:
+            self.commands.append(ctx.command.qualified_name)
+
+    async def _on_command_finished(self, ctx, *args):
+        if self._ignored(ctx):
+            return
+        self.finished_commands += 1
+        if self.max_commands and self.finished_commands >= self.max_commands:
+            await self.finish(f"{self.finished_commands} Befehle erfasst")
+
+    # MARK: > finish
+    async def finish(self, reason: str):
+        global _active
+        if self.done:
+            return
+        self.done = True
+        self.profile.disable()
+        elapsed = time.perf_counter() - self.started_at
+
+        self.bot.remove_listener(self._on_command, "on_command")
+        self.bot.remove_listener(self._on_command_finished, "on_command_completion")
+        self.bot.remove_listener(self._on_command_finished, "on_command_error")
+        if self.timer and self.timer is not asyncio.current_task():
+            self.timer.cancel()
+        if _active is self:
+            _active = None
+
+        end_snapshot = tracemalloc.take_snapshot()
+        _current, peak = tracemalloc.get_traced_memory()
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+
+        loop = asyncio.get_running_loop()
+        report, raw_stats = await loop.run_in_executor(
+            None, self.build_report, reason, elapsed, end_snapshot, peak
+        )
+
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        await self.channel.send(
+            f"🧪 Profiling beendet ({reason}): {elapsed:.1f}s, {self.finished_commands} Befehl(e).",
+            files=[
+                discord.File(io.BytesIO(report.encode("utf-8")), filename=f"profile_{stamp}.txt"),
+                discord.File(io.BytesIO(raw_stats), filename=f"profile_{stamp}.pstats"),
+            ],
+        )
+
+    def build_report(self, reason: str, elapsed: float, end_snapshot, peak: int):
+        """(text report, marshalled pstats data)."""
+        self.profile.create_stats()
+        raw_stats = marshal.dumps(self.profile.stats)
+
+        out = io.StringIO()
+        out.write(f"Profil vom {datetime.datetime.now():%Y-%m-%d %H:%M:%S} ({reason})\n")
+        out.write(f"Dauer: {elapsed:.1f}s, abgeschlossene Befehle: {self.finished_commands}\n")
+        out.write(f"Befehle: {', '.join(self.commands) or '-'}\n")
+        out.write(f"tracemalloc Peak: {peak / 2**20:.1f} MiB\n")
+        out.write("cProfile: nur Event-Loop-Thread (Executor-Arbeit erscheint als Wartezeit)\n")
+
+        stats = pstats.Stats(self.profile, stream=out)
+        stats.strip_dirs()
+        for sort_key in ("cumulative", "tottime"):
+            out.write(f"\n{'=' * 30} Top {REPORT_TOP_FUNCTIONS} nach {sort_key} {'=' * 30}\n")
+            stats.sort_stats(sort_key).print_stats(REPORT_TOP_FUNCTIONS)
+
+        ignore = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+        diff = end_snapshot.filter_traces(ignore).compare_to(self.start_snapshot.filter_traces(ignore), "lineno")
+        out.write(f"\n{'=' * 30} Top {REPORT_TOP_ALLOCATIONS} Allokationen (Zuwachs) {'=' * 30}\n")
+        for entry in diff[:REPORT_TOP_ALLOCATIONS]:
+            out.write(f"{entry}\n")
+        return out.getvalue(), raw_stats
+
+
+def parse_profile_option(option: Optional[str]):
+    """'20' -> (20 commands, 0 s), '90s' / '5m' -> (0, seconds). Raises ValueError with a German message."""
+    option = (option or "10").strip().lower()
+    try:
+        if option[-1] in "sm":
+            seconds = float(option[:-1]) * (60 if option[-1] == "m" else 1)
+        else:
+            commands = int(option)
+    except ValueError:
+        raise ValueError("Nutzung: `profile <anzahl>` oder `profile <zeit>s` / `<zeit>m`") from None
+
+    if option[-1] in "sm":
+        if not 0 < seconds <= PROFILE_MAX_SECONDS:
+            raise ValueError(f"Zeitfenster muss zwischen 1s und {PROFILE_MAX_SECONDS // 60}m liegen.")
+        return 0, seconds
+    if not 0 < commands <= PROFILE_MAX_COMMANDS:
+        raise ValueError(f"Anzahl muss zwischen 1 und {PROFILE_MAX_COMMANDS} liegen.")
+    return commands, 0.0
+
+
+# MARK: start_capture()
+def start_capture(bot, channel, option: Optional[str], start_ctx=None) -> str:
+    """Start a capture, returns the German status message for the channel."""
+    global _active
+    try:
+        max_commands, duration = parse_profile_option(option)
+    except ValueError as e:
+        return f"❌ {e}"
+
+    if _active is not None:
+        return "ℹ️ Es läuft bereits ein Profiling. Beenden mit `profile stop`."
+
+    _active = ProfileCapture(bot, channel, start_ctx, max_commands, duration)
+    _active.start()
+    if max_commands:
+        return f"🧪 Profiling läuft für die nächsten {max_commands} Befehl(e)."
+    return f"🧪 Profiling läuft für {duration:.0f}s."
+
+
+# MARK: stop_capture()
+async def stop_capture() -> bool:
+    """Finish the running capture early (report is still uploaded). False if none runs."""
+    if _active is None:
+        return False
+    await _active.finish("manuell beendet")
+    return True
+
+
+def is_capturing() -> bool:
+    return _active is not None
@@ -5,6 +5,8 @@ from commands.leaderboard import LeaderboardCommand
 from commands.tracking import TrackingCommand
 from commands.stats import StatsCommand
 from commands.maps import MapsCommand
+from commands.alerts import AlertsCommand
+from commands.history import HistoryCommand
 
 async def register_commands(bot, admins, channels_to_post, scheduled_channels, save_channels, send_leaderboard):
     
@@ -14,5 +16,7 @@ async def register_commands(bot, admins, channels_to_post, scheduled_channels, s
     await bot.add_cog(TrackingCommand(bot))
     await bot.add_cog(StatsCommand(bot))
     await bot.add_cog(MapsCommand(bot))
+    await bot.add_cog(AlertsCommand(bot))
+    await bot.add_cog(HistoryCommand(bot))
 
     print("✅ All commands registered.")
\ No newline at end of file
@@ -0,0 +1,213 @@
+# helper_scripts/snapshots.py
+
+# Standard library imports
+import json
+import hashlib
+import datetime
+import re
+from typing import Optional, Dict, Any, List, Tuple
+
+# Third-party imports
+# None
+
+# Own modules
+from helper_scripts.globals import LOCAL_DATA_PATH_DIR
+
+
+#       |==========================|
+#       |       SNAPSHOTS.PY       |
+#       |==========================|
+#
+# Every successfully parsed leaderboard is a "snapshot". When a snapshot differs
+# from the last recorded one, the diff between both is computed once and cached
+# next to it (leaderboard{suffix}_diff.json), so features like the movers section
+# or the rank alerts can reuse it or skip their work if nothing changed.
+
+
+BotKey = Tuple[str, str]
+
+
+# MARK: helpers
+def bot_key(entry: dict) -> BotKey:
+    """Stable key of a leaderboard row: (Bot, Autor / Team)."""
+    return (entry.get("Bot", ""), entry.get("Autor / Team", ""))
+
+
+def parse_rank(rank: str) -> Optional[int]:
+    """'12.' -> 12, 'DNQ.' / '' -> None"""
+    digits = re.sub(r"\D", "", rank or "")
+    return int(digits) if digits else None
+
+
+def parse_score(score: str) -> Optional[int]:
+    digits = re.sub(r"[^\d\-]", "", score or "")
+    try:
+        return int(digits)
+    except ValueError:
+        return None
+
+
+def snapshot_hash(leaderboard_json: list[dict]) -> str:
+    """Content hash of a snapshot, independent of dict key order."""
+    payload = json.dumps(leaderboard_json, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _snapshot_path(file_suffix: str):
+    return LOCAL_DATA_PATH_DIR / f"leaderboard{file_suffix}_snapshot.json"
+
+
+def _diff_path(file_suffix: str):
+    return LOCAL_DATA_PATH_DIR / f"leaderboard{file_suffix}_diff.json"
+
+
+def _bot_summary(entry: dict) -> Dict[str, Any]:
+    return {
+        "bot": entry.get("Bot", ""),
+        "author": entry.get("Autor / Team", ""),
+        "emoji": entry.get("Col1", ""),
+        "rank": entry.get("Rang", ""),
+        "score": entry.get("Score", ""),
+    }
+
+
+# MARK: diff_snapshots()
+def diff_snapshots(old_json: list[dict], new_json: list[dict]) -> Dict[str, Any]:
+    """
+    Compare two snapshots in linear time, matching rows by (Bot, Autor / Team).
+
+    Returns new/removed bots, per-bot rank and score deltas (rank_delta > 0 means
+    the bot moved up) and DNQ transitions. Duplicate keys: first row wins.
+    """
+    old_by_key: Dict[BotKey, dict] = {}
+    for entry in old_json:
+        old_by_key.setdefault(bot_key(entry), entry)
+
+    seen: set = set()
+    new_bots: List[Dict[str, Any]] = []
+    changes: List[Dict[str, Any]] = []
+    dnq_changes: List[Dict[str, Any]] = []
+
+    for entry in new_json:
+        key = bot_key(entry)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        old_entry = old_by_key.get(key)
+        if old_entry is None:
+            new_bots.append(_bot_summary(entry))
+            continue
+
+        old_rank, new_rank = old_entry.get("Rang", ""), entry.get("Rang", "")
+        old_score, new_score = old_entry.get("Score", ""), entry.get("Score", "")
+        if old_rank == new_rank and old_score == new_score:
+            continue
+
+        old_rank_num, new_rank_num = parse_rank(old_rank), parse_rank(new_rank)
+        old_score_num, new_score_num = parse_score(old_score), parse_score(new_score)
+
+        change = {
+            "bot": key[0],
+            "author": key[1],
+            "emoji": entry.get("Col1", ""),
+            "old_rank": old_rank,
+            "new_rank": new_rank,
+            "rank_delta": (
+                old_rank_num - new_rank_num
+                if old_rank_num is not None and new_rank_num is not None
+                else None
+            ),
+            "old_score": old_score,
+            "new_score": new_score,
+            "score_delta": (
+                new_score_num - old_score_num
+                if old_score_num is not None and new_score_num is not None
+                else None
+            ),
+        }
+        changes.append(change)
+
+        if (old_rank == "DNQ.") != (new_rank == "DNQ."):
+            dnq_changes.append({**change, "qualified": old_rank == "DNQ."})
+
+    removed_bots = [
+        _bot_summary(entry) for key, entry in old_by_key.items() if key not in seen
+    ]
+
+    return {
+        "new_bots": new_bots,
+        "removed_bots": removed_bots,
+        "changes": changes,
+        "dnq_changes": dnq_changes,
+    }
+
+
+def diff_is_empty(diff: Optional[Dict[str, Any]]) -> bool:
+    if not diff:
+        return True
+    return not (diff["new_bots"] or diff["removed_bots"] or diff["changes"])
+
+
+# MARK: record_snapshot()
+def record_snapshot(leaderboard_json: list[dict], file_suffix: str = "") -> Optional[Dict[str, Any]]:
+    """
+    Register a freshly parsed snapshot.
+    If its content differs from the last recorded snapshot, the diff is computed
+    and cached; otherwise the cached diff is kept. Returns the cached diff record.
+    """
+    new_hash = snapshot_hash(leaderboard_json)
+    record = load_snapshot_diff(file_suffix)
+    if record is not None and record.get("snapshot_hash") == new_hash:
+        return record
+
+    snapshot_file = _snapshot_path(file_suffix)
+    previous_json: list[dict] = []
+    if snapshot_file.exists():
+        try:
+            with open(snapshot_file, "r", encoding="utf-8") as f:
+                previous_json = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            previous_json = []
+
+    previous_hash = snapshot_hash(previous_json) if previous_json else None
+    if previous_hash is None or previous_hash == new_hash:
+        # First snapshot, or the diff record got lost while the snapshot is current
+        previous_hash, diff = None, None
+    else:
+        diff = diff_snapshots(previous_json, leaderboard_json)
+
+    record = {
+        "snapshot_hash": new_hash,
+        "previous_hash": previous_hash,
+        "recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "diff": diff,
+    }
+
+    with open(snapshot_file, "w", encoding="utf-8") as f:
+        json.dump(leaderboard_json, f, ensure_ascii=False)
+    with open(_diff_path(file_suffix), "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+
+    return record
+
+
+def diff_recorded_at(record: Optional[Dict[str, Any]]) -> Optional[datetime.datetime]:
+    """When a diff record was written, None if unknown."""
+    try:
+        return datetime.datetime.fromisoformat(record["recorded_at"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# MARK: load_snapshot_diff()
+def load_snapshot_diff(file_suffix: str = "") -> Optional[Dict[str, Any]]:
+    """Return the cached diff record of the latest snapshot, if any."""
+    path = _diff_path(file_suffix)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
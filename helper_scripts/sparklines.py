@@ -0,0 +1,106 @@
+# helper_scripts/sparklines.py
+
+# Standard library imports
+import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+from PIL import ImageDraw
+
+# Own modules
+from helper_scripts.history import get_daily_series
+
+
+#       |==========================|
+#       |      SPARKLINES.PY       |
+#       |==========================|
+#
+# Per-guild rolling windows of the last N daily ranks of the tracked bots.
+# A window is filled from the history archive once; afterwards only the newest
+# day(s) are queried and the matrix is shifted with NumPy, so rendering the
+# sparkline column costs almost nothing per post.
+
+
+BotKey = Tuple[str, str]
+
+
+class RankWindow:
+    """Daily rank matrix (bots x days) for one guild / board, NaN = no data."""
+
+    def __init__(self, bot_keys: List[BotKey], days: int):
+        self.bot_keys = list(bot_keys)
+        self.days = days
+        self.last_day: Optional[datetime.date] = None
+        self.ranks = np.full((len(self.bot_keys), days), np.nan)
+
+    def _fill(self, board: str, since: datetime.date, last_day: datetime.date):
+        """Query the archive from `since` up to `last_day` and write it into the matrix."""
+        series = get_daily_series(self.bot_keys, since, board)
+        for row, key in enumerate(self.bot_keys):
+            for lb_date, rank, _score in series.get(key, ()):
+                col = self.days - 1 - (last_day - datetime.date.fromisoformat(lb_date)).days
+                if 0 <= col < self.days:
+                    self.ranks[row, col] = np.nan if rank is None else rank
+
+    def refresh(self, board: str, today: datetime.date):
+        if self.last_day is None or (today - self.last_day).days >= self.days:
+            # Cold start or window completely outdated: load everything
+            self.ranks.fill(np.nan)
+            self._fill(board, today - datetime.timedelta(days=self.days - 1), today)
+        else:
+            shift = (today - self.last_day).days
+            if shift:
+                self.ranks = np.roll(self.ranks, -shift, axis=1)
+                self.ranks[:, -shift:] = np.nan
+            # Re-read the last known day as well, it may have changed intraday
+            self._fill(board, self.last_day, today)
+        self.last_day = today
+
+
+_windows: Dict[Tuple[int, str], RankWindow] = {}
+
+
+# MARK: get_sparkline_series()
+def get_sparkline_series(
+    guild_id: int, bot_keys: List[BotKey], days: int = 14, board: str = "leaderboard"
+) -> Dict[BotKey, np.ndarray]:
+    """Return the last `days` daily ranks per tracked bot of a guild."""
+    window = _windows.get((guild_id, board))
+    if window is None or window.bot_keys != list(bot_keys) or window.days != days:
+        window = RankWindow(bot_keys, days)
+        _windows[(guild_id, board)] = window
+
+    window.refresh(board, datetime.date.today())
+    return {key: window.ranks[row] for row, key in enumerate(window.bot_keys)}
+
+
+# MARK: draw_sparkline()
+def draw_sparkline(
+    draw: ImageDraw.ImageDraw,
+    box: Tuple[int, int, int, int],
+    ranks: np.ndarray,
+    color: Tuple[int, int, int],
+    dot_color: Tuple[int, int, int],
+):
+    """Draw a rank sparkline into box (x0, y0, x1, y1). Rank 1 is at the top."""
+    valid = ~np.isnan(ranks)
+    if not valid.any():
+        return
+
+    x0, y0, x1, y1 = box
+    xs = np.linspace(x0, x1, num=len(ranks))[valid]
+    values = ranks[valid]
+
+    lo, hi = values.min(), values.max()
+    if hi > lo:
+        ys = y0 + (values - lo) / (hi - lo) * (y1 - y0)
+    else:
+        ys = np.full_like(values, (y0 + y1) / 2)
+
+    points = list(zip(xs.tolist(), ys.tolist()))
+    if len(points) > 1:
+        draw.line(points, fill=color, width=2)
+
+    last_x, last_y = points[-1]
+    draw.ellipse((last_x - 2, last_y - 2, last_x + 2, last_y + 2), fill=dot_color)
@@ -22,6 +22,8 @@ from helper_scripts.helper_functions import (
     send_leaderboard,
 )
 from helper_scripts.globals import DOTENV_PATH, LOCAL_DATA_PATH_DIR
+from helper_scripts.lazy_imports import WARMUP_ENABLED, warm_up_heavy_modules
+from helper_scripts.loop_watchdog import start_loop_watchdog
 from commands.custom_help import CustomHelpCommand 
 
 # Setze die Umgebungsvariable, die requests anweist, diese CA-Zertifikate zu verwenden
@@ -101,10 +103,21 @@ def main():
     bot.setup_hook = setup_hook
 
     # ----------------- Bot Ready & Scheduler -----------------
+    warmup_started = False
+
     @bot.event
     async def on_ready():
+        nonlocal warmup_started
         print(f"Bot ist online als {bot.user}")
 
+        # Logs blocking calls on the event loop (stack + command), see helper_scripts/loop_watchdog.py
+        start_loop_watchdog(bot.loop)
+
+        # Load pandas / matplotlib / folium in the background, !map and !stats import them lazily
+        if WARMUP_ENABLED and not warmup_started:
+            warmup_started = True
+            bot.loop.run_in_executor(None, warm_up_heavy_modules)
+
         # Scheduler starten
         if not scheduler.get_jobs():
             job = scheduler.add_job(